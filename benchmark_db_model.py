@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Name: benchmark_db_model
+#
+# Purpose: Benchmark of the script "create_db_model.py". Synthetic data models of increasing size
+# (domains with coded values, feature classes and tables with fields, subtypes, relationship classes
+# and attribute rules) are generated as JSON files and run through the function main() against the
+# in-memory geodatabase of the module "fake_arcpy" with a configurable latency per call. For every
+# size and phase (create, update, recreate) the calls per function, the wall time and the peak memory
+# are reported as a table and as JSON. Functions whose number of calls grows faster than the size of
+# the model (e.g. a scan of all fields for every domain) are marked and the script exits with 1.
+#
+# Author: Timo Wicki, City of Lucerne
+#
+# Created: 18.10.2026
+# -----------------------------------------------------------------------------
+import os, sys, json, math, time, argparse, tempfile, tracemalloc, logging
+import create_db_model
+import fake_arcpy
+
+# phases of a benchmark run (all phases of a size use the same geodatabase)
+PHASES = ["create", "update", "recreate"]
+
+def generate_models(conpath, db_name, domains = 10, codes = 10, classes = 10, fields = 10,
+                    subtypes = 3, relations = 5, rules = 1) -> dict:
+    """Generates the JSON data models of the phases of a benchmark run.
+    "create": domains, a feature dataset, feature classes (half of the classes, in the dataset) and tables
+    with subtypes and attribute rules, relationship classes. "update": every fourth domain is deleted (the
+    domains are removed from the fields), a code is added to the other domains and a field to every class.
+    "recreate": the model of "create" with "DeleteAllExisting" (the objects of "update" are deleted).
+
+    Required:
+        conpath -- The folder of the workspace.
+        db_name -- The name of the workspace (e.g. "benchmark.gdb").
+
+    Optional:
+        domains -- The number of domains.
+        codes -- The number of coded values per domain.
+        classes -- The number of feature classes and tables.
+        fields -- The number of fields per class (without the fields "NAME" and "PARENT_REF").
+        subtypes -- The number of subtypes per class (0: no subtypes).
+        relations -- The number of relationship classes (at most the number of classes).
+        rules -- The number of attribute rules per class.
+
+    Return:
+        models -- name of the phase -> data model (dictionary in the format of the JSON file)
+    """
+    base = {"LogFolder": "Logs", "LogVersion": "benchmark", "Conpath": conpath, "DBName": db_name,
+            "Overwrite": "True", "SpatialReferenceName": "CH1903+ LV95"}
+    domain_names = [f"Domain_{i}" for i in range(domains)]
+    class_names = [f"CLASS_{i}" for i in range(classes)]
+
+    create = dict(base, DeleteAllExisting = "False")
+    create["Domains"] = [{"domain_name": name, "domain_description": f"Synthetic domain {name}",
+                          "field_type": "SHORT", "domain_type": "CODED",
+                          "DomainValues": {str(code): f"Value {code}" for code in range(1, codes + 1)}}
+                         for name in domain_names]
+    create["Datasets"] = [{"out_name": "BENCHMARK"}]
+    create["Features"] = []
+    create["Tables"] = []
+    for i, name in enumerate(class_names):
+        item = {"out_name": name, "GlobalID": "True", "EditorTracking": "True"}
+        item_fields = [{"field_name": "NAME", "field_type": "TEXT", "field_length": "50"},
+                       {"field_name": "PARENT_REF", "field_type": "GUID"}]
+        for j in range(fields):
+            field = {"field_name": f"FIELD_{j}", "field_type": "SHORT" if j % 2 == 0 else "TEXT"}
+            if j % 2 == 0 and domain_names:
+                domain_name = domain_names[(i * fields + j) % len(domain_names)]
+                if j == 0 and subtypes:
+                    # a domain per subtype
+                    field["FieldDomainSubtype"] = [
+                        {"field_domain": domain_names[(i + code) % len(domain_names)],
+                         "subtype_code": f"{code}: Type {code}"} for code in range(1, subtypes + 1)]
+                else:
+                    field["field_domain"] = domain_name
+            else:
+                field["field_length"] = "50"
+            item_fields.append(field)
+        item["Fields"] = item_fields
+        if subtypes:
+            item["Subtypes"] = {"field_name": "SUBTYPE",
+                                "SubtypeValues": {str(code): f"Type {code}" for code in range(1, subtypes + 1)},
+                                "DefaultSubtypeCode": "1"}
+        if rules:
+            item["AttributeRules"] = [{"name": f"RULE_{i}_{k}", "type": "CALCULATION", "field": "NAME",
+                                       "triggering_events": "INSERT;UPDATE",
+                                       "script_expression": f"return Upper(Trim($feature.NAME)) + '{k}'"}
+                                      for k in range(rules)]
+        if i % 2 == 0:
+            item.update(geometry_type = "POLYGON", out_dataset = "BENCHMARK")
+            create["Features"].append(item)
+        else:
+            create["Tables"].append(item)
+    create["Relations"] = [{"origin_table": class_names[i], "destination_table": class_names[(i + 1) % classes],
+                            "out_relationship_class": f"REL_{i}", "relationship_type": "SIMPLE",
+                            "forward_label": f"{class_names[i]} has children",
+                            "backward_label": f"Child of {class_names[i]}", "cardinality": "ONE_TO_MANY",
+                            "origin_primary_key": "GlobalID", "origin_foreign_key": "PARENT_REF"}
+                           for i in range(min(relations, classes))]
+
+    update = dict(base, DeleteAllExisting = "False")
+    update["UpdateDomains"] = [{"domain_name": name, "AddCodedValues": [
+                                   {"code": str(codes + 1), "code_description": f"Value {codes + 1}"}]}
+                               for name in domain_names if name not in domain_names[::4]]
+    for section, items in (("UpdateFeatures", create["Features"]), ("UpdateTables", create["Tables"])):
+        update[section] = [{"in_table": item["out_name"],
+                            "AddFields": [{"field_name": "COMMENT", "field_type": "TEXT", "field_length": "255"}]}
+                           for item in items]
+    update["DeleteDomains"] = domain_names[::4]
+
+    recreate = dict(create, DeleteAllExisting = "True")
+    return {"create": create, "update": update, "recreate": recreate}
+
+def run_phase(param_file, backend) -> dict:
+    """Runs a data model through the function main() of the script "create_db_model.py" and measures it.
+
+    Required:
+        param_file -- The path to the JSON file.
+        backend -- The backend of the geoprocessing functions (fake_arcpy.FakeArcpy).
+
+    Return:
+        result -- A dictionary with the keys "wall_time" (seconds), "peak_memory" (bytes allocated
+                  by Python), "calls" (name of the function -> number of calls), "total_calls",
+                  "errors" and "warnings".
+    """
+    main_args, _, _ = create_db_model.read_parameters(param_file)
+    main_args['mode'] = 'create'
+    calls = backend.calls.copy()
+    errors = create_db_model.error_counter.count
+    warnings = create_db_model.error_counter.warnings
+    create_db_model.profile.clear()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        create_db_model.main(**main_args)
+    finally:
+        wall_time = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    calls = {name: count - calls[name] for name, count in backend.calls.items() if count > calls[name]}
+    return {'wall_time': round(wall_time, 3), 'peak_memory': peak_memory, 'calls': dict(sorted(calls.items())),
+            'total_calls': sum(calls.values()), 'errors': create_db_model.error_counter.count - errors,
+            'warnings': create_db_model.error_counter.warnings - warnings}
+
+def run_benchmark(sizes, latency = None, model_folder = None, **counts) -> list:
+    """Runs the phases of the synthetic data models of the given sizes (see function generate_models()).
+    The numbers of domains, classes and relationship classes are multiplied by the size; the numbers
+    per object (coded values, fields, subtypes, attribute rules) are the same for all sizes.
+
+    Required:
+        sizes -- A list with the sizes (factors, e.g. [1, 2, 4, 8]).
+
+    Optional:
+        latency -- The latency per call (see fake_arcpy.FakeArcpy).
+        model_folder -- The folder to which the JSON files are written (default: a temporary folder).
+        counts -- The parameters of the function generate_models() for the size 1.
+
+    Return:
+        results -- A list with a dictionary per size and phase (see function run_phase()) with the
+                   additional keys "size", "phase" and "objects" (number of domains, classes and
+                   relationship classes).
+    """
+    scaled = ('domains', 'classes', 'relations')
+    results = []
+    with tempfile.TemporaryDirectory() as temp_folder:
+        folder = model_folder or temp_folder
+        os.makedirs(folder, exist_ok = True)
+        for size in sizes:
+            size_counts = {key: value * size if key in scaled else value for key, value in counts.items()}
+            models = generate_models(os.path.join(temp_folder, f'size_{size}'), 'benchmark.gdb', **size_counts)
+            objects = sum(size_counts.get(key, 0) for key in scaled)
+            backend = fake_arcpy.FakeArcpy(latency)
+            previous_backend = create_db_model.set_backend(backend)
+            try:
+                for phase in PHASES:
+                    param_file = os.path.join(folder, f'benchmark_{size}_{phase}.json')
+                    with open(param_file, 'w', encoding = 'utf-8') as f:
+                        json.dump(models[phase], f, indent = 3)
+                    result = run_phase(param_file, backend)
+                    results.append(dict(size = size, phase = phase, objects = objects, **result))
+            finally:
+                create_db_model.set_backend(previous_backend)
+    return results
+
+def get_growth(results, max_exponent = 1.2) -> list:
+    """Estimates how the number of calls of every function grows with the size of the model: the
+    exponent of the power law between the smallest and the largest size (1: linear, 2: quadratic).
+
+    Required:
+        results -- The results of the function run_benchmark().
+
+    Optional:
+        max_exponent -- The exponent from which on the growth is marked as superlinear.
+
+    Return:
+        growth -- A list of dictionaries with the keys "phase", "function", "exponent" and "superlinear".
+    """
+    growth = []
+    for phase in PHASES:
+        runs = sorted((result for result in results if result['phase'] == phase), key = lambda r: r['objects'])
+        if len(runs) < 2 or runs[0]['objects'] == runs[-1]['objects']:
+            continue
+        first, last = runs[0], runs[-1]
+        for function in sorted(set(first['calls']) | set(last['calls'])):
+            first_calls, last_calls = first['calls'].get(function, 0), last['calls'].get(function, 0)
+            if not first_calls or not last_calls:
+                # constant numbers of calls (e.g. no calls for the smallest size) can not be compared
+                continue
+            exponent = math.log(last_calls / first_calls) / math.log(last['objects'] / first['objects'])
+            growth.append({'phase': phase, 'function': function, 'exponent': round(exponent, 2),
+                           'superlinear': exponent > max_exponent})
+    return growth
+
+def print_report(results, growth) -> None:
+    """Prints the results of the benchmark as tables (see functions run_benchmark() and get_growth())."""
+    print(f'{"size":>5} {"phase":<9} {"objects":>8} {"calls":>8} {"time [s]":>9} {"calls/s":>9} '
+          f'{"memory [MB]":>12} {"errors":>7}')
+    for result in results:
+        rate = result['total_calls'] / result['wall_time'] if result['wall_time'] else 0
+        print(f'{result["size"]:>5} {result["phase"]:<9} {result["objects"]:>8} {result["total_calls"]:>8} '
+              f'{result["wall_time"]:>9.3f} {rate:>9.0f} {result["peak_memory"] / 2 ** 20:>12.1f} '
+              f'{result["errors"]:>7}')
+
+    sizes = sorted(set(result['size'] for result in results))
+    print()
+    print(f'{"phase":<9} {"function":<28}' + ''.join(f'{"x" + str(size):>8}' for size in sizes) + f'{"growth":>8}')
+    exponents = {(item['phase'], item['function']): item for item in growth}
+    for phase in PHASES:
+        runs = {result['size']: result for result in results if result['phase'] == phase}
+        functions = sorted(set(name for result in runs.values() for name in result['calls']))
+        for function in functions:
+            item = exponents.get((phase, function))
+            mark = (f'{item["exponent"]:>7.2f}' + ('!' if item['superlinear'] else ' ')) if item else f'{"-":>7} '
+            print(f'{phase:<9} {function:<28}' +
+                  ''.join(f'{runs[size]["calls"].get(function, 0) if size in runs else "-":>8}' for size in sizes) + mark)
+
+    superlinear = [item for item in growth if item['superlinear']]
+    if superlinear:
+        print()
+        for item in superlinear:
+            print(f'The calls of "{item["function"]}" grow superlinear in the phase "{item["phase"]}" '
+                  f'(exponent {item["exponent"]})!')
+
+def parse_latency(values) -> object:
+    """Parses the latency of the command line: "0.001" (all functions) or "NAME=0.05" (a function)."""
+    latency = {}
+    for value in values or []:
+        name, _, seconds = value.rpartition('=')
+        latency[name or 'default'] = float(seconds)
+    return latency or None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Benchmark the script "create_db_model.py" with synthetic data '
+                                                   'models of increasing size against a geodatabase simulated in memory.')
+    parser.add_argument('--sizes', type = int, nargs = '+', default = [1, 2, 4, 8],
+                        help = 'The sizes of the models: factors of the numbers of domains, classes and relations '
+                               '(default: 1 2 4 8).')
+    parser.add_argument('--domains', type = int, default = 10, help = 'The number of domains of size 1 (default: 10).')
+    parser.add_argument('--codes', type = int, default = 10, help = 'The number of coded values per domain (default: 10).')
+    parser.add_argument('--classes', type = int, default = 10,
+                        help = 'The number of feature classes and tables of size 1 (default: 10).')
+    parser.add_argument('--fields', type = int, default = 10, help = 'The number of fields per class (default: 10).')
+    parser.add_argument('--subtypes', type = int, default = 3, help = 'The number of subtypes per class (default: 3).')
+    parser.add_argument('--relations', type = int, default = 5,
+                        help = 'The number of relationship classes of size 1 (default: 5).')
+    parser.add_argument('--rules', type = int, default = 1, help = 'The number of attribute rules per class (default: 1).')
+    parser.add_argument('--latency', nargs = '+', metavar = '[FUNCTION=]SECONDS',
+                        help = 'The latency per call, e.g. "0.002" for all functions and "ListDomains=0.05" '
+                               'for a single function (default: no latency).')
+    parser.add_argument('--max-exponent', type = float, default = 1.2,
+                        help = 'The growth exponent of the calls from which on a function is marked (default: 1.2).')
+    parser.add_argument('--models', metavar = 'FOLDER', help = 'Keep the generated JSON files in this folder.')
+    parser.add_argument('--json', metavar = 'FILE', help = 'Write the results as JSON to FILE.')
+    args = parser.parse_args()
+
+    # only warnings and errors are logged on the console
+    create_db_model.init_logging(None)
+    create_db_model.logger.setLevel(logging.WARNING)
+
+    counts = {'domains': args.domains, 'codes': args.codes, 'classes': args.classes, 'fields': args.fields,
+              'subtypes': args.subtypes, 'relations': args.relations, 'rules': args.rules}
+    latency = parse_latency(args.latency)
+    results = run_benchmark(sorted(set(args.sizes)), latency, args.models, **counts)
+    growth = get_growth(results, args.max_exponent)
+    print_report(results, growth)
+    if args.json:
+        with open(args.json, 'w', encoding = 'utf-8') as f:
+            json.dump({'parameters': dict(counts, sizes = args.sizes, latency = latency),
+                       'runs': results, 'growth': growth}, f, indent = 3)
+        print(f'The results have been written to "{args.json}"')
+    sys.exit(1 if any(item['superlinear'] for item in growth) else 0)
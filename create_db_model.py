@@ -12,46 +12,556 @@
 #
 # Created: 02.01.2023
 # -----------------------------------------------------------------------------
-import sys, os, logging, json, time
-import arcpy
+import sys, os, argparse, logging, logging.handlers, json, time, re, heapq, multiprocessing, concurrent.futures
+import importlib, importlib.util, functools, inspect, csv, collections.abc, codecs, hashlib, sqlite3
+import tempfile, queue, atexit, ast, threading
 
-def init_logging(file)  -> None:
-    """Initialises logging to a file and on the console.
+class ArcpyBackend:
+    """Backend of the geoprocessing functions that imports arcpy on the first use, so that the
+    script starts without delay and the JSON file can be read and planned without ArcGIS Pro.
+    """
+    def __init__(self):
+        self.module = None
+
+    def __getattr__(self, name):
+        if self.module is None:
+            self.module = importlib.import_module('arcpy')
+        return getattr(self.module, name)
+
+# all geoprocessing functions are called through this backend (see function set_backend())
+arcpy = ArcpyBackend()
+
+def get_backend(name = "arcpy"):
+    """Returns a new backend for the geoprocessing functions.
+
+    Optional:
+        name -- "arcpy": The ArcGIS arcpy package, imported on the first use (default).
+                "fake": A geodatabase simulated in memory (see module fake_arcpy).
+
+    Return:
+        backend -- An object with the functions of arcpy used by this script.
+    """
+    if name == "arcpy":
+        return ArcpyBackend()
+    if name == "fake":
+        fake_arcpy = importlib.import_module('fake_arcpy')
+        return fake_arcpy.FakeArcpy()
+    raise ValueError(f'The backend "{name}" does not exist!')
+
+def get_backend_name() -> str:
+    """Returns the name of the backend of the geoprocessing functions ("arcpy" or "fake")."""
+    backend = getattr(arcpy, 'backend', arcpy)
+    return "arcpy" if isinstance(backend, ArcpyBackend) else "fake"
+
+def set_backend(backend):
+    """Sets the backend of the geoprocessing functions. The catalog snapshot is reloaded on the next request.
+
+    Required:
+        backend -- The backend (see function get_backend()).
+
+    Return:
+        previous_backend -- The backend that was set before.
+    """
+    global arcpy, catalog
+    previous_backend = arcpy
+    arcpy = backend
+    catalog = None
+    return previous_backend
+
+# number of codes from which on the coded values of a domain are loaded with a single call of TableToDomain
+# (the temporary table costs more than a few calls of AddCodedValueToDomain, the break-even is at 500 to 3000 codes)
+BULK_DOMAIN_THRESHOLD = 500
+
+# parameters of the function add_field() that are supported by arcpy.management.AddFields
+ADD_FIELDS_PARAMETERS = ["field_name", "field_type", "field_alias", "field_length", "field_domain"]
+
+# parameters of the function add_attribute_rule() -> columns of the CSV file of arcpy.management.ImportAttributeRules
+IMPORT_RULES_COLUMNS = {"name": "NAME", "description": "DESCRIPTION", "type": "TYPE", "subtype": "SUBTYPE",
+                        "field": "FIELD", "is_editable": "ISEDITABLE", "triggering_events": None,
+                        "script_expression": "SCRIPTEXPRESSION", "error_number": "ERRORNUMBER",
+                        "error_message": "ERRORMESSAGE", "exclude_from_client_evaluation": "EXCLUDECLIENTEVALUATION",
+                        "batch": "BATCH", "severity": "SEVERITY", "tags": "TAGS"}
+
+class EventFormatter(logging.Formatter):
+    """Formats the events of the measured operations as JSON records (see function timed())."""
+    def format(self, record) -> str:
+        return json.dumps(record.event, ensure_ascii = False)
+
+def is_event(record) -> bool:
+    """Checks whether a log record is an event of a measured operation (see function timed())."""
+    return hasattr(record, 'event')
+
+# queue handlers of init_logging() that are still open (closed when the process ends, see function close_logging())
+open_log_handlers = []
+
+def init_logging(file, console = True)  -> list:
+    """Initialises logging to a file and on the console. The records are passed through a queue and
+    written by a background thread, so that writing the log never blocks the geoprocessing tools.
+    Besides the log file, the measured operations are written to a JSON-lines file
+    ("<log file>_events.jsonl", see function timed()).
 
     Required:
-        file -- The path to the log file.
+        file -- The path to the log file (None: logging on the console only).
+
+    Optional:
+        console -- If the messages are logged on the console.
+
+    Return:
+        handlers -- The added handlers (see function close_logging()).
     """
     global logger
     logger = logging.getLogger('myapp')
-    # logging to file
-    hdlr = logging.FileHandler(file, mode='w')
     formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
-    hdlr.setFormatter(formatter)
-    logger.addHandler(hdlr)
+    handlers = []
+    # logging to file
+    if file:
+        hdlr = logging.FileHandler(file, mode='w')
+        hdlr.setFormatter(formatter)
+        handlers.append(hdlr)
     # logging to console
-    consoleHandler = logging.StreamHandler()
-    consoleHandler.setFormatter(formatter)
-    logger.addHandler(consoleHandler)
+    if console:
+        consoleHandler = logging.StreamHandler()
+        consoleHandler.setFormatter(formatter)
+        handlers.append(consoleHandler)
+    for handler in handlers:
+        handler.addFilter(lambda record: not is_event(record))
+    # events of the measured operations (one JSON record per line)
+    if file:
+        eventHandler = logging.FileHandler(os.path.splitext(file)[0] + '_events.jsonl', mode='w', encoding = 'utf-8')
+        eventHandler.setFormatter(EventFormatter())
+        eventHandler.addFilter(is_event)
+        handlers.append(eventHandler)
+
+    # the handlers are called by the background thread of the listener
+    listener = logging.handlers.QueueListener(queue.Queue(-1), *handlers, respect_handler_level = True)
+    queue_handler = logging.handlers.QueueHandler(listener.queue)
+    queue_handler.listener = listener
+    listener.start()
+    logger.addHandler(queue_handler)
+    # the records in the queue are written if the process ends without close_logging()
+    open_log_handlers.append(queue_handler)
 
     logger.setLevel(logging.INFO)
+    return [queue_handler]
 
-def search(file, text) -> int:
-    """Search for a specific string in a file.
+def close_logging(handlers = None) -> None:
+    """Removes the handlers added by the function init_logging(), writes the records in the queue
+    and closes the log files.
+
+    Optional:
+        handlers -- The handlers returned by init_logging() (default: all handlers that are still open).
+    """
+    if handlers is None:
+        handlers = list(open_log_handlers)
+    for handler in handlers:
+        if handler in open_log_handlers:
+            open_log_handlers.remove(handler)
+        logger.removeHandler(handler)
+        listener = getattr(handler, 'listener', None)
+        if listener is not None:
+            handler.listener = None
+            listener.stop()
+            for listener_handler in listener.handlers:
+                listener_handler.close()
+        handler.close()
+
+atexit.register(close_logging)
+
+# sections of the JSON file whose items are read on demand (see class ModelReader)
+STREAMED_SECTIONS = ["Domains", "Datasets", "Templates", "Features", "Tables", "Relations", "UpdateFeatures",
+                     "UpdateTables", "UpdateDomains"]
+
+class ModelReader:
+    """Reads a JSON file of a data model item by item, so that the memory usage does not depend on
+    the size of the file. The items of the sections STREAMED_SECTIONS are checked while reading but
+    not kept in memory: they are returned as ModelItem objects that read the item from the file when
+    it is used. Errors are reported with the line and column in the file.
 
     Required:
-        file -- The path to the file (e.g. log file).
-        text -- The string which is to be searched for.
+        path -- The path to the JSON file.
 
-    Return:
-        cnt -- The number of occurrences of the string in the file.
+    Optional:
+        chunk_size -- The number of bytes read at once.
+    """
+    DECODER = json.JSONDecoder()
+    WHITESPACE = re.compile(r'[ \t\r\n]*')
+    BRACKETS = re.compile(r'[{}\[\]"]')
+    STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"')
+    SCALAR_END = re.compile(r'[,\]}\s]')
+
+    def __init__(self, path, chunk_size = 1 << 20):
+        self.path = os.path.abspath(path)
+        self.chunk_size = chunk_size
+        self.file = None
+        self.decoder = None
+        self.eof = False
+        self.buffer = ''
+        # position of the buffer and current position in the file (characters)
+        self.start = 0
+        self.pos = 0
+        # a position in the file in characters and bytes (see byte_position)
+        self.offset = (0, 0)
+        # the size and the modification time of the file when it was read (see class ModelItem)
+        self.stamp = None
+
+    def read(self) -> dict:
+        """Returns the top-level keys of the JSON file. The sections STREAMED_SECTIONS are lists of
+        ModelItem objects, all other values are read completely."""
+        data = {}
+        with open(self.path, 'rb') as self.file:
+            stat = os.fstat(self.file.fileno())
+            self.stamp = (stat.st_size, stat.st_mtime_ns)
+            self.decoder = codecs.getincrementaldecoder('utf-8')()
+            if self.file.read(3) == codecs.BOM_UTF8:
+                self.offset = (0, 3)
+            else:
+                self.file.seek(0)
+            self.expect('{')
+            if self.peek() == '}':
+                self.pos += 1
+            else:
+                while True:
+                    if self.peek() != '"':
+                        self.error('Expecting property name enclosed in double quotes', self.pos)
+                    key = self.read_value()[0]
+                    self.expect(':')
+                    if key in STREAMED_SECTIONS and self.peek() == '[':
+                        data[key] = self.read_items()
+                    else:
+                        data[key] = self.read_value()[0]
+                    if self.next_separator('}'):
+                        break
+            if self.peek() != '':
+                self.error('Extra data', self.pos)
+        return data
+
+    def read_items(self) -> list:
+        """Reads the items of a list and returns them as ModelItem objects."""
+        self.pos += 1
+        items = []
+        if self.peek() == ']':
+            self.pos += 1
+            return items
+        while True:
+            value, start, end = self.read_value()
+            if isinstance(value, dict):
+                offset = self.byte_position(start)
+                value = ModelItem(self.path, offset, self.byte_position(end) - offset, self.stamp)
+            items.append(value)
+            if self.next_separator(']'):
+                return items
+
+    def read_value(self) -> tuple:
+        """Reads the next JSON value. Returns the value and its start and end position in the file."""
+        self.peek()
+        start = self.pos
+        complete = False
+        while True:
+            try:
+                value, end = self.DECODER.raw_decode(self.buffer, start - self.start)
+            except json.JSONDecodeError:
+                e = sys.exc_info()[1]
+                if complete or self.eof:
+                    self.error(e.msg, self.start + e.pos)
+                # the value may continue in the next chunk of the file
+                complete = self.find_end(start)
+                continue
+            if end < len(self.buffer) or self.eof:
+                break
+            # a number at the end of the buffer may continue in the next chunk of the file
+            self.fill()
+        self.pos = self.start + end
+        return value, start, self.pos
+
+    def find_end(self, start) -> bool:
+        """Reads the file until the buffer contains the whole value at the start position, without
+        parsing the value. Returns False if the end of the file is reached before."""
+        if self.buffer[start - self.start] not in '{["':
+            while not self.SCALAR_END.search(self.buffer, start - self.start):
+                if not self.fill():
+                    return False
+            return True
+        pos = start
+        depth = 0
+        while True:
+            match = self.BRACKETS.search(self.buffer, pos - self.start)
+            if not match:
+                pos = self.start + len(self.buffer)
+                if not self.fill():
+                    return False
+                continue
+            pos = self.start + match.end()
+            if match.group() == '"':
+                match = self.STRING_END.match(self.buffer, pos - self.start)
+                while not match:
+                    if not self.fill():
+                        return False
+                    match = self.STRING_END.match(self.buffer, pos - self.start)
+                pos = self.start + match.end()
+                if depth == 0:
+                    return True
+            elif match.group() in '{[':
+                depth += 1
+            else:
+                depth -= 1
+                if depth <= 0:
+                    return True
+
+    def next_separator(self, close) -> bool:
+        """Reads "," or the closing bracket. Returns True if the closing bracket was read."""
+        char = self.peek()
+        self.pos += 1
+        if char == close:
+            return True
+        if char != ',':
+            self.error('Expecting "," delimiter', self.pos - 1)
+        return False
+
+    def expect(self, char) -> None:
+        """Reads the expected character."""
+        if self.peek() != char:
+            self.error(f'Expecting "{char}"', self.pos)
+        self.pos += 1
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character ('' at the end of the file)."""
+        while True:
+            match = self.WHITESPACE.match(self.buffer, self.pos - self.start)
+            self.pos = self.start + match.end()
+            if match.end() < len(self.buffer):
+                return self.buffer[match.end()]
+            if not self.fill():
+                return ''
+
+    def fill(self) -> bool:
+        """Reads the next chunk of the file into the buffer. Returns False at the end of the file."""
+        if self.pos - self.start > self.chunk_size:
+            # the part of the buffer that has been read is removed
+            self.byte_position(self.pos)
+            self.buffer = self.buffer[self.pos - self.start:]
+            self.start = self.pos
+        # large values are read with larger chunks
+        chunk = self.file.read(max(self.chunk_size, len(self.buffer)))
+        self.eof = not chunk
+        self.buffer += self.decoder.decode(chunk, final = self.eof)
+        return not self.eof
+
+    def byte_position(self, pos) -> int:
+        """Returns the position in bytes of a position in the buffer (characters). The positions must
+        be requested in ascending order."""
+        char_pos, byte_pos = self.offset
+        byte_pos += len(self.buffer[char_pos - self.start:pos - self.start].encode('utf-8'))
+        self.offset = (pos, byte_pos)
+        return byte_pos
+
+    def error(self, message, pos) -> None:
+        raise ValueError(f'{message}: {format_position(self.path, pos)}')
+
+class ModelItem(collections.abc.Mapping):
+    """An item of a section of the JSON file (e.g. a feature class), which is read from the file
+    when it is used (see class ModelReader). The item is read-only. Each access parses the item,
+    so a function that reads several keys parses it once with the function load_item().
+
+    Required:
+        path -- The path to the JSON file.
+        offset -- The position of the item in the file (bytes).
+        length -- The length of the item (bytes).
+
+    Optional:
+        stamp -- The size and the modification time of the file when the item was found (see
+                 function read_model_item()).
+    """
+    __slots__ = ('path', 'offset', 'length', 'stamp')
+
+    def __init__(self, path, offset, length, stamp = None):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.stamp = stamp
+
+    def load(self) -> dict:
+        # the item is parsed again each time, so that changes of the returned values do not affect the item
+        return json.loads(read_model_item(self.path, self.offset, self.length, self.stamp))
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    # the methods of the Mapping would parse the item for each key
+    def get(self, key, default = None):
+        return self.load().get(key, default)
+
+    def __contains__(self, key) -> bool:
+        return key in self.load()
+
+    def keys(self):
+        return self.load().keys()
+
+    def items(self):
+        return self.load().items()
+
+    def values(self):
+        return self.load().values()
+
+    def __repr__(self) -> str:
+        return f'ModelItem({self.path!r}, {self.offset}, {self.length})'
+
+# the texts of the items read last (see function read_model_item()): (path, offset, length, stamp) -> text
+model_item_cache = collections.OrderedDict()
+# the maximum size of the texts kept in memory and the current size (bytes)
+MODEL_ITEM_CACHE_BYTES = 16 << 20
+model_item_cache_bytes = 0
+
+def read_model_item(path, offset, length, stamp = None) -> str:
+    """Reads the text of an item of a JSON file (see class ModelItem). The items read last are kept in
+    memory up to MODEL_ITEM_CACHE_BYTES (an item larger than that is not kept). If the size or the
+    modification time of the file differ from the stamp, the file has been changed since the item was
+    found and the position of the item is not valid anymore: a ValueError is raised."""
+    global model_item_cache_bytes
+    key = (path, offset, length, stamp)
+    text = model_item_cache.get(key)
+    if text is not None:
+        model_item_cache.move_to_end(key)
+        return text
+    with open(path, 'rb') as f:
+        if stamp is not None:
+            stat = os.fstat(f.fileno())
+            if (stat.st_size, stat.st_mtime_ns) != tuple(stamp):
+                raise ValueError(f'The JSON file "{path}" has been changed while the data model is processed!')
+        f.seek(offset)
+        text = f.read(length).decode('utf-8')
+    if length <= MODEL_ITEM_CACHE_BYTES:
+        model_item_cache[key] = text
+        model_item_cache_bytes += length
+        while model_item_cache_bytes > MODEL_ITEM_CACHE_BYTES:
+            (_, _, item_length, _), _ = model_item_cache.popitem(last = False)
+            model_item_cache_bytes -= item_length
+    return text
+
+def format_position(path, pos) -> str:
+    """Returns the line and the column of a position (characters) in a text file as text."""
+    line, line_start, read = 1, 0, 0
+    with open(path, encoding = 'utf-8-sig', newline = '') as f:
+        while read < pos:
+            chunk = f.read(min(1 << 20, pos - read))
+            if not chunk:
+                break
+            count = chunk.count('\n')
+            if count:
+                line += count
+                line_start = read + chunk.rindex('\n') + 1
+            read += len(chunk)
+    return f'"{path}" line {line} column {pos - line_start + 1} (char {pos})'
+
+def load_item(item) -> dict:
+    """Returns an item of the JSON file as dictionary (an item of the class ModelItem is read once)."""
+    return item.load() if isinstance(item, ModelItem) else item
+
+class ErrorCounter(logging.Handler):
+    """Counts the errors and warnings logged by the logger (including those of the worker processes,
+    see function run_nodes()), so that a function can check whether it failed (the implemented
+    functions log errors instead of raising them) and the totals of a run are known without
+    reading the log file again."""
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.count = 0
+        self.warnings = 0
+
+    def emit(self, record) -> None:
+        if record.levelno >= logging.ERROR:
+            self.count += 1
+        else:
+            self.warnings += 1
+
+error_counter = ErrorCounter()
+logging.getLogger('myapp').addHandler(error_counter)
+# the operations measured by the decorator timed() are logged as events (see function init_logging())
+events = logging.getLogger('myapp.events')
+
+# the measured operations: a list of dictionaries (see function timed())
+profile = []
+# number of measured operations running (operations called by other operations are not measured)
+profile_depth = 0
+
+def timed(target):
+    """Decorator that measures an implemented function: the wall time, the target object and whether
+    errors were logged. The measurement is added to the list "profile" (see function write_profile())
+    and logged as event (see function init_logging()).
+
+    Required:
+        target -- The name of the parameter with the target object (e.g. "in_table").
     """
-    cnt = 0
-    with open(file) as f:
-        for line in f:
-            if text in line.lower():
-                cnt=cnt+1
-        return cnt
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            global profile_depth
+            if profile_depth:
+                return function(*args, **kwargs)
+            errors = error_counter.count
+            start = time.time()
+            start_counter = time.perf_counter()
+            profile_depth += 1
+            success = False
+            try:
+                result = function(*args, **kwargs)
+                success = error_counter.count == errors
+                return result
+            finally:
+                profile_depth -= 1
+                name = os.path.basename(os.path.normpath(str(signature.bind_partial(*args, **kwargs)
+                                                             .arguments.get(target, ''))))
+                if not name.lower().endswith(('.gdb', '.sde')):
+                    name = name.split('.')[-1]
+                profile.append({'operation': function.__name__, 'target': name,
+                                'start': round(start, 3), 'duration': round(time.perf_counter() - start_counter, 4),
+                                'success': success})
+                events.info(function.__name__, extra = {'event': {
+                    'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(start)), 'op': function.__name__,
+                    'target': name, 'duration': profile[-1]['duration'], 'status': 'ok' if success else 'error',
+                    'backend': get_backend_name()}})
+        return wrapper
+    return decorator
+
+def write_profile(file) -> None:
+    """Writes the measured operations to a JSON file and a CSV file.
 
+    Required:
+        file -- The path to the files without file ending.
+    """
+    with open(file + '.json', 'w', encoding = 'utf-8') as f:
+        json.dump(profile, f, indent = 1)
+    with open(file + '.csv', 'w', encoding = 'utf-8', newline = '') as f:
+        writer = csv.DictWriter(f, fieldnames = ['operation', 'target', 'start', 'duration', 'success'],
+                                delimiter = ';')
+        writer.writeheader()
+        writer.writerows(profile)
+
+def log_profile_summary(top = 10) -> None:
+    """Logs the operation types and the classes (feature classes, tables, domains, ...) with the
+    longest total duration.
+
+    Optional:
+        top -- The number of operation types and classes that are logged.
+    """
+    failed = sum(1 for record in profile if not record['success'])
+    logger.info(f'{len(profile)} operations measured in {round(sum(r["duration"] for r in profile), 1)} sec. '
+                f'({failed} failed)')
+    for title, key in (('operation types', 'operation'), ('classes and domains', 'target')):
+        groups = {}
+        for record in profile:
+            group = groups.setdefault(record[key], [0, 0.0])
+            group[0] += 1
+            group[1] += record['duration']
+        logger.info(f'Top {top} {title} by duration:')
+        for name, (count, duration) in sorted(groups.items(), key = lambda item: -item[1][1])[:top]:
+            logger.info(f'  {name:<40} {count:>5} x {duration:>8.2f} sec.')
 
 def field_exists(in_table, field_name) -> bool:
     """Checks whether the field exists.
@@ -60,11 +570,7 @@ def field_exists(in_table, field_name) -> bool:
         in_table -- The Name of the table or the feature-class.
         field_name -- The Name of the field.
     """
-    field_names = [field.name for field in arcpy.ListFields(in_table)]
-    if field_name in field_names:
-        return True
-    else:
-        return False
+    return get_catalog().field_exists(in_table, field_name)
 
 def contains_umlaut(name: str) -> bool:
     """Checks if a string contains a umlaut (ö, ä, ü).
@@ -97,7 +603,7 @@ def filter_dict(dic, dic_type = None) -> dict:
     Return:
         dic_filtered -- The filtered dictionary.
     """
-    dic = {k: v for k, v in dic.items() if v is not None and len(str(v))>0}
+    dic = {k: v for k, v in load_item(dic).items() if v is not None and len(str(v))>0}
     dic_filtered = dic.copy()
 
     if dic_type == "feature":
@@ -141,79 +647,549 @@ def get_spatial_reference(spatial_reference, vcs = None):
         e = sys.exc_info()[1]
         raise ValueError(f'spatial_reference "{spatial_reference}" is invalid: {e.args[0]}')
 
-def delete_all(in_workspace)-> None:
-    """Delete all existing features, tables, datasets and domains.
+def get_object_key(in_data) -> str:
+    """Returns the key of an object in the workspace catalog.
+
+    Required:
+        in_data -- The name or the path of a dataset, feature class, table, relationship class
+                   or field (e.g. "LOCATION", "C:/Temp/event.gdb/EVENT/LOCATION" or
+                   "DB.OWNER.LOCATION").
+
+    Return:
+        key -- The unqualified name in lower case (e.g. "location").
+    """
+    name = os.path.basename(os.path.normpath(str(in_data)))
+    return name.split('.')[-1].lower()
+
+class WorkspaceCatalog:
+    """Snapshot of the catalog of a workspace (domains, datasets, feature classes, tables,
+    relationship classes and fields). The snapshot is loaded once and is updated by the implemented
+    functions when they create or delete objects, so that checks like "does the domain exist?" do
+    not query the workspace again.
 
     Required:
         in_workspace -- The path to the workspace (gdb, sde connection file).
     """
-    #arcpy.env.workspace = in_workspace
-    #arcpy.env.overwriteOutput = True
-    
-    fc_list = arcpy.ListFeatureClasses()
-    tables = arcpy.ListTables()
-    ds_list = arcpy.ListDatasets()
-    all_domains = arcpy.da.ListDomains(in_workspace)
+    def __init__(self, in_workspace):
+        self.workspace = in_workspace
+        # key -> domain name
+        self.domains = {}
+        # key of the domain -> field type of the domain (e.g. "SHORT")
+        self.domain_types = {}
+        # key -> {"name": name, "type": data type, "dataset": name of the dataset or "",
+        #         "related": names of the origin and destination of a relationship class}
+        self.objects = {}
+        # key of the table -> {key of the field: field name} or None if not loaded yet
+        self.fields = {}
+        # key of the table -> {rule name in lower case: rule name} or None if not loaded yet
+        self.rules = {}
+        # (key of the table, key of the field, subtype code or None) -> key of the domain
+        self.field_domains = {}
+        # key of the domain -> {(key of the table, key of the field, subtype code or None):
+        #                       (table name, field name, subtype or None)}
+        self.domain_usages = {}
+        # the schema as loaded from the workspace (not updated): key of the domain -> domain object,
+        # key of the object -> Describe dictionary, key of the table -> ListSubtypes dictionary
+        self.domain_schema = {}
+        self.object_schema = {}
+        self.subtype_schema = {}
+        self.load()
+
+    def load(self) -> None:
+        """Loads the catalog of the workspace with one call of ListDomains and one call of Describe.
+        For tables with subtypes, the domains of the subtypes are read with ListSubtypes."""
+        self.domains = {}
+        self.domain_types = {}
+        self.objects = {}
+        self.fields = {}
+        self.rules = {}
+        self.field_domains = {}
+        self.domain_usages = {}
+        self.domain_schema = {}
+        self.object_schema = {}
+        self.subtype_schema = {}
+        for domain in arcpy.da.ListDomains(self.workspace):
+            self.add_domain(domain.name, domain.type)
+            self.domain_schema[domain.name.lower()] = domain
+
+        def walk(children, dataset):
+            for child in children:
+                if child['dataType'] == 'FeatureDataset':
+                    self.add(child['name'].split('.')[-1], child['dataType'])
+                    walk(child.get('children', []), child['name'].split('.')[-1])
+                elif child['dataType'] in ('FeatureClass', 'Table', 'RelationshipClass'):
+                    self.load_object(child, dataset)
+
+        walk(arcpy.da.Describe(self.workspace).get('children', []), '')
+
+    def load_object(self, child, dataset = '') -> None:
+        """Adds a feature class, table or relationship class of the workspace with its fields and the
+        domains assigned to them.
+
+        Required:
+            child -- The Describe dictionary of the object.
+
+        Optional:
+            dataset -- The name of the dataset of the object.
+        """
+        name = child['name'].split('.')[-1]
+        fields = child.get('fields')
+        related = child.get('originClassNames', []) + child.get('destinationClassNames', [])
+        self.add(name, child['dataType'], dataset,
+                 [field.name for field in fields] if fields is not None else None, related)
+        self.object_schema[get_object_key(name)] = child
+        if 'attributeRules' in child:
+            self.rules[get_object_key(name)] = {rule['name'].lower(): rule['name']
+                                                for rule in child['attributeRules']}
+        for field in fields or []:
+            if field.domain:
+                self.add_domain_usage(name, field.name, field.domain)
+        if child.get('subtypeFieldName'):
+            self.load_subtype_domains(name, child.get('catalogPath', name))
+
+    def refresh(self, in_data) -> None:
+        """Reads a feature class, table or relationship class again from the workspace (e.g. after it has
+        been changed or deleted by another worker process) without loading the whole catalog.
+
+        Required:
+            in_data -- The name or the path of the object.
+        """
+        key = get_object_key(in_data)
+        item = self.objects.pop(key, None)
+        dataset = item['dataset'] if item else ''
+        path = os.path.join(self.workspace, dataset, item['name'] if item else str(in_data))
+        for usage in [usage for usage in self.field_domains if usage[0] == key]:
+            self.remove_domain_usage(*usage)
+        for schema in (self.fields, self.rules, self.object_schema, self.subtype_schema):
+            schema.pop(key, None)
+        if arcpy.Exists(path):
+            self.load_object(arcpy.da.Describe(path), dataset)
+
+    def exists(self, in_data, data_type = None) -> bool:
+        """Checks whether a dataset, feature class, table or relationship class exists.
+
+        Required:
+            in_data -- The name or the path of the object.
+
+        Optional:
+            data_type -- The data type of the object (e.g. "FeatureClass").
+        """
+        item = self.objects.get(get_object_key(in_data))
+        if item is None:
+            return False
+        return data_type is None or item['type'] == data_type
+
+    def list(self, data_type, dataset = None) -> list:
+        """Returns the names of all objects of a data type.
+
+        Required:
+            data_type -- The data type (e.g. "FeatureClass").
+
+        Optional:
+            dataset -- Only objects in this dataset ("" for objects not stored in a dataset).
+        """
+        return [item['name'] for item in self.objects.values() if item['type'] == data_type
+                and (dataset is None or item['dataset'].lower() == dataset.lower())]
+
+    def add(self, in_data, data_type, dataset = '', fields = None, related = None) -> None:
+        """Adds an object to the catalog.
+
+        Required:
+            in_data -- The name or the path of the object.
+            data_type -- The data type of the object (e.g. "FeatureClass").
+
+        Optional:
+            dataset -- The name of the dataset of the object.
+            fields -- A list with the names of the fields or None if they are unknown.
+            related -- The names of the origin and destination tables of a relationship class.
+        """
+        key = get_object_key(in_data)
+        name = os.path.basename(os.path.normpath(str(in_data))).split('.')[-1]
+        self.objects[key] = {'name': name, 'type': data_type, 'dataset': dataset or '',
+                             'related': [get_object_key(r) for r in related or []]}
+        if data_type != 'FeatureDataset':
+            self.fields[key] = None if fields is None else {get_object_key(f): f for f in fields}
+            self.rules[key] = None if fields is None else {}
+
+    def remove(self, in_data) -> None:
+        """Removes an object from the catalog including the objects that are deleted together with it
+        (feature classes of a dataset, relationship classes and attachment tables of a table).
+
+        Required:
+            in_data -- The name or the path of the object.
+        """
+        key = get_object_key(in_data)
+        item = self.objects.pop(key, None)
+        self.fields.pop(key, None)
+        self.rules.pop(key, None)
+        for usage in [usage for usage in self.field_domains if usage[0] == key]:
+            self.remove_domain_usage(*usage)
+        if item is None:
+            return
+        if item['type'] == 'FeatureDataset':
+            for member in self.list('FeatureClass', item['name']) + self.list('RelationshipClass', item['name']):
+                self.remove(member)
+        elif item['type'] in ('FeatureClass', 'Table'):
+            for other in list(self.objects.values()):
+                if other['type'] == 'RelationshipClass' and key in other['related']:
+                    self.remove(other['name'])
+            self.remove(key + '__attach')
+
+    def domain_exists(self, domain_name) -> bool:
+        """Checks whether the domain exists."""
+        return domain_name.lower() in self.domains
+
+    def add_domain(self, domain_name, field_type = None) -> None:
+        """Adds a domain (and its field type, e.g. "SHORT") to the catalog."""
+        self.domains[domain_name.lower()] = domain_name
+        self.domain_types[domain_name.lower()] = field_type.upper() if field_type else None
+
+    def domain_type(self, domain_name) -> str:
+        """Returns the field type of a domain (e.g. "SHORT") or None if it is unknown."""
+        return self.domain_types.get(domain_name.lower())
+
+    def remove_domain(self, domain_name) -> None:
+        """Removes a domain from the catalog."""
+        self.domains.pop(domain_name.lower(), None)
+        self.domain_types.pop(domain_name.lower(), None)
+        for usage in list(self.domain_usages.get(domain_name.lower(), {})):
+            self.remove_domain_usage(*usage)
+
+    def load_subtype_domains(self, in_table, table_path) -> None:
+        """Reads the domains assigned to the subtypes of a table (see Esri arcpy.da.ListSubtypes).
+
+        Required:
+            in_table -- The name of the table or the feature class.
+            table_path -- The path of the table or the feature class.
+        """
+        subtypes = arcpy.da.ListSubtypes(table_path)
+        self.subtype_schema[get_object_key(in_table)] = subtypes
+        for code, subtype in subtypes.items():
+            for field_name, (default, domain) in subtype['FieldValues'].items():
+                if domain is not None:
+                    self.add_domain_usage(in_table, field_name, domain.name, f'{code}: {subtype["Name"]}')
+
+    def add_domain_usage(self, in_table, field_name, domain_name, subtype_code = None) -> None:
+        """Registers that a domain is assigned to a field. An earlier assignment of the field
+        (and the subtype) is replaced.
+
+        Required:
+            in_table -- The name or the path of the table or the feature class.
+            field_name -- The name of the field.
+            domain_name -- The name of the domain.
+
+        Optional:
+            subtype_code -- Subtypes for which the domain applies e.g. "1: Event;2: Boulevard".
+        """
+        subtypes = str(subtype_code).split(';') if subtype_code else [None]
+        for subtype in subtypes:
+            subtype = subtype.strip() if subtype else None
+            usage = (get_object_key(in_table), get_object_key(field_name),
+                     subtype.split(':')[0].strip() if subtype else None)
+            self.remove_domain_usage(*usage)
+            self.field_domains[usage] = domain_name.lower()
+            table_name = os.path.basename(os.path.normpath(str(in_table))).split('.')[-1]
+            self.domain_usages.setdefault(domain_name.lower(), {})[usage] = (table_name, field_name, subtype)
+
+    def remove_domain_usage(self, table_key, field_key, subtype = None) -> None:
+        """Removes the domain assignment of a field (and a subtype) from the catalog.
+
+        Required:
+            table_key -- The key of the table or the feature class.
+            field_key -- The key of the field.
+
+        Optional:
+            subtype -- The subtype code.
+        """
+        usage = (table_key, field_key, subtype)
+        domain_key = self.field_domains.pop(usage, None)
+        if domain_key is not None:
+            self.domain_usages[domain_key].pop(usage, None)
+            if not self.domain_usages[domain_key]:
+                del self.domain_usages[domain_key]
+
+    def get_domain_usages(self, domain_name) -> list:
+        """Returns all fields that use the domain.
+
+        Required:
+            domain_name -- The name of the domain.
+
+        Return:
+            usages -- A list of (table name, field name, subtype) tuples. The subtype is None if the
+                      domain is assigned to the field and not to a specific subtype.
+        """
+        return list(self.domain_usages.get(domain_name.lower(), {}).values())
+
+    def field_names(self, in_table) -> list:
+        """Returns the names of the fields of a table or a feature class. The fields are read
+        from the workspace only the first time they are requested.
+
+        Required:
+            in_table -- The name or the path of the table or the feature class.
+        """
+        key = get_object_key(in_table)
+        if self.fields.get(key) is None:
+            self.fields[key] = {}
+            try:
+                fields = arcpy.ListFields(in_table)
+            except OSError:
+                # the table does not exist (the error is logged by the function that uses the table)
+                fields = []
+            for field in fields:
+                self.fields[key][get_object_key(field.name)] = field.name
+                if field.domain:
+                    self.add_domain_usage(in_table, field.name, field.domain)
+        return list(self.fields[key].values())
+
+    def rule_names(self, in_table) -> list:
+        """Returns the names of the attribute rules of a table or a feature class. The rules are read
+        from the workspace only the first time they are requested.
+
+        Required:
+            in_table -- The name or the path of the table or the feature class.
+        """
+        key = get_object_key(in_table)
+        if self.rules.get(key) is None:
+            try:
+                rules = arcpy.da.Describe(in_table).get('attributeRules', [])
+            except OSError:
+                # the table does not exist (the error is logged by the function that uses the table)
+                rules = []
+            self.rules[key] = {rule['name'].lower(): rule['name'] for rule in rules}
+        return list(self.rules[key].values())
+
+    def add_rules(self, in_table, names) -> None:
+        """Adds attribute rules (e.g. after AddAttributeRule or ImportAttributeRules) to a table."""
+        self.rule_names(in_table)
+        self.rules[get_object_key(in_table)].update({name.lower(): name for name in names})
+
+    def remove_rules(self, in_table, names) -> None:
+        """Removes attribute rules (e.g. after DeleteAttributeRule) from a table."""
+        self.rule_names(in_table)
+        for name in names:
+            self.rules[get_object_key(in_table)].pop(name.lower(), None)
+
+    def field_exists(self, in_table, field_name) -> bool:
+        """Checks whether the field exists."""
+        self.field_names(in_table)
+        return get_object_key(field_name) in self.fields[get_object_key(in_table)]
+
+    def add_field(self, in_table, field_name, field_domain = None) -> None:
+        """Adds a field (and the assignment of its domain) to the catalog."""
+        fields = self.fields.get(get_object_key(in_table))
+        if fields is not None:
+            fields[get_object_key(field_name)] = field_name
+        if field_domain:
+            self.add_domain_usage(in_table, field_name, field_domain)
+
+    def remove_field(self, in_table, field_name) -> None:
+        """Removes a field (and the assignments of its domains) from the catalog."""
+        table_key = get_object_key(in_table)
+        field_key = get_object_key(field_name)
+        fields = self.fields.get(table_key)
+        if fields is not None:
+            fields.pop(field_key, None)
+        for usage in [usage for usage in self.field_domains if usage[:2] == (table_key, field_key)]:
+            self.remove_domain_usage(*usage)
+
+    def reset_fields(self, in_table) -> None:
+        """Marks the fields of a table as unknown so that they are read again on the next request."""
+        self.fields[get_object_key(in_table)] = None
+
+catalog = None
+# the phase of the nodes in which the catalog of a worker process has been loaded (see class ModelNode)
+loaded_catalog_phase = 0
+
+def get_catalog(in_workspace = None, reload = False) -> WorkspaceCatalog:
+    """Returns the catalog snapshot of the workspace. The snapshot is loaded on the first call.
 
-    # delete feature classes
-    for fc in fc_list:
-        try:
-            logger.info(f'The feature class "{fc}" will be deleted')
-            arcpy.management.Delete(fc)
-        except Exception:
-            e = sys.exc_info()[1]
-            logger.error(f'The existing feature class "{fc}" could not '
-                         f'be deletd: {e.args[0]}')
+    Optional:
+        in_workspace -- The path to the workspace (default: arcpy.env.workspace).
+        reload -- If the snapshot is to be loaded again (e.g. at the start of a run).
 
-    # delete tables
-    for table in tables:
-        try:
-            logger.info(f'The table "{table}" will be deleted')
-            arcpy.management.Delete(table)
-        except Exception:
-            e = sys.exc_info()[1]
-            logger.error(f'The existing table "{table}" could not '
-                         f'be deleted: {e.args[0]}')
+    Return:
+        catalog -- The catalog snapshot of the workspace.
+    """
+    global catalog
+    if in_workspace is None:
+        in_workspace = arcpy.env.workspace
+    if catalog is None or catalog.workspace != in_workspace or reload:
+        catalog = WorkspaceCatalog(in_workspace)
+    return catalog
+
+# data types of the workspace -> names used in the log messages
+DATA_TYPE_NAMES = {"FeatureClass": "feature class", "Table": "table", "RelationshipClass": "relationship class",
+                   "FeatureDataset": "datasets"}
+
+@timed('in_data')
+def delete_object(in_data, data_type) -> None:
+    """Delete a feature class, table, relationship class or feature dataset of the workspace
+    (see function delete_all()).
 
-    # delete datasets
-    for ds in ds_list:
-        try:
-            logger.info(f'The datasets "{ds}" will be deleted')
-            arcpy.management.Delete(ds)
-        except Exception:
-            e = sys.exc_info()[1]
-            logger.error(f'The existing dataset "{ds}" could not '
-                         f'be deleted: {e.args[0]}')
+    Required:
+        in_data -- The name of the object.
+        data_type -- The data type of the object (e.g. "FeatureClass").
+    """
+    type_name = DATA_TYPE_NAMES[data_type]
+    try:
+        logger.info(f'The {type_name} "{in_data}" will be deleted')
+        arcpy.management.Delete(in_data)
+        get_catalog().remove(in_data)
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'The existing {type_name} "{in_data}" could not be deleted: {e.args[0]}')
 
-    # delete domain
-    for domain in all_domains:
-        try:
-            logger.info(f'The domain "{domain.name}" will be deleted')
-            arcpy.management.DeleteDomain(in_workspace, domain.name)
-        except Exception:
-            e = sys.exc_info()[1]
-            logger.error(f'The existing domain "{domain.name}" could not '
-                         f'be deleted: {e.args[0]}')
+@timed('in_dataset')
+def delete_feature_dataset(in_dataset) -> None:
+    """Delete a feature dataset including its feature classes with a single call. If the dataset can not
+    be deleted as a whole (e.g. because a feature class belongs to another owner), the feature classes
+    are deleted one by one and the dataset afterwards.
+
+    Required:
+        in_dataset -- The name of the feature dataset.
+    """
+    workspace_catalog = get_catalog()
+    try:
+        logger.info(f'The datasets "{in_dataset}" will be deleted')
+        arcpy.management.Delete(in_dataset)
+        workspace_catalog.remove(in_dataset)
+        return
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.warning(f'The dataset "{in_dataset}" could not be deleted with a single call, '
+                       f'the feature classes will be deleted one by one: {e.args[0]}')
+    for data_type in ('RelationshipClass', 'FeatureClass'):
+        for member in workspace_catalog.list(data_type, in_dataset):
+            if workspace_catalog.exists(member):
+                delete_object(member, data_type)
+    delete_object(in_dataset, 'FeatureDataset')
+
+@timed('domain_name')
+def delete_unused_domain(in_workspace, domain_name) -> None:
+    """Delete a domain that is not used by a field anymore (see function delete_all()).
+
+    Required:
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+        domain_name -- The name of the domain.
+    """
+    workspace_catalog = get_catalog(in_workspace)
+    usages = workspace_catalog.get_domain_usages(domain_name)
+    if usages:
+        logger.warning(f'The domain "{domain_name}" is not deleted, it is still used by the field '
+                       f'"{usages[0][1]}" of "{usages[0][0]}"')
+        return
+    try:
+        logger.info(f'The domain "{domain_name}" will be deleted')
+        arcpy.management.DeleteDomain(in_workspace, domain_name)
+        workspace_catalog.remove_domain(domain_name)
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'The existing domain "{domain_name}" could not be deleted: {e.args[0]}')
+
+def build_delete_nodes(in_workspace) -> list:
+    """Returns the nodes that delete all objects of the workspace in the order of their dependencies
+    (see function run_nodes()): first the relationship classes and the attachment tables, then the
+    feature datasets (each with a single call), feature classes and tables as soon as the relationship
+    classes they belong to have been deleted and finally the domains as soon as no field (including the
+    fields of attributed relationship classes) uses them.
+
+    Required:
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+
+    Return:
+        nodes -- A list of ModelNode objects.
+    """
+    workspace_catalog = get_catalog(in_workspace)
+    nodes = []
+    # key of a feature class or a table -> IDs of the nodes that have to be processed before it is deleted
+    blockers = {}
+    # key of an object -> ID of the node that deletes it (the domains are deleted after the objects using them)
+    class_nodes = {}
+    for key, item in workspace_catalog.objects.items():
+        attachment = item['type'] == 'Table' and key.endswith('__attach') and key[:-8] in workspace_catalog.objects
+        if item['type'] == 'RelationshipClass' and not key.endswith('__attachrel'):
+            related = item['related']
+        elif attachment:
+            related = [key[:-8]]
+        else:
+            continue
+        node_id = f'Delete/{item["name"]}'
+        nodes.append(ModelNode(node_id, delete_object, {'in_data': item['name'], 'data_type': item['type']}))
+        # e.g. an attributed relationship class with a field using a domain
+        class_nodes[key] = node_id
+        for table_key in related:
+            table = workspace_catalog.objects.get(table_key)
+            # the members of a feature dataset are deleted with the dataset
+            if table is not None and table['dataset']:
+                table_key = get_object_key(table['dataset'])
+            if node_id not in blockers.setdefault(table_key, []):
+                blockers[table_key].append(node_id)
+    for key, item in workspace_catalog.objects.items():
+        if item['type'] == 'FeatureDataset':
+            node = ModelNode(f'Delete/{item["name"]}', delete_feature_dataset, {'in_dataset': item['name']},
+                             blockers.get(key))
+        elif item['type'] in ('FeatureClass', 'Table') and not item['dataset'] \
+                and not (key.endswith('__attach') and key[:-8] in workspace_catalog.objects):
+            node = ModelNode(f'Delete/{item["name"]}', delete_object, {'in_data': item['name'],
+                             'data_type': item['type']}, blockers.get(key))
+        else:
+            continue
+        nodes.append(node)
+        class_nodes[key] = node.node_id
+        for member in workspace_catalog.list('FeatureClass', item['name']) if item['type'] == 'FeatureDataset' else []:
+            class_nodes[get_object_key(member)] = node.node_id
+    for domain_key, domain_name in workspace_catalog.domains.items():
+        usages = workspace_catalog.domain_usages.get(domain_key, {})
+        dependencies = {class_nodes.get(usage[0]) for usage in usages}
+        dependencies.discard(None)
+        # the tables using the domain are read again by a worker process to see the deletions of the other workers
+        tables = sorted({usages[usage][0] for usage in usages if usage[0] in class_nodes})
+        nodes.append(ModelNode(f'DeleteDomain/{domain_name}', delete_unused_domain,
+                               {'in_workspace': in_workspace, 'domain_name': domain_name},
+                               sorted(dependencies), refresh = tables))
+    return nodes
+
+@timed('in_workspace')
+def delete_all(in_workspace, workers = 1, initargs = None)-> None:
+    """Delete all existing features, tables, datasets and domains. Objects that do not depend on each other
+    are deleted in parallel if more than one worker is used (see function build_delete_nodes()).
+
+    Required:
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+
+    Optional:
+        workers -- The number of worker processes (1: no worker processes).
+        initargs -- The parameters of the function init_worker() without the log queue (workspace, overwrite,
+                    environment_settings, checkpoint_file). Mandatory if workers > 1.
+    """
+    nodes = build_delete_nodes(in_workspace)
+    if workers > 1:
+        logger.info(f'{len(nodes)} objects are deleted with {workers} worker processes')
+    run_nodes(nodes, workers, initargs)
 
+@timed('in_workspace')
 def delete_all_domain(in_workspace)-> None:
     """Delete all existing domains.
 
     Required:
         in_workspace -- The path to workspace (gdb, sde connection file).
     """
-    all_domains = arcpy.da.ListDomains(in_workspace)
+    workspace_catalog = get_catalog(in_workspace)
+    all_domains = list(workspace_catalog.domains.values())
 
     # delete domain
-    for domain in all_domains:
+    for domain_name in all_domains:
         try:
-            logger.info(f'The domain "{domain.name}" will be deleted')
-            remove_domain_from_fields(domain.name)
-            arcpy.management.DeleteDomain(in_workspace, domain.name)
+            logger.info(f'The domain "{domain_name}" will be deleted')
+            remove_domain_from_fields(domain_name)
+            arcpy.management.DeleteDomain(in_workspace, domain_name)
+            workspace_catalog.remove_domain(domain_name)
         except Exception:
             e = sys.exc_info()[1]
-            logger.error(f'The existing domain "{domain.name}" could not '
+            logger.error(f'The existing domain "{domain_name}" could not '
                          f'be deleted: {e.args[0]}')
 
+@timed('domain_name')
 def delete_domain(in_workspace, domain_name):
     """Delete a domain (see Esri arcpy.management.DeleteDomain).
 
@@ -226,11 +1202,13 @@ def delete_domain(in_workspace, domain_name):
         logger.info(f'The domain "{domain_name}" will be deleted')
         remove_domain_from_fields(domain_name)
         arcpy.management.DeleteDomain(in_workspace, domain_name)
+        get_catalog(in_workspace).remove_domain(domain_name)
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'The existing domain "{domain_name}" could not '
                     f'be deleted: {e.args[0]}')
 
+@timed('in_data')
 def delete_item(in_data, data_type=None)-> None:
     """Delete item, tables, datasets (see Esri arcpy.management.Delete).
 
@@ -245,11 +1223,13 @@ def delete_item(in_data, data_type=None)-> None:
     try:
         logger.info(f'Item "{in_data}" will be deleted')
         arcpy.management.Delete(in_data, data_type)
+        get_catalog().remove(in_data)
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'The existing Item "{in_data}" could not be '
                      f'deleted: {e.args[0]}')
 
+@timed('domain_name')
 def create_domain(in_workspace, domain_name, domain_description = None, field_type = "SHORT",
                   domain_type = "CODED", **kwargs)-> None:
     """Create a domain (see Esri arcpy.management.CreateDomain).
@@ -272,15 +1252,13 @@ def create_domain(in_workspace, domain_name, domain_description = None, field_ty
     #     logger.warning(f'"{domain_name}" is not in capital letters!')
 
     # check if the domain already exists
-    all_domains = arcpy.da.ListDomains(in_workspace)
-    all_domain_names = []
-    for domain in all_domains:
-        all_domain_names.append(domain.name)
-    if domain_name in all_domain_names:
+    workspace_catalog = get_catalog(in_workspace)
+    if workspace_catalog.domain_exists(domain_name):
         try:
             logger.info(f'The existing domain "{domain_name}" will be deleted')
             remove_domain_from_fields(domain_name)
             arcpy.management.DeleteDomain(in_workspace, domain_name)
+            workspace_catalog.remove_domain(domain_name)
         except Exception:
             e = sys.exc_info()[1]
             logger.error(f'The existing domain "{domain_name}" could not '
@@ -292,16 +1270,21 @@ def create_domain(in_workspace, domain_name, domain_description = None, field_ty
         logger.info(f'The domain "{domain_name}" will be created')
         arcpy.management.CreateDomain(in_workspace, domain_name, domain_description,
                                       field_type, domain_type, **kwargs)
+        workspace_catalog.add_domain(domain_name, field_type)
 
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'The domain "{domain_name}" could not be created: {e.args[0]}')
         return
 
-def add_coded_value_to_domain(in_workspace, domain_name, slu_domain_dict = None, **kwargs)-> None:
+@timed('domain_name')
+def add_coded_value_to_domain(in_workspace, domain_name, slu_domain_dict = None, slu_update_option = "APPEND",
+                              slu_bulk_threshold = None, **kwargs)-> None:
     """Add coded value to domain (see Esri arcpy.management.AddCodedValueToDomain).
     In contrast to the ESRI function, a dictionary with the codes as keys and the code_descriptions as values
     can be used as input parameter, which allows to add several values to the domain at the same time.
+    From a number of codes (slu_bulk_threshold) on, the codes are loaded with a single call of
+    arcpy.management.TableToDomain (see function table_to_domain()) instead of one call per code.
 
     Required:
         in_workspace -- The path to the workspace (gdb, sde connection file).
@@ -309,11 +1292,20 @@ def add_coded_value_to_domain(in_workspace, domain_name, slu_domain_dict = None,
 
     Optional:
         slu_domain_dict -- Dictionary with the codes as the keys and the descriptions as the values.
+        slu_update_option -- "APPEND": The codes are added to the existing codes (default).
+                             "REPLACE": The existing codes are replaced by the codes of the dictionary.
+        slu_bulk_threshold -- The number of codes from which on the codes are loaded with TableToDomain
+                              (default: BULK_DOMAIN_THRESHOLD).
         **kwargs -- Additional parameters for the function arcpy.management.AddCodedValueToDomain.
                     Instead of a dictionary, the parameter "code" and "code_description" can 
                     be used as input.
     """
-    if slu_domain_dict:
+    if slu_bulk_threshold is None:
+        slu_bulk_threshold = BULK_DOMAIN_THRESHOLD
+    if slu_domain_dict and (len(slu_domain_dict) >= slu_bulk_threshold or slu_update_option == "REPLACE"):
+        # loading all codes with a single call
+        add_coded_values_from_table(in_workspace, domain_name, slu_domain_dict, slu_update_option)
+    elif slu_domain_dict:
         # adding codes and values contained in the dictionary
         try:
             logger.info(f'Coded values are added to the domain "{domain_name}"')
@@ -335,6 +1327,137 @@ def add_coded_value_to_domain(in_workspace, domain_name, slu_domain_dict = None,
             logger.error(f'No values could be added to the domain "{domain_name}": {e.args[0]}')
             return
 
+def add_coded_values_from_table(in_workspace, domain_name, domain_dict, update_option = "APPEND") -> None:
+    """Writes the codes into a temporary table in the memory workspace and loads them into the
+    domain with a single call of the function table_to_domain(). The domain must exist (see function
+    create_domain()): the type of the codes corresponds to the field type of the domain, so codes that
+    are not integers are not loaded into a domain of an integer type.
+
+    Required:
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+        domain_name -- The name of the domain.
+        domain_dict -- Dictionary with the codes as the keys and the descriptions as the values.
+
+    Optional:
+        update_option -- "APPEND" or "REPLACE" (see Esri arcpy.management.TableToDomain).
+    """
+    # the domain is not created by TableToDomain (it would get the type of the code field)
+    workspace_catalog = get_catalog(in_workspace)
+    if not workspace_catalog.domain_exists(domain_name):
+        logger.error(f'The coded values could not be loaded, the domain "{domain_name}" does not exist')
+        return
+    # the type of the code field corresponds to the type of the domain
+    field_type = workspace_catalog.domain_type(domain_name) or "TEXT"
+    codes = []
+    for code in domain_dict:
+        try:
+            if field_type in ("SHORT", "LONG", "BIGINTEGER"):
+                # integers, also written as decimal number without fraction (e.g. "3.0")
+                if not re.fullmatch(r'[+-]?\d+(\.0*)?', str(code).strip()):
+                    raise ValueError(code)
+                codes.append(int(str(code).strip().split('.')[0]))
+            elif field_type in ("FLOAT", "DOUBLE"):
+                codes.append(float(code))
+            else:
+                codes.append(str(code))
+        except ValueError:
+            logger.error(f'The code "{code}" does not match the type {field_type} of the domain "{domain_name}", '
+                         f'no coded values have been loaded')
+            return
+    if field_type not in ("SHORT", "LONG", "BIGINTEGER", "FLOAT", "DOUBLE"):
+        field_type = "TEXT"
+    descriptions = [str(description) for description in domain_dict.values()]
+    table = "memory/" + re.sub(r'\W', '_', f'slu_domain_{domain_name}')
+    try:
+        logger.info(f'{len(codes)} coded values are written to a temporary table for the domain "{domain_name}"')
+        arcpy.management.CreateTable("memory", os.path.basename(table))
+        arcpy.management.AddFields(table, [
+            ["CODE", field_type, "", max([len(str(code)) for code in codes] + [255]), "", ""],
+            ["DESCRIPTION", "TEXT", "", max([len(description) for description in descriptions] + [255]), "", ""]])
+        with arcpy.da.InsertCursor(table, ["CODE", "DESCRIPTION"]) as cursor:
+            for row in zip(codes, descriptions):
+                cursor.insertRow(row)
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'The temporary table for the domain "{domain_name}" could not be created: {e.args[0]}')
+        return
+    try:
+        table_to_domain(table, "CODE", "DESCRIPTION", in_workspace, domain_name, update_option = update_option)
+    finally:
+        try:
+            arcpy.management.Delete(table)
+        except Exception:
+            e = sys.exc_info()[1]
+            logger.warning(f'The temporary table "{table}" could not be deleted: {e.args[0]}')
+
+@timed('domain_name')
+def table_to_domain(in_table, code_field, description_field, in_workspace, domain_name,
+                    domain_description = None, update_option = "APPEND")-> None:
+    """Load the codes of a table into a domain (see Esri arcpy.management.TableToDomain).
+    The domain is created if it does not exist.
+
+    Required:
+        in_table -- The path to the table with the codes.
+        code_field -- The field with the codes.
+        description_field -- The field with the code descriptions.
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+        domain_name -- The name of the domain.
+
+    Optional:
+        domain_description -- The description of the domain.
+        update_option -- "APPEND": The codes are added to the existing codes (default).
+                         "REPLACE": The existing codes are replaced.
+    """
+    try:
+        logger.info(f'Coded values are loaded into the domain "{domain_name}" ({update_option.lower()})')
+        arcpy.management.TableToDomain(in_table, code_field, description_field, in_workspace, domain_name,
+                                       domain_description, update_option)
+        workspace_catalog = get_catalog(in_workspace)
+        if not workspace_catalog.domain_exists(domain_name):
+            workspace_catalog.add_domain(domain_name)
+
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'The coded values could not be loaded into the domain "{domain_name}": {e.args[0]}')
+
+@timed('domain_name')
+def delete_coded_value_from_domain(in_workspace, domain_name, code)-> None:
+    """Delete coded values from a domain (see Esri arcpy.management.DeleteCodedValueFromDomain).
+
+    Required:
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+        domain_name -- The name of the domain.
+        code -- The code or a list of codes to be deleted.
+    """
+    try:
+        logger.info(f'Coded values "{code}" are deleted from the domain "{domain_name}"')
+        arcpy.management.DeleteCodedValueFromDomain(in_workspace, domain_name, code)
+
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'The values "{code}" could not be deleted from the domain "{domain_name}": {e.args[0]}')
+
+@timed('domain_name')
+def alter_domain(in_workspace, domain_name, **kwargs)-> None:
+    """Alter the properties of a domain (see Esri arcpy.management.AlterDomain).
+
+    Required:
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+        domain_name -- The name of the domain.
+
+    Optional:
+        **kwargs -- Additional parameters for the function arcpy.management.AlterDomain
+                    (e.g. "new_domain_description").
+    """
+    try:
+        logger.info(f'The domain "{domain_name}" will be altered')
+        arcpy.management.AlterDomain(in_workspace, domain_name, **kwargs)
+
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'The domain "{domain_name}" could not be altered: {e.args[0]}')
+
+@timed('domain_name')
 def set_value_for_range_domain(in_workspace, domain_name, min_value, max_value)-> None:
     """Add values to a domain of the type Range (see Esri arcpy.management.SetValueForRangeDomain).
 
@@ -354,42 +1477,66 @@ def set_value_for_range_domain(in_workspace, domain_name, min_value, max_value)-
         logger.error(f'No values could be added to the domain "{domain_name}": {e.args[0]}')
         return
 
+@timed('in_table')
+def remove_domain_from_field(in_table, field_name, subtype_code = None):
+    """Remove the domain assignment from a field (see Esri arcpy.management.RemoveDomainFromField).
+
+    Required:
+        in_table -- The name of the table or the feature class.
+        field_name -- The name of the field.
+
+    Optional:
+        subtype_code -- Subtypes from which the domain is removed e.g. "1: Event;2: Boulevard".
+    """
+    try:
+        if subtype_code:
+            logger.info(f'Removing the domain from the field "{field_name}" in "{in_table}" '
+                        f'for the subtype "{subtype_code}"')
+            arcpy.management.RemoveDomainFromField(in_table, field_name, subtype_code)
+            for subtype in str(subtype_code).split(';'):
+                get_catalog().remove_domain_usage(get_object_key(in_table), get_object_key(field_name),
+                                                  subtype.split(':')[0].strip())
+        else:
+            logger.info(f'Removing the domain from the field "{field_name}" in "{in_table}"')
+            arcpy.management.RemoveDomainFromField(in_table, field_name)
+            get_catalog().remove_domain_usage(get_object_key(in_table), get_object_key(field_name))
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'The domain could not be removed from the field "{field_name}" in "{in_table}": '
+                     f'{e.args[0]}')
+
+@timed('domain_name')
 def remove_domain_from_fields(domain_name):
     """Removes domain assignment from all fields that use the domain (see Esri arcpy.management.RemoveDomainFromField).
+    The fields are looked up in the domain index of the workspace catalog, which includes
+    the domains that are assigned to specific subtypes.
 
     Required:
         domain_name -- The name of the domain
     """
-    datasets = arcpy.ListDatasets(feature_type = "Feature")
-    datasets = [''] + datasets if datasets is not None else []
-    for ds in datasets:
-        for fc in arcpy.ListFeatureClasses(feature_dataset = ds):
-            for field in arcpy.ListFields(fc):
-                if field.domain and field.domain == domain_name:
-                    try:
-                        logger.info(f'Removing domain "{domain_name}" from the field "{field.name}" '
-                                    f'in the feature class "{fc}"')
-                        arcpy.management.RemoveDomainFromField(fc, field.name)
+    workspace_catalog = get_catalog()
+    for table, field_name, subtype_code in workspace_catalog.get_domain_usages(domain_name):
+        if workspace_catalog.exists(table, 'FeatureClass'):
+            table_text = f'the feature class "{table}"'
+        else:
+            table_text = f'the table "{table}"'
+        if subtype_code:
+            table_text += f' for the subtype "{subtype_code}"'
+        try:
+            logger.info(f'Removing domain "{domain_name}" from the field "{field_name}" in {table_text}')
+            if subtype_code:
+                arcpy.management.RemoveDomainFromField(table, field_name, subtype_code)
+            else:
+                arcpy.management.RemoveDomainFromField(table, field_name)
+            workspace_catalog.remove_domain_usage(get_object_key(table), get_object_key(field_name),
+                                                  subtype_code.split(':')[0].strip() if subtype_code else None)
 
-                    except Exception:
-                        e = sys.exc_info()[1]
-                        logger.error(f'Domain "{domain_name}" could not be removed from the field "{field.name}" '
-                                     f'in the feature class "{fc}" : {e.args[0]}')
-
-        if not ds:
-            for tb in arcpy.ListTables():
-                for field in arcpy.ListFields(tb):
-                    if field.domain and field.domain == domain_name:
-                        try:
-                            logger.info(f'Removing domain "{domain_name}" from the "{field.name}" '
-                                        f'in the table "{tb}"')
-                            arcpy.management.RemoveDomainFromField(tb, field.name)
-
-                        except Exception:
-                            e = sys.exc_info()[1]
-                            logger.error(f'Domain "{domain_name}" could not be removed from the field "{field.name}" '
-                                         f'in the table "{tb}": {e.args[0]}')
+        except Exception:
+            e = sys.exc_info()[1]
+            logger.error(f'Domain "{domain_name}" could not be removed from the field "{field_name}" '
+                         f'in {table_text}: {e.args[0]}')
 
+@timed('out_name')
 def create_feature_dataset(out_dataset_path, out_name, spatial_reference = 'CH1903+ LV95',
                         slu_overwrite = True)-> None:
     """Create a feature dataset (see Esri arcpy.management.CreateFeatureDataset).
@@ -409,10 +1556,12 @@ def create_feature_dataset(out_dataset_path, out_name, spatial_reference = 'CH19
 
     # check if the dataset already exists (not working!?)
     out_dataset = os.path.join(out_dataset_path, out_name)
-    if arcpy.Exists(out_dataset):
+    workspace_catalog = get_catalog()
+    if workspace_catalog.exists(out_dataset):
         if slu_overwrite:
             logger.info(f'Existing dataset "{out_name}" will be deleted')
             arcpy.management.Delete(out_dataset)
+            workspace_catalog.remove(out_dataset)
         else:
             logger.warning(f'Existing dataset "{out_name}" will not be deleted')
             return
@@ -421,10 +1570,12 @@ def create_feature_dataset(out_dataset_path, out_name, spatial_reference = 'CH19
     try:
         logger.info(f'The dataset "{out_name}" will be created')
         arcpy.management.CreateFeatureDataset(out_dataset_path, out_name, spatial_reference)
+        workspace_catalog.add(out_name, 'FeatureDataset')
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'The dataset "{out_name}" could not be created: {e.args[0]}')
 
+@timed('out_name')
 def create_feature_class(out_path, out_name, geometry_type, spatial_reference = 'CH1903+ LV95',
                          out_dataset = None, slu_overwrite = True, **kwargs) -> None:
     """Create a feature class (see documentation of Esri).
@@ -454,10 +1605,12 @@ def create_feature_class(out_path, out_name, geometry_type, spatial_reference =
 
     # check if the feature class already exists
     out_feature = os.path.join(out_path, out_name)
-    if arcpy.Exists(out_feature):
+    workspace_catalog = get_catalog()
+    if workspace_catalog.exists(out_feature):
         if slu_overwrite:
             logger.info(f'Existing feature class "{out_name}" will be deleted')
             arcpy.management.Delete(out_feature)
+            workspace_catalog.remove(out_feature)
         else:
             logger.warning(f'Existing feature class "{out_name}" will not be overwritten')
             return
@@ -469,11 +1622,33 @@ def create_feature_class(out_path, out_name, geometry_type, spatial_reference =
             out_path = out_path, out_name = out_name, geometry_type = geometry_type,
             spatial_reference = spatial_reference, **kwargs
             )
+        # the fields of a template are read on the first request
+        workspace_catalog.add(out_name, 'FeatureClass', out_dataset,
+                              None if 'template' in kwargs else
+                              get_feature_class_fields(workspace_catalog.workspace, geometry_type))
 
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'The feature class "{out_name}" could not be created: {e.args[0]}')
 
+# shape fields of a new feature class of a file geodatabase depending on the geometry type
+FILE_GDB_SHAPE_FIELDS = {"POINT": [], "MULTIPOINT": [], "POLYLINE": ["Shape_Length"],
+                         "POLYGON": ["Shape_Length", "Shape_Area"]}
+
+def get_feature_class_fields(workspace, geometry_type) -> list:
+    """Returns the system fields of a new feature class or None if they are not known: in an enterprise
+    geodatabase, the names of the shape fields depend on the DBMS (e.g. "Shape.STLength()").
+
+    Required:
+        workspace -- The path to the workspace (gdb, sde connection file).
+        geometry_type -- The geometry type of the feature class.
+    """
+    shape_fields = FILE_GDB_SHAPE_FIELDS.get(str(geometry_type).upper())
+    if shape_fields is None or not str(workspace).lower().rstrip('/\\').endswith('.gdb'):
+        return None
+    return ['OBJECTID', 'Shape'] + shape_fields
+
+@timed('out_name')
 def create_table(out_path, out_name, slu_overwrite = True, **kwargs) -> None:
     """create a table (see documentation of Esri).
 
@@ -494,10 +1669,12 @@ def create_table(out_path, out_name, slu_overwrite = True, **kwargs) -> None:
 
     # check if the table already exists (not working!?)
     out_table = os.path.join(out_path, out_name)
-    if arcpy.Exists(out_table):
+    workspace_catalog = get_catalog()
+    if workspace_catalog.exists(out_table):
         if slu_overwrite:
             logger.info(f'The existing table "{out_name}" will be deleted')
             arcpy.management.Delete(out_table)
+            workspace_catalog.remove(out_table)
         else:
             logger.warning(f'The existing table "{out_table}" will not be overwritten')
             return
@@ -506,11 +1683,13 @@ def create_table(out_path, out_name, slu_overwrite = True, **kwargs) -> None:
     try:
         logger.info(f'The table "{out_name}" will be created')
         arcpy.management.CreateTable(out_path = out_path, out_name = out_name, **kwargs)
+        workspace_catalog.add(out_name, 'Table', fields = None if 'template' in kwargs else ['OBJECTID'])
 
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'The table "{out_name}" could not be created: {e.args[0]}')
 
+@timed('in_table')
 def add_field(in_table, field_name, field_type, **kwargs):
     """Adding a field to a table or a feature class (see documentation of Esri)
 
@@ -533,10 +1712,96 @@ def add_field(in_table, field_name, field_type, **kwargs):
         logger.info(f'Adding the field "{field_name}"')
         arcpy.management.AddField(in_table = in_table, field_name = field_name,
                                 field_type = field_type, **kwargs)
+        get_catalog().add_field(in_table, field_name, kwargs.get('field_domain'))
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'Error when creating the field "{field_name}": {e.args[0]}')
 
+@timed('in_table')
+def add_fields(in_table, field_description):
+    """Adding several fields to a table or a feature class (see Esri arcpy.management.AddFields).
+    In contrast to the ESRI function, a list of dictionaries with the parameters of the function
+    add_field() is used as input. Consecutive fields that only use parameters supported by AddFields
+    are added with a single call, all other fields are added with add_field(). If a call of AddFields
+    fails, only the fields that were not created are added again one by one with add_field().
+
+    Required:
+        in_table -- The name of the table or the feature class.
+        field_description -- A list of dictionaries with the parameters of the function add_field().
+    """
+    # split the fields into consecutive batches to keep the order of the fields
+    batches = []
+    for dic_field in field_description:
+        if set(dic_field).issubset(ADD_FIELDS_PARAMETERS):
+            if batches and batches[-1][0]:
+                batches[-1][1].append(dic_field)
+            else:
+                batches.append((True, [dic_field]))
+        else:
+            batches.append((False, [dic_field]))
+
+    for is_batch, batch in batches:
+        if not is_batch or len(batch) == 1:
+            for dic_field in batch:
+                add_field(in_table, **dic_field)
+            continue
+
+        # add fields
+        rows = []
+        for dic_field in batch:
+            if contains_umlaut(dic_field['field_name']):
+                logger.warning(f'The field name "{dic_field["field_name"]}" contains an Umlaut!')
+            logger.info(f'Adding the field "{dic_field["field_name"]}"')
+            rows.append([dic_field['field_name'], dic_field['field_type'],
+                         dic_field.get('field_alias', ''), dic_field.get('field_length'),
+                         '', dic_field.get('field_domain', '')])
+        try:
+            arcpy.management.AddFields(in_table, rows)
+            for dic_field in batch:
+                get_catalog().add_field(in_table, dic_field['field_name'], dic_field.get('field_domain'))
+        except Exception:
+            e = sys.exc_info()[1]
+            logger.warning(f'The fields could not be added to "{in_table}" with a single call, '
+                           f'the missing fields will be added one by one: {e.args[0]}')
+            # add only the fields that have not been created
+            get_catalog().reset_fields(in_table)
+            for dic_field in batch:
+                if not field_exists(in_table, dic_field['field_name']):
+                    add_field(in_table, **dic_field)
+
+def add_fields_with_domains(in_table, fields, existing_fields = None):
+    """Adding fields to a table or a feature class including the domains that depend on subtypes.
+
+    Required:
+        in_table -- The name of the table or the feature class.
+        fields -- A list of dictionaries with the parameters of the function add_field() and
+                  optionally the key "FieldDomainSubtype".
+
+    Optional:
+        existing_fields -- The names of the fields that already exist (e.g. copied from a template):
+                           only the domains of their subtypes are assigned.
+    """
+    existing_fields = {field_name.lower() for field_name in existing_fields or []}
+    field_description = []
+    field_domain_subtypes = []
+    for dic_field in fields:
+        dic_field = dic_field.copy()
+        if "FieldDomainSubtype" in dic_field:
+            field_domain_subtypes.append((dic_field['field_name'], dic_field.pop('FieldDomainSubtype')))
+        if dic_field['field_name'].lower() not in existing_fields:
+            field_description.append(dic_field)
+
+    # add fields
+    if field_description:
+        add_fields(in_table, field_description)
+
+    # add domains to subtypes
+    for field_name, dic_domains in field_domain_subtypes:
+        for dic_domain in dic_domains:
+            assign_domain_to_field(in_table, field_name, dic_domain['field_domain'],
+                                   dic_domain['subtype_code'])
+
+@timed('in_table')
 def delete_field(in_table, field_name):
     """Deleting a field from a table or a feature class (see documentation of Esri).
 
@@ -548,11 +1813,36 @@ def delete_field(in_table, field_name):
     try:
         logger.info(f'Feld "{field_name}" will be deleted')
         arcpy.management.DeleteField(in_table, field_name)
+        for name in field_name if isinstance(field_name, list) else str(field_name).split(';'):
+            get_catalog().remove_field(in_table, name)
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'Error when deleting the field "{field_name}": {e.args[0]}')
 
-def calculate_field(in_table, field, expression, **kwargs):
+@timed('in_table')
+def alter_field(in_table, field, **kwargs):
+    """Altering the properties of a field (see documentation of Esri).
+
+    Required:
+        in_table -- The name of the table or the feature class.
+        field -- The name of the field.
+
+    Optional:
+        **kwargs -- Additional parameters for the function arcpy.management.AlterField
+                    (e.g. "new_field_alias").
+    """
+    try:
+        logger.info(f'The field "{field}" will be altered')
+        arcpy.management.AlterField(in_table, field, **kwargs)
+        if kwargs.get('new_field_name'):
+            get_catalog().remove_field(in_table, field)
+            get_catalog().add_field(in_table, kwargs['new_field_name'])
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'Error when altering the field "{field}": {e.args[0]}')
+
+@timed('in_table')
+def calculate_field(in_table, field, expression, where_clause = None, **kwargs):
     """ Calculates the values of a field for a feature class, feature layer, 
     or raster (see documentation of Esri).
 
@@ -562,6 +1852,7 @@ def calculate_field(in_table, field, expression, **kwargs):
         expression -- The simple calculation expression used to create a value that will populate the selected rows.
 
     Optional:
+        where_clause -- Only the rows of the where clause are calculated (through a temporary table view).
         **kwargs -- Additional parameters for the function arcpy.management.CalculateField.
     """
     # Get a list of fields in the feature class or table
@@ -570,40 +1861,541 @@ def calculate_field(in_table, field, expression, **kwargs):
 
     try:
         logger.info(f'Calculate field "{field}"')
-        arcpy.management.CalculateField(in_table = in_table, field = field, 
-                                        expression = expression, **kwargs)
+        if where_clause is None:
+            arcpy.management.CalculateField(in_table = in_table, field = field, 
+                                            expression = expression, **kwargs)
+        else:
+            arcpy.management.MakeTableView(in_table, CALCULATION_VIEW, where_clause)
+            try:
+                arcpy.management.CalculateField(in_table = CALCULATION_VIEW, field = field,
+                                                expression = expression, **kwargs)
+            finally:
+                arcpy.management.Delete(CALCULATION_VIEW)
+        get_catalog().add_field(in_table, field)
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'Error when calculating the field "{field}": {e.args[0]}')
 
-def assign_domain_to_field(in_table, field_name, domain_name, subtype_code = None):
-    """Assign a domain to a field (see documentation of Esri).
+# operators of the expressions that are calculated with NumPy (see function compile_calculation())
+CALCULATION_OPERATORS = {ast.Add: 'add', ast.Sub: 'subtract', ast.Mult: 'multiply', ast.Div: 'true_divide',
+                         ast.FloorDiv: 'floor_divide', ast.Mod: 'remainder', ast.Pow: 'power'}
+# field types of the cursors
+INTEGER_FIELD_TYPES = ('SmallInteger', 'Integer', 'BigInteger')
+FLOAT_FIELD_TYPES = ('Single', 'Double')
+# range of the values of the integer field types
+INTEGER_FIELD_RANGES = {'SmallInteger': (-2 ** 15, 2 ** 15 - 1), 'Integer': (-2 ** 31, 2 ** 31 - 1),
+                        'BigInteger': (-2 ** 63, 2 ** 63 - 1)}
+# number of rows calculated at once by the function apply_calculations()
+CALCULATION_BATCH_ROWS = 50000
+# name of the table view of the rows calculated by the function calculate_field()
+CALCULATION_VIEW = 'calculation_view'
+
+def compile_calculation(expression, expression_type = 'PYTHON3', code_block = None) -> tuple:
+    """Parses a simple expression of the function arcpy.management.CalculateField so that it can be 
+    calculated for all rows at once (see function evaluate_calculation()). Supported are constants, 
+    field references (!FIELD! or $feature.FIELD), arithmetic and the concatenation of strings.
 
     Required:
-        in_table -- The name of the table or the feature class.
-        field_name -- The name of the field.
-        field_domain -- The name of the domain.
+        expression -- The calculation expression.
 
     Optional:
-        subtype_code -- Subtypes for which the domain applies e.g. "1: Event;2: Boulevard".
+        expression_type -- The type of the expression ("PYTHON3" or "ARCADE").
+        code_block -- A block of code (expressions with a code block are not supported).
+
+    Return:
+        tree -- The parsed expression (ast.Expression) or None if the expression is not supported.
+        fields -- The names of the fields used by the expression (referenced as "__field<index>" in the tree).
     """
-    # assign domain
+    expression_type = str(expression_type or 'PYTHON3').upper()
+    if code_block:
+        return None, []
+    fields = []
+
+    def reference(name):
+        if name.lower() not in [field.lower() for field in fields]:
+            fields.append(name)
+        return f'__field{[field.lower() for field in fields].index(name.lower())}'
+
+    text = str(expression).strip()
+    operators = dict(CALCULATION_OPERATORS)
+    if expression_type.startswith('PYTHON'):
+        text = re.sub(r'!([^!]+)!', lambda match: reference(match.group(1).strip()), text)
+    elif expression_type == 'ARCADE':
+        text = re.sub(r'^return\s+', '', text.rstrip(';').strip())
+        text = re.sub(r'\$feature\.(\w+)|\$feature\[\s*(["\'])(.*?)\2\s*\]', 
+                      lambda match: reference(match.group(1) or match.group(3)), text)
+        # "//" starts a comment and "**" is not an operator in Arcade
+        if '//' in text or '**' in text:
+            return None, []
+    else:
+        return None, []
     try:
-        if subtype_code:
-            logger.info(f'The domain "{domain_name}" will be assigned to the field "{field_name}" '
-                        f'for the subtype "{subtype_code}"')
-            arcpy.management.AssignDomainToField(in_table, field_name, domain_name, subtype_code)
-        else:
-            logger.info(f'The domain "{domain_name}" will be assigned to the field "{field_name}"')
-            arcpy.management.AssignDomainToField(in_table, field_name, domain_name)
-    except Exception:
-        e = sys.exc_info()[1]
-        logger.error(f'The domain"{domain_name}" could not be assigned to the field "{field_name}": '
-                     f'{e.args[0]}')
+        tree = ast.parse(text, mode = 'eval')
+    except SyntaxError:
+        return None, []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Expression, ast.Load, ast.UAdd, ast.USub, ast.UnaryOp, ast.BinOp)):
+            continue
+        if isinstance(node, ast.operator) and type(node) in operators:
+            continue
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float, str):
+            continue
+        if isinstance(node, ast.Name) and re.fullmatch(r'__field\d+', node.id):
+            continue
+        return None, []
+    return tree, fields
+
+def evaluate_calculation(tree, columns, numpy):
+    """Calculates a parsed expression (see function compile_calculation()) for all rows at once. 
+    Errors (e.g. a division by zero or a string added to a number) are raised so that the 
+    expression can be calculated by the function arcpy.management.CalculateField.
 
-def create_subtype_field(in_table, field_name):
-    """Create a subtype field. In contrast to the function arcpy.management.SetSubtypeField,
-    the field is newly created, if it does not exist already.
+    Required:
+        tree -- The parsed expression.
+        columns -- The values of the fields used by the expression (list of numpy arrays).
+        numpy -- The module numpy.
+
+    Return:
+        The calculated values (numpy array or scalar).
+    """
+    def evaluate(node):
+        if isinstance(node, ast.Expression):
+            return evaluate(node.body)
+        if isinstance(node, ast.Constant):
+            return numpy.asarray(node.value)
+        if isinstance(node, ast.Name):
+            return columns[int(node.id[7:])]
+        if isinstance(node, ast.UnaryOp):
+            value = evaluate(node.operand)
+            if value.dtype.kind not in 'iuf':
+                raise TypeError(f'bad operand type for unary operator: {value.dtype}')
+            return numpy.negative(value) if isinstance(node.op, ast.USub) else value
+        left, right = evaluate(node.left), evaluate(node.right)
+        strings = [value.dtype.kind == 'U' for value in (left, right)]
+        if any(strings):
+            if not all(strings) or not isinstance(node.op, ast.Add):
+                raise TypeError(f'unsupported operand types: {left.dtype} and {right.dtype}')
+            return numpy.char.add(left, right)
+        if any(value.dtype.kind not in 'iuf' for value in (left, right)):
+            raise TypeError(f'unsupported operand types: {left.dtype} and {right.dtype}')
+        if isinstance(node.op, ast.Pow) and right.dtype.kind in 'iu' and (right < 0).any():
+            raise ValueError('integers to negative integer powers are not allowed')
+        operator = getattr(numpy, CALCULATION_OPERATORS[type(node.op)])
+        # integer arrays wrap around silently: the magnitude of the result is estimated with floats
+        if left.dtype.kind in 'iu' and right.dtype.kind in 'iu' and \
+                numpy.abs(operator(left.astype(numpy.float64), right.astype(numpy.float64))).max(initial = 0) >= 2.0 ** 63:
+            raise OverflowError('integer overflow')
+        return operator(left, right)
+
+    with numpy.errstate(all = 'raise'):
+        return evaluate(tree)
+
+def read_calculations(in_table, calculations, numpy, where_clause = None) -> tuple:
+    """Reads the fields used by the calculations (arcpy.da.SearchCursor) and calculates the expressions
+    in memory, in order (an expression uses the results of the previous ones). An expression that can 
+    not be calculated with NumPy (e.g. null values, a division by zero or values that do not fit the
+    field) raises the error (TypeError, ValueError or ArithmeticError).
+
+    Required:
+        in_table -- The name of the table or feature class.
+        calculations -- List of tuples (parameters of the function calculate_field(), parsed expression, fields).
+        numpy -- The module numpy.
+
+    Optional:
+        where_clause -- Only the rows of the where clause are read (e.g. a range of object IDs).
+
+    Return:
+        oids -- The object IDs of the rows.
+        results -- name of the field -> calculated values (numpy array, the last calculation of the field)
+    """
+    table_fields = {field.name.lower(): field for field in arcpy.ListFields(in_table)}
+    names = []
+    for dic_field, _, fields in calculations:
+        for name in fields + [dic_field['field']]:
+            if name.lower() not in [item.lower() for item in names]:
+                names.append(name)
+    keys = [name.lower() for name in names]
+    with arcpy.da.SearchCursor(in_table, ['OID@'] + names, where_clause) as cursor:
+        rows = list(cursor)
+    oids = [row[0] for row in rows]
+    columns = {key: [row[index + 1] for row in rows] for index, key in enumerate(keys)}
+    del rows
+    if not oids:
+        return oids, {}
+    arrays = {}
+
+    def column(name):
+        key = name.lower()
+        if key not in arrays:
+            if any(value is None for value in columns[key]):
+                raise ValueError(f'the field "{name}" contains null values')
+            arrays[key] = numpy.asarray(columns[key])
+        return arrays[key]
+
+    targets = []
+    for dic_field, tree, fields in calculations:
+        target = dic_field['field'].lower()
+        field_type = table_fields[target].type
+        result = evaluate_calculation(tree, [column(name) for name in fields], numpy)
+        result = numpy.broadcast_to(result, (len(oids),))
+        if field_type == 'String':
+            values = [str(value) for value in result.tolist()]
+            if table_fields[target].length and max(len(value) for value in values) > table_fields[target].length:
+                raise ValueError(f'the values are too long for the field "{dic_field["field"]}"')
+            result = numpy.asarray(values)
+        elif result.dtype.kind == 'U' or (field_type in INTEGER_FIELD_TYPES and result.dtype.kind == 'f') \
+                or field_type not in INTEGER_FIELD_TYPES + FLOAT_FIELD_TYPES:
+            raise TypeError(f'the values do not match the type of the field "{dic_field["field"]}"')
+        elif field_type in INTEGER_FIELD_TYPES:
+            low, high = INTEGER_FIELD_RANGES[field_type]
+            if result.min() < low or result.max() > high:
+                raise OverflowError(f'the values are out of the range of the field "{dic_field["field"]}"')
+        arrays[target] = result
+        if target not in targets:
+            targets.append(target)
+    return oids, {names[keys.index(target)]: arrays[target] for target in targets}
+
+def write_calculations(in_table, oids, results, where_clause = None) -> None:
+    """Writes the calculated values of the function read_calculations() (arcpy.da.UpdateCursor). The 
+    original values of the written rows are kept until the cursor is closed: if the values can not be
+    written, the original values are restored and the error is raised.
+
+    Required:
+        in_table -- The name of the table or feature class.
+        oids -- The object IDs of the rows.
+        results -- name of the field -> calculated values
+
+    Optional:
+        where_clause -- Only the rows of the where clause are written (the where clause of the read).
+    """
+    if not results:
+        return
+    names = list(results)
+    positions = {oid: index for index, oid in enumerate(oids)}
+    values = [results[name].tolist() for name in names]
+    originals = {}
+    try:
+        with arcpy.da.UpdateCursor(in_table, ['OID@'] + names, where_clause) as cursor:
+            for row in cursor:
+                index = positions.get(row[0])
+                if index is not None:
+                    originals[row[0]] = list(row[1:])
+                    cursor.updateRow([row[0]] + [value[index] for value in values])
+    except Exception:
+        # restore the original values
+        with arcpy.da.UpdateCursor(in_table, ['OID@'] + names, where_clause) as cursor:
+            for row in cursor:
+                if row[0] in originals:
+                    cursor.updateRow([row[0]] + originals[row[0]])
+        raise
+
+def apply_calculations(in_table, calculations, numpy) -> None:
+    """Calculates fields of a table with cursors in batches of CALCULATION_BATCH_ROWS rows (ranges of 
+    object IDs, see function get_oid_ranges()). Each batch is read, calculated and written back in one
+    pass (see functions read_calculations() and write_calculations()), so that only the values of one 
+    batch are held in memory. A batch whose expressions can not be calculated with NumPy or whose values
+    can not be written is calculated with the tool CalculateField (see function calculate_field()).
+
+    Required:
+        in_table -- The name of the table or feature class.
+        calculations -- List of tuples (parameters of the function calculate_field(), parsed expression, fields).
+        numpy -- The module numpy.
+    """
+    oid_field = next(field.name for field in arcpy.ListFields(in_table) if field.type == 'OID')
+    ranges = get_oid_ranges(in_table, oid_field, CALCULATION_BATCH_ROWS)
+    calculated = 0
+    for first, last, rows in ranges:
+        where_clause = f'{oid_field} >= {first} AND {oid_field} <= {last}'
+        try:
+            oids, results = read_calculations(in_table, calculations, numpy, where_clause)
+            write_calculations(in_table, oids, results, where_clause)
+        except Exception:
+            e = sys.exc_info()[1]
+            logger.warning(f'The object IDs {first} to {last} of "{in_table}" could not be calculated with a cursor, '
+                           f'the tool CalculateField is used: {e.args[0] if e.args else e}')
+            for dic_field, _, _ in calculations:
+                calculate_field(in_table, where_clause = where_clause if len(ranges) > 1 else None, **dic_field)
+            continue
+        calculated += rows
+    if calculated or not ranges:
+        for dic_field, _, _ in calculations:
+            logger.info(f'Calculate field "{dic_field["field"]}"')
+    if calculated:
+        logger.info(f'{len(calculations)} field calculation(s) of "{in_table}" applied to {calculated} rows '
+                    f'in {len(ranges)} batch(es)')
+
+# the SQLite file of the checkpoints of the backfills (see class BackfillCheckpoint, set by the function
+# run_model() and passed to the worker processes)
+backfill_file = None
+# seconds between two progress messages of a backfill
+BACKFILL_PROGRESS_INTERVAL = 10
+
+class BackfillCheckpoint:
+    """The ranges of object IDs that have been calculated by a backfill (SQLite file, see function
+    backfill_fields()), so that a backfill that has been interrupted or has failed for some ranges
+    is continued with the object IDs outside these ranges by the next run. A backfill is identified by
+    its key (the table and the hash of its calculations). The ranges are removed when the backfill is 
+    complete.
+
+    Required:
+        file -- The path to the SQLite file.
+        key -- The key of the backfill.
+    """
+    def __init__(self, file, key):
+        self.key = key
+        self.connection = sqlite3.connect(file, timeout = 60)
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS ranges (backfill TEXT, first INTEGER, '
+                                    'last INTEGER, calculated TEXT)')
+
+    def ranges(self) -> list:
+        """Returns the ranges (first and last object ID) that have been calculated."""
+        return self.connection.execute('SELECT first, last FROM ranges WHERE backfill = ?',
+                                       (self.key,)).fetchall()
+
+    def record(self, first, last) -> None:
+        """Records a range that has been calculated."""
+        with self.connection:
+            self.connection.execute('INSERT INTO ranges VALUES (?, ?, ?, ?)',
+                                    (self.key, first, last, time.strftime('%Y-%m-%d %H:%M:%S')))
+
+    def clear(self) -> None:
+        """Removes the ranges of the backfill."""
+        with self.connection:
+            self.connection.execute('DELETE FROM ranges WHERE backfill = ?', (self.key,))
+
+    def close(self) -> None:
+        self.connection.close()
+
+def get_oid_ranges(in_table, oid_field, chunk_size, skip = ()) -> list:
+    """Splits a table into ranges of object IDs with the same number of rows (one pass over the 
+    object IDs in ascending order). The object IDs of the skipped ranges are left out: a range 
+    ends before them, so that a range never contains a skipped object ID.
+
+    Required:
+        in_table -- The name of the table or feature class.
+        oid_field -- The name of the object ID field.
+        chunk_size -- The number of rows of a range.
+
+    Optional:
+        skip -- List of ranges (first and last object ID) whose object IDs are left out.
+
+    Return:
+        List of tuples (first object ID, last object ID, number of rows).
+    """
+    skip = sorted(skip)
+    ranges = []
+    position = 0
+    first, last, count = None, None, 0
+    with arcpy.da.SearchCursor(in_table, ['OID@'], sql_clause = (None, f'ORDER BY {oid_field}')) as cursor:
+        for oid, in cursor:
+            while position < len(skip) and skip[position][1] < oid:
+                position += 1
+            if position < len(skip) and skip[position][0] <= oid:
+                if count:
+                    ranges.append((first, last, count))
+                    first, count = None, 0
+                continue
+            if first is None:
+                first = oid
+            last = oid
+            count += 1
+            if count == chunk_size:
+                ranges.append((first, last, count))
+                first, count = None, 0
+    if count:
+        ranges.append((first, last, count))
+    return ranges
+
+def format_duration(seconds) -> str:
+    """Formats a duration in seconds as "h:mm:ss"."""
+    seconds = int(round(seconds))
+    return f'{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}'
+
+def backfill_fields(in_table, calculations, numpy, chunk_size) -> None:
+    """Calculates fields of a large table in ranges of object IDs, one range after the other (arcpy 
+    is not thread-safe and allows one writer per table). Each range is read, calculated and written 
+    in one pass (see functions read_calculations() and write_calculations()), so that only one range is
+    held in memory. A range whose expressions can not be calculated with NumPy (e.g. null values, a 
+    division by zero or values that do not fit the field) is calculated with the tool CalculateField.
+    The calculated ranges are recorded in the checkpoint file (see class BackfillCheckpoint): the next
+    run only calculates the object IDs outside of them, also if rows have been added or deleted in the
+    meantime. A range that can not be read or written (e.g. because of a lock) or whose calculation with 
+    CalculateField logs an error is calculated again by the next run. The progress (rows per second and
+    the estimated remaining time) is logged every BACKFILL_PROGRESS_INTERVAL seconds.
+
+    Required:
+        in_table -- The name of the table or feature class.
+        calculations -- List of tuples (parameters of the function calculate_field(), parsed expression, fields).
+        numpy -- The module numpy.
+        chunk_size -- The number of rows of a range.
+    """
+    oid_field = next(field.name for field in arcpy.ListFields(in_table) if field.type == 'OID')
+    field_names = ', '.join(f'"{dic_field["field"]}"' for dic_field, _, _ in calculations)
+    checkpoint = None
+    done = []
+    if backfill_file:
+        table_path = os.path.normcase(os.path.join(str(arcpy.env.workspace), str(in_table)))
+        checkpoint = BackfillCheckpoint(backfill_file, f'{table_path}:' + operation_hash(
+            backfill_fields, {'calculations': [dic_field for dic_field, _, _ in calculations]}))
+        done = checkpoint.ranges()
+    try:
+        ranges = get_oid_ranges(in_table, oid_field, chunk_size, done)
+        total = sum(rows for _, _, rows in ranges)
+        if done:
+            logger.info(f'Backfill of "{in_table}": the object IDs of {len(done)} ranges have been calculated '
+                        f'by a previous run')
+        logger.info(f'Backfill of the fields {field_names} of "{in_table}": {total} rows in {len(ranges)} ranges '
+                    f'of at most {chunk_size} rows')
+        for dic_field, _, _ in calculations:
+            logger.info(f'Calculate field "{dic_field["field"]}"')
+
+        def calculate_range(first, last):
+            where_clause = f'{oid_field} >= {first} AND {oid_field} <= {last}'
+            try:
+                oids, results = read_calculations(in_table, calculations, numpy, where_clause)
+            except (TypeError, ValueError, ArithmeticError):
+                e = sys.exc_info()[1]
+                logger.warning(f'The object IDs {first} to {last} of "{in_table}" are calculated with the tool '
+                               f'CalculateField: {e.args[0] if e.args else e}')
+                errors = error_counter.count
+                for dic_field, _, _ in calculations:
+                    calculate_field(in_table, where_clause = where_clause, **dic_field)
+                return error_counter.count == errors
+            except Exception:
+                e = sys.exc_info()[1]
+                logger.error(f'Error when reading the object IDs {first} to {last} of "{in_table}": '
+                             f'{e.args[0] if e.args else e}')
+                return False
+            try:
+                write_calculations(in_table, oids, results, where_clause)
+            except Exception:
+                e = sys.exc_info()[1]
+                logger.error(f'Error when writing the object IDs {first} to {last} of "{in_table}": '
+                             f'{e.args[0] if e.args else e}')
+                return False
+            return True
+
+        failed = []
+        calculated = 0
+        start = reported = time.perf_counter()
+        for index, (first, last, rows) in enumerate(ranges):
+            if calculate_range(first, last):
+                calculated += rows
+                if checkpoint:
+                    checkpoint.record(first, last)
+            else:
+                failed.append(rows)
+            now = time.perf_counter()
+            if now - reported >= BACKFILL_PROGRESS_INTERVAL or index == len(ranges) - 1:
+                reported = now
+                rate = calculated / max(now - start, 1e-6)
+                left = total - calculated - sum(failed)
+                logger.info(f'Backfill of "{in_table}": {calculated} of {total} rows '
+                            f'({calculated / max(total, 1):.0%}), {rate:.0f} rows/s, '
+                            f'ETA {format_duration(left / rate) if rate else "unknown"}')
+        if failed:
+            logger.warning(f'Backfill of "{in_table}": {len(failed)} ranges ({sum(failed)} rows) have not been '
+                           f'calculated because of the errors above' +
+                           (' and are calculated again by the next run' if checkpoint else ''))
+        elif checkpoint:
+            checkpoint.clear()
+    finally:
+        if checkpoint:
+            checkpoint.close()
+
+@timed('in_table')
+def calculate_fields(in_table, calculations, chunk_size = None):
+    """Calculates the fields of the section "CalculateFields" of a table or feature class. Simple expressions
+    (see function compile_calculation()) are calculated with NumPy and cursors in batches of rows (see 
+    function apply_calculations()) or, with a chunk size, in checkpointed ranges of object IDs (see 
+    function backfill_fields()). Other expressions, expressions of fields that do not exist and all 
+    expressions if NumPy is not installed are calculated with the function arcpy.management.CalculateField
+    (see function calculate_field()).
+
+    Required:
+        in_table -- The name of the table or feature class.
+        calculations -- List of parameters of the function calculate_field().
+
+    Optional:
+        chunk_size -- The number of rows of a range of a backfill (None: batches of CALCULATION_BATCH_ROWS rows).
+    """
+    try:
+        numpy = importlib.import_module('numpy')
+    except ImportError:
+        numpy = None
+    pending = []
+
+    def flush():
+        if not pending:
+            return
+        try:
+            if chunk_size:
+                backfill_fields(in_table, pending, numpy, chunk_size)
+            else:
+                apply_calculations(in_table, pending, numpy)
+        except Exception:
+            e = sys.exc_info()[1]
+            if chunk_size:
+                # ranges may have been written: the backfill is continued from its checkpoint by the next run
+                logger.error(f'Error in the backfill of "{in_table}": {e.args[0] if e.args else e}')
+            else:
+                # nothing has been written (the batches fall back to CalculateField on their own)
+                logger.warning(f'The fields of "{in_table}" could not be calculated with a cursor, '
+                               f'the tool CalculateField is used: {e.args[0] if e.args else e}')
+                for dic_field, _, _ in pending:
+                    calculate_field(in_table, **dic_field)
+        for dic_field, _, _ in pending:
+            get_catalog().add_field(in_table, dic_field['field'])
+        pending.clear()
+
+    for dic_field in calculations:
+        tree = None
+        if numpy is not None and set(dic_field) <= {'field', 'expression', 'expression_type', 'code_block', 
+                                                    'field_type'} and field_exists(in_table, dic_field['field']):
+            tree, fields = compile_calculation(dic_field['expression'], dic_field.get('expression_type', 'PYTHON3'),
+                                               dic_field.get('code_block'))
+        if tree is None:
+            flush()
+            if chunk_size:
+                logger.warning(f'The field "{dic_field["field"]}" of "{in_table}" is not calculated in ranges '
+                               f'(the expression is calculated with the tool CalculateField)')
+            calculate_field(in_table, **dic_field)
+        else:
+            pending.append((dic_field, tree, fields))
+    flush()
+
+@timed('in_table')
+def assign_domain_to_field(in_table, field_name, domain_name, subtype_code = None):
+    """Assign a domain to a field (see documentation of Esri).
+
+    Required:
+        in_table -- The name of the table or the feature class.
+        field_name -- The name of the field.
+        field_domain -- The name of the domain.
+
+    Optional:
+        subtype_code -- Subtypes for which the domain applies e.g. "1: Event;2: Boulevard".
+    """
+    # assign domain
+    try:
+        if subtype_code:
+            logger.info(f'The domain "{domain_name}" will be assigned to the field "{field_name}" '
+                        f'for the subtype "{subtype_code}"')
+            arcpy.management.AssignDomainToField(in_table, field_name, domain_name, subtype_code)
+        else:
+            logger.info(f'The domain "{domain_name}" will be assigned to the field "{field_name}"')
+            arcpy.management.AssignDomainToField(in_table, field_name, domain_name)
+        get_catalog().add_domain_usage(in_table, field_name, domain_name, subtype_code)
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'The domain"{domain_name}" could not be assigned to the field "{field_name}": '
+                     f'{e.args[0]}')
+
+@timed('in_table')
+def create_subtype_field(in_table, field_name):
+    """Create a subtype field. In contrast to the function arcpy.management.SetSubtypeField,
+    the field is newly created, if it does not exist already.
 
     Required:
         in_table -- The name of the table or feature class.
@@ -622,6 +2414,7 @@ def create_subtype_field(in_table, field_name):
         logger.error(f'The field "{field_name}" could not be defined as subtype field: '
                      f'{e.args[0]}')
 
+@timed('in_table')
 def add_subtype(in_table, subtype_code, subtype_description):
     """Adding a subtype to a feature class or a table (see documentation of Esri).
 
@@ -640,6 +2433,23 @@ def add_subtype(in_table, subtype_code, subtype_description):
         logger.error(f'The subtype "{subtype_code}":"{subtype_description}" could not be created: '
                      f'{e.args[0]}')
 
+@timed('in_table')
+def remove_subtype(in_table, subtype_code):
+    """Removing a subtype from a feature class or a table (see documentation of Esri).
+
+    Required:
+        in_table -- The name of the table or feature class.
+        subtype_code -- The code or a list of codes of the subtypes to be removed.
+    """
+    try:
+        logger.info(f'The subtype "{subtype_code}" will be removed from "{in_table}"')
+        arcpy.management.RemoveSubtype(in_table, subtype_code)
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'The subtype "{subtype_code}" could not be removed from "{in_table}": '
+                     f'{e.args[0]}')
+
+@timed('in_dataset')
 def add_global_id(in_dataset):
     """Adding a GlobalId to a feature class or table (see documentation of Esri)
 
@@ -649,12 +2459,14 @@ def add_global_id(in_dataset):
     try:
         logger.info(f'Adding GlobalID to "{in_dataset}"')
         arcpy.management.AddGlobalIDs(in_dataset)
+        get_catalog().add_field(in_dataset, 'GlobalID')
 
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'GlobalID could not be added to "{in_dataset}": '
                      f'{e.args[0]}')
 
+@timed('in_table')
 def set_default_subtype(in_table, subtype_code):
     """Set a subtype as default (see documentation of Esri).
 
@@ -671,6 +2483,7 @@ def set_default_subtype(in_table, subtype_code):
         logger.error(f'The subtpye "{subtype_code}" could not be set as default in the table "{in_table}": '
                      f'{e.args[0]}')
 
+@timed('in_dataset')
 def enable_editor_tracking(in_dataset, creator_field = "CREATED_USER", creation_date_field = "CREATED_DATE",
                           last_editor_field = "LAST_EDITED_USER", last_edit_date_field = "LAST_EDITED_DATE",
                           add_fields = "NO_ADD_FIELDS", record_dates_in = "UTC"):
@@ -688,11 +2501,14 @@ def enable_editor_tracking(in_dataset, creator_field = "CREATED_USER", creation_
                             in_dataset, creator_field, creation_date_field, last_editor_field,
                             last_edit_date_field, add_fields, record_dates_in
                             )
+        for field_name in [creator_field, creation_date_field, last_editor_field, last_edit_date_field]:
+            get_catalog().add_field(in_dataset, field_name)
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'Editor tracking could not be activated in "{in_dataset}": '
                      f'{e.args[0]}')
 
+@timed('in_dataset')
 def enable_attachments(in_dataset):
     """Activate attachments (see documentation of Esri).
 
@@ -702,12 +2518,17 @@ def enable_attachments(in_dataset):
     try:
         logger.info(f'Activate attachments in "{in_dataset}"')
         arcpy.management.EnableAttachments(in_dataset)
+        workspace_catalog = get_catalog()
+        name = os.path.basename(os.path.normpath(in_dataset)).split('.')[-1]
+        workspace_catalog.add(name + '__ATTACH', 'Table')
+        workspace_catalog.add(name + '__ATTACHREL', 'RelationshipClass', related = [name, name + '__ATTACH'])
 
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'Attachments could not be activated in "{in_dataset}": '
                      f'{e.args[0]}')
 
+@timed('in_table')
 def add_attribute_rule(in_table, name, type, script_expression, **kwargs):
     """Adding attribute rule (see documentation of Esri).
 
@@ -723,12 +2544,91 @@ def add_attribute_rule(in_table, name, type, script_expression, **kwargs):
     try:
         logger.info(f'Adding attribute rule "{name}" to "{in_table}"')
         arcpy.management.AddAttributeRule(in_table, name, type, script_expression, **kwargs)
+        get_catalog().add_rules(in_table, [name])
 
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'Attribute rule "{name}" could not be added to "{in_table}": '
                      f'{e.args[0]}')
 
+@timed('in_table')
+def add_attribute_rules(in_table, rules):
+    """Adding several attribute rules to a table or a feature class with a single call of
+    arcpy.management.ImportAttributeRules, so that the rules of the table are validated and written
+    once. The rules are written into a temporary CSV file in the format of ExportAttributeRules.
+    Rules with parameters that are not supported by the CSV file are added one by one with
+    add_attribute_rule(). If the import fails, the rules that were not imported are added one by one.
+
+    Required:
+        in_table -- The name of the table or feature class.
+        rules -- A list of dictionaries with the parameters of the function add_attribute_rule().
+    """
+    batch = [dic_rule for dic_rule in rules if set(dic_rule).issubset(IMPORT_RULES_COLUMNS)]
+    single = [dic_rule for dic_rule in rules if not set(dic_rule).issubset(IMPORT_RULES_COLUMNS)]
+    if len(batch) == 1:
+        single = batch + single
+        batch = []
+
+    if batch:
+        columns = [column for column in IMPORT_RULES_COLUMNS.values() if column] + \
+                  ["TRIGGERINSERT", "TRIGGERDELETE", "TRIGGERUPDATE", "ISENABLED"]
+        file = tempfile.NamedTemporaryFile('w', suffix = '.csv', newline = '', encoding = 'utf-8', delete = False)
+        try:
+            with file:
+                writer = csv.DictWriter(file, columns)
+                writer.writeheader()
+                for dic_rule in batch:
+                    row = {column: dic_rule.get(key, '') for key, column in IMPORT_RULES_COLUMNS.items() if column}
+                    row['TYPE'] = 'esriART' + dic_rule['type'].capitalize()
+                    row['ISEDITABLE'] = str(dic_rule.get('is_editable', 'EDITABLE').upper() != 'NONEDITABLE')
+                    events = [event.strip().upper() for event in str(dic_rule.get('triggering_events') or '')
+                              .split(';')]
+                    for event in ('INSERT', 'DELETE', 'UPDATE'):
+                        row['TRIGGER' + event] = str(event in events)
+                    row['ISENABLED'] = 'True'
+                    writer.writerow(row)
+            logger.info(f'{len(batch)} attribute rules are imported into "{in_table}": '
+                        f'{", ".join(dic_rule["name"] for dic_rule in batch)}')
+            arcpy.management.ImportAttributeRules(in_table, file.name)
+            get_catalog().add_rules(in_table, [dic_rule['name'] for dic_rule in batch])
+        except Exception:
+            e = sys.exc_info()[1]
+            logger.warning(f'The attribute rules could not be imported into "{in_table}" with a single call, '
+                           f'the missing rules will be added one by one: {e.args[0]}')
+            # add only the rules that have not been imported (a failed import may have added some of them)
+            catalog = get_catalog()
+            catalog.refresh(in_table)
+            names = {name.lower() for name in catalog.rule_names(in_table)}
+            single = [dic_rule for dic_rule in batch if dic_rule['name'].lower() not in names] + single
+        finally:
+            try:
+                os.remove(file.name)
+            except OSError:
+                e = sys.exc_info()[1]
+                logger.warning(f'The temporary file "{file.name}" could not be deleted: {e.args[0]}')
+
+    for dic_rule in single:
+        add_attribute_rule(in_table, **dic_rule)
+
+@timed('in_table')
+def delete_attribute_rule(in_table, names):
+    """Deleting attribute rules (see documentation of Esri).
+
+    Required:
+        in_table -- The name of the table or feature class.
+        names -- The name or a list of names of the rules to be deleted.
+    """
+    try:
+        logger.info(f'Deleting attribute rule "{names}" from "{in_table}"')
+        arcpy.management.DeleteAttributeRule(in_table, names)
+        get_catalog().remove_rules(in_table, names.split(';') if isinstance(names, str) else names)
+
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.error(f'Attribute rule "{names}" could not be deleted from "{in_table}": '
+                     f'{e.args[0]}')
+
+@timed('out_relationship_class')
 def create_relationship_class(origin_table, destination_table, out_relationship_class,
                               slu_overwrite = True, **kwargs) -> None:
     """Create a realationship class (see documentation of Esri)
@@ -749,10 +2649,12 @@ def create_relationship_class(origin_table, destination_table, out_relationship_
     #    logger.warning(f'The name of the relationship class "{out_relationship_class}" is in capital letters!')
 
     # check if the relationship class already exists (not working!?)
-    if arcpy.Exists(out_relationship_class):
+    workspace_catalog = get_catalog()
+    if workspace_catalog.exists(out_relationship_class):
         if slu_overwrite:
             logger.info(f'Existing relationship class "{out_relationship_class}" will be deleted')
             arcpy.management.Delete(out_relationship_class)
+            workspace_catalog.remove(out_relationship_class)
         else:
             logger.warning(f'Existing relationship class "{out_relationship_class}" will not be overwritten')
             return
@@ -762,11 +2664,13 @@ def create_relationship_class(origin_table, destination_table, out_relationship_
         logger.info(f'The relationship class "{out_relationship_class}" will be created')
         arcpy.management.CreateRelationshipClass(origin_table = origin_table, destination_table = destination_table,
                                                  out_relationship_class = out_relationship_class, **kwargs)
+        workspace_catalog.add(out_relationship_class, 'RelationshipClass', related = [origin_table, destination_table])
 
     except Exception:
         e = sys.exc_info()[1]
         logger.error(f'The realtionship class "{out_relationship_class}" could not be created: {e.args[0]}')
 
+@timed('in_rel_class')
 def add_rule_to_relationship_class(in_rel_class, **kwargs):
     """Add a rule to a realtionship class (see Esri arcpy.management.AddRuleToRelationshipClass)
     For example, it is possible to add a rule to specify that the relationship is only set for a certain subtype.
@@ -786,61 +2690,24 @@ def add_rule_to_relationship_class(in_rel_class, **kwargs):
         logger.error(f'The rule could not be added to the relationship class "{in_rel_class}": '
                      f'{e.args[0]}')
 
-# Main module: Check input parameters and call functions
-def main(conpath, db_name, overwrite, spatial_reference_name, environment_settings,
-         delete_existing, domains, datasets, features, tables, relations, update_features, update_tables,
-         update_domains, delete_features, delete_datasets, delete_domains, delete_all_domains, stage) -> None:
-    """Check input parameters and call functions
-
-    """
-    # define the path to the workspace (sde connection file oder gdb)
-    if stage:
-        if "." in db_name:
-            # Assumption: db_name has the file ending included
-            db_fullname = db_name
-        else:
-            # Assumption: db_name ends as following, depending on the server stage (default at city of Lucerne)
-            if stage == 'TEST':
-                    db_fullname = db_name + '.owner.test.sde'
-            elif stage == 'INTE':
-                    db_fullname = db_name + '.owner.inte.sde'
-            elif stage == 'PROD':
-                    db_fullname = db_name + '.owner.prod.sde'
-            else:
-                # Assumption: Esri file geodatabse (.gdb)
-                db_fullname = db_name + '.gdb'
-    else:
-        db_fullname = db_name
-    workspace = os.path.join(conpath, db_fullname)
+def set_environment(workspace, overwrite, environment_settings = None) -> None:
+    """Sets the workspace and the ArcGIS environment settings.
 
-    # check if path exists
-    # Assumption: if it does not end with ".gdb" it's a file and not a folder
-    if ".gdb" in db_fullname:
-        if not os.path.isdir(workspace):
-            logger.error(f'workspace "{workspace}" does not exist!')
-            raise ValueError(f'Workspace "{workspace}" does not exist!')
-    else:
-        if not os.path.isfile(workspace):
-            logger.error(f'Workspace "{workspace}" does not exist!')
-            raise ValueError(f'Workspace "{workspace}" does not exist!')
+    Required:
+        workspace -- The path to the workspace (gdb, sde connection file).
+        overwrite -- The ArcGIS environment setting "overwrite" (True or False).
 
+    Optional:
+        environment_settings -- A dictionary with ArcGIS environment settings (e.g. "xy_tolerance").
+    """
     # set workspace
     arcpy.env.workspace = workspace
 
-    # check spatial reference system
-    spatial_reference = get_spatial_reference(spatial_reference_name)
-
     # set env setting overwrite
-    if overwrite == 'True':
-        overwrite = True
-        arcpy.env.overwriteOutput = True
-    else:
-        overwrite = False
-        arcpy.env.overwriteOutput = False
+    arcpy.env.overwriteOutput = overwrite
 
     # set additional env settings 
     if environment_settings:
-        logger.info("Adjust default environment settings")
         if 'xy_tolerance' in environment_settings:
             arcpy.env.XYTolerance = environment_settings['xy_tolerance']
         if 'xy_resolution' in environment_settings:
@@ -866,378 +2733,3492 @@ def main(conpath, db_name, overwrite, spatial_reference_name, environment_settin
         if 'm_domain' in environment_settings:
             arcpy.env.MDomain = environment_settings['m_domain'] 
 
-    # remove existing feature datasets, feature classes, tables and domains
-    if delete_existing == 'True':
-        logger.info("Delete all existing data")
-        delete_all(workspace)
+def process_domain(in_workspace, dic, bulk_threshold = None) -> None:
+    """Create a domain including its coded values or its range (JSON section "Domains").
 
-    # create domains
-    if domains:
-        for dic in domains:
-            # filter dictionary (if "" oder None)
-            dic_filtered = filter_dict(dic)
-            # call functions with correct parameters
-            if dic_filtered['domain_type'] == "CODED":
-                # extract DomainValues from dictionary
-                domain_values = dic_filtered.pop('DomainValues')
-                # create domain
-                create_domain(workspace, **dic_filtered)
-                # adding domain values
-                add_coded_value_to_domain(workspace, dic_filtered['domain_name'], domain_values)
-            elif dic_filtered['domain_type'] == "RANGE":
-                domain_range = dic_filtered.pop('DomainRange')
-                # creating domain
-                create_domain(workspace, **dic_filtered)
-                # adding domain values
-                set_value_for_range_domain(workspace, dic_filtered['domain_name'],
-                                           domain_range["min_value"], domain_range["max_value"])
+    Required:
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+        dic -- The dictionary of the domain.
 
+    Optional:
+        bulk_threshold -- The number of codes from which on the codes are loaded with a single call
+                          (see function add_coded_value_to_domain()).
+    """
+    # filter dictionary (if "" oder None)
+    dic_filtered = filter_dict(dic)
+    # call functions with correct parameters
+    if dic_filtered['domain_type'] == "CODED":
+        # extract DomainValues from dictionary
+        domain_values = dic_filtered.pop('DomainValues')
+        # create domain
+        create_domain(in_workspace, **dic_filtered)
+        # adding domain values
+        add_coded_value_to_domain(in_workspace, dic_filtered['domain_name'], domain_values,
+                                  slu_bulk_threshold = bulk_threshold)
+    elif dic_filtered['domain_type'] == "RANGE":
+        domain_range = dic_filtered.pop('DomainRange')
+        # creating domain
+        create_domain(in_workspace, **dic_filtered)
+        # adding domain values
+        set_value_for_range_domain(in_workspace, dic_filtered['domain_name'],
+                                   domain_range["min_value"], domain_range["max_value"])
+
+def process_dataset(in_workspace, dic, spatial_reference, overwrite) -> None:
+    """Create a feature dataset (JSON section "Datasets").
+
+    Required:
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+        dic -- The dictionary of the dataset.
+        spatial_reference -- The spatial reference of the dataset.
+        overwrite -- If an existing dataset is to be overwritten (True or False).
+    """
+    # filter dictionary
+    dic_filtered = filter_dict(dic)
+    # adding additional parameters
+    dic_filtered['spatial_reference'] = spatial_reference
+    dic_filtered['slu_overwrite'] = overwrite
     # creating dataset
-    if datasets:
-        for dic in datasets:
-            # filter dictionary
-            dic_filtered = filter_dict(dic)
-            # adding additional parameters
-            dic_filtered['spatial_reference'] = spatial_reference
-            dic_filtered['slu_overwrite'] = overwrite
-            # creating dataset
-            create_feature_dataset(workspace, **dic_filtered)
-
-    # creating feature classes
-    if features:
-        for dic in features:
-            # filter dictionary
-            dic_filtered = filter_dict(dic)
-            # filter dictionary for create_feature_class
-            dic_create_feature = filter_dict(dic_filtered, "feature")
-            # adding additional parameters
-            dic_create_feature['spatial_reference'] = spatial_reference
-            dic_create_feature['slu_overwrite'] = overwrite
-            # creating feature class
-            create_feature_class(workspace, **dic_create_feature)
-            # add GlobalIDs
-            if 'GlobalID' in dic_filtered and dic_filtered['GlobalID'] == 'True':
-                add_global_id(dic_filtered['out_name'])
-            # add subtypes
-            if 'Subtypes' in dic_filtered:
-                dic_subtype = dic_filtered['Subtypes']
-                create_subtype_field(dic_filtered['out_name'], dic_subtype['field_name'])
-                for code in dic_subtype['SubtypeValues']:
-                    add_subtype(dic_filtered['out_name'], code, dic_subtype['SubtypeValues'][code])
-                if 'DefaultSubtypeCode' in dic_subtype:
-                    set_default_subtype(dic_filtered['out_name'], dic_subtype['DefaultSubtypeCode'])
-            # add fields
-            if 'Fields' in dic_filtered:
-                for dic_field in dic_filtered['Fields']:
-                    field_domain_subtypes = None
-                    if "FieldDomainSubtype" in dic_field:
-                        field_domain_subtypes = dic_field.pop('FieldDomainSubtype')
-                    # add Fields
-                    add_field(dic_filtered['out_name'], **dic_field)
-                    # add domains to subtypes
-                    if field_domain_subtypes:
-                        for dic_domain in field_domain_subtypes:
-                            assign_domain_to_field(dic_filtered['out_name'], dic_field['field_name'],
-                                                   dic_domain['field_domain'], dic_domain['subtype_code'])
-            # add editor tracking including editor tracking fields
-            if 'EditorTracking' in dic_filtered and dic_filtered['EditorTracking'] == 'True':
-                enable_editor_tracking(in_dataset = dic_filtered['out_name'], add_fields = "ADD_FIELDS")
-            # enable attachments
-            if 'EnableAttachments' in dic_filtered and dic_filtered['EnableAttachments'] == 'True':
-                enable_attachments(dic_filtered['out_name'])
-            # add attribute rules
-            if 'AttributeRules' in dic_filtered:
-                for dic_rule in dic_filtered['AttributeRules']:
-                    add_attribute_rule(dic_filtered['out_name'], **dic_rule)
+    create_feature_dataset(in_workspace, **dic_filtered)
 
-    # creating table
-    if tables:
-        for dic in tables:
-            # filter dictionary
-            dic_filtered = filter_dict(dic)
-            # filter dictionary for create_table
-            dic_create_table = filter_dict(dic_filtered, "table")
-            # create table
-            create_table(workspace, **dic_create_table)
-            # add GlobalIDs
-            if 'GlobalID' in dic_filtered and dic_filtered['GlobalID'] == 'True':
-                add_global_id(dic_filtered['out_name'])
-            # add subtypes
-            if 'Subtypes' in dic_filtered:
-                dic_subtype = dic_filtered['Subtypes']
-                create_subtype_field(dic_filtered['out_name'], dic_subtype['field_name'])
-                for code in dic_subtype['SubtypeValues']:
-                    add_subtype(dic_filtered['out_name'], code, dic_subtype['SubtypeValues'][code])
-                if 'DefaultSubtypeCode' in dic_subtype:
-                    set_default_subtype(dic_filtered['out_name'], dic_subtype['DefaultSubtypeCode'])
-            # add fields
-            if 'Fields' in dic_filtered:
-                for dic_field in dic_filtered['Fields']:
-                    field_domain_subtypes = None
-                    if "FieldDomainSubtype" in dic_field:
-                        field_domain_subtypes = dic_field.pop('FieldDomainSubtype')
-                    # add fields
-                    add_field(dic_filtered['out_name'], **dic_field)
-                    # add domains to subtypes
-                    if field_domain_subtypes:
-                        for dic_domain in field_domain_subtypes:
-                            assign_domain_to_field(dic_filtered['out_name'], dic_field['field_name'],
-                                                   dic_domain['field_domain'], dic_domain['subtype_code'])
-            # add editor tracking including editor tracking Felder
-            if 'EditorTracking' in dic_filtered and dic_filtered['EditorTracking'] == 'True':
-                enable_editor_tracking(in_dataset = dic_filtered['out_name'], add_fields = "ADD_FIELDS")
-            # enable attachments
-            if 'EnableAttachments' in dic_filtered and dic_filtered['EnableAttachments'] == 'True':
-                enable_attachments(dic_filtered['out_name'])
-            # add attribute rules
-            if 'AttributeRules' in dic_filtered:
-                for dic_rule in dic_filtered['AttributeRules']:
-                    add_attribute_rule(dic_filtered['out_name'], **dic_rule)
+def process_class(in_workspace, dic, dic_type, spatial_reference = None, overwrite = True, clone_of = None,
+                  clone_fields = None) -> None:
+    """Create a feature class or a table including GlobalIDs, subtypes, fields, editor tracking and
+    attachments (JSON sections "Features" and "Tables"). The attribute rules are added by the
+    function process_attribute_rules().
 
-    # creating realationship class
-    if relations:
-        for dic in relations:
-            # filter dictionary
-            dic_filtered = filter_dict(dic)
-            # adding additional parameters
-            dic_filtered['slu_overwrite'] = overwrite
-            # remove parameters from dictionary that are not used for create_relationship_class
-            attributed_fields = None
-            if 'AttributedFields' in dic_filtered:
-                attributed_fields = dic_filtered.pop('AttributedFields')
-                # adding parameter to allow realtionship class having fields
-                dic_filtered['attributed'] = 'ATTRIBUTED'
-            rules = None
-            if 'Rules' in dic_filtered:
-                rules = dic_filtered.pop('Rules')
-            # create relationship class
-            create_relationship_class(**dic_filtered)
-            # add fields
-            if attributed_fields:
-                for dic_field in attributed_fields:
-                    field_domain_subtypes = None
-                    if "FieldDomainSubtype" in dic_field:
-                        field_domain_subtypes = dic_field.pop('FieldDomainSubtype')
-                    # add fields
-                    add_field(dic_filtered['out_relationship_class'], **dic_field)
-                    # ad domains to subtypes
-                    if field_domain_subtypes:
-                        for dic_domain in field_domain_subtypes:
-                            assign_domain_to_field(dic_filtered['out_relationship_class'], dic_field['field_name'],
-                                                   dic_domain['field_domain'], dic_domain['subtype_code'])
-            if rules:
-                for dic_rule in rules:
-                    add_rule_to_relationship_class(dic_filtered['out_relationship_class'], **dic_rule)
-
-    # delete feature classes
-    if delete_features:
-        for fc in delete_features:
-            delete_item(fc,"FeatureClass")
-
-    # delete datasets
-    if delete_datasets:
-        for ds in delete_datasets:
-            delete_item(ds,"FeatureDataset")
-
-    # delete domains
-    if delete_domains:
-        for dm in delete_domains:
-            delete_domain(workspace, dm)
-
-    # delete all domains
-    if delete_all_domains == "True":  
-        delete_all_domain(workspace)
-
-    # update feature class
-    if update_features:
-        for dic in update_features:
-            # filter dictionary (if "" oder None)
-            dic_filtered = filter_dict(dic)
-            # add attribute rules
-            if 'AttributeRules' in dic_filtered:
-                for dic_rule in dic_filtered['AttributeRules']:
-                    add_attribute_rule(dic_filtered['in_table'], **dic_rule)
-            # add fields
-            if 'AddFields' in dic_filtered:
-                for dic_field in dic_filtered['AddFields']:
-                    field_domain_subtypes = None
-                    if "FieldDomainSubtype" in dic_field:
-                        field_domain_subtypes = dic_field.pop('FieldDomainSubtype')
-                    # add fields
-                    add_field(dic_filtered['in_table'], **dic_field)
-                    # add domains to subtypes
-                    if field_domain_subtypes:
-                        for dic_domain in field_domain_subtypes:
-                            assign_domain_to_field(dic_filtered['in_table'], dic_field['field_name'],
-                                                   dic_domain['field_domain'], dic_domain['subtype_code'])
-            # delete fields
-            if 'DeleteFields' in dic_filtered:
-                # delete Fields
-                delete_field(dic_filtered['in_table'], dic_filtered['DeleteFields'])
-
-            # calculate fields
-            if 'CalculateFields' in dic_filtered:
-                for dic_field in dic_filtered['CalculateFields']:
-                    # calculate fields
-                    calculate_field(dic_filtered['in_table'], **dic_field)
-
-    # update feature class
-    if update_tables:
-        for dic in update_tables:
-            # filter dictionary (if "" oder None)
-            dic_filtered = filter_dict(dic)
-            # add attribute rules
-            if 'AttributeRules' in dic_filtered:
-                for dic_rule in dic_filtered['AttributeRules']:
-                    add_attribute_rule(dic_filtered['in_table'], **dic_rule)
-            # add fields
-            if 'AddFields' in dic_filtered:
-                for dic_field in dic_filtered['AddFields']:
-                    field_domain_subtypes = None
-                    if "FieldDomainSubtype" in dic_field:
-                        field_domain_subtypes = dic_field.pop('FieldDomainSubtype')
-                    # add fields
-                    add_field(dic_filtered['in_table'], **dic_field)
-                    # add domains to subtypes
-                    if field_domain_subtypes:
-                        for dic_domain in field_domain_subtypes:
-                            assign_domain_to_field(dic_filtered['in_table'], dic_field['field_name'],
-                                                   dic_domain['field_domain'], dic_domain['subtype_code'])
-            # delete fields
-            if 'DeleteFields' in dic_filtered:
-                # delete Fields
-                delete_field(dic_filtered['in_table'], dic_filtered['DeleteFields'])
-
-            # calculate fields
-            if 'CalculateFields' in dic_filtered:
-                for dic_field in dic_filtered['CalculateFields']:
-                    # calculate fields
-                    calculate_field(dic_filtered['in_table'], **dic_field)
-
-    # update domains
-    if update_domains:
-        for dic in update_domains:
-            # add value to CODED-domain
-            for dic_code in dic["AddCodedValues"]:
-                dic_code_value = {dic_code['code']:dic_code['code_description']}
-                add_coded_value_to_domain(workspace, dic['domain_name'], dic_code_value)
-    
+    Required:
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+        dic -- The dictionary of the feature class or table.
+        dic_type -- "feature" or "table".
 
-if __name__ == "__main__":
-    # path to the input JSON-file
-    paramFile = arcpy.GetParameterAsText(0)
-    #paramFile = r'C:\Datamodels\event_test.json'
+    Optional:
+        spatial_reference -- The spatial reference of the feature class.
+        overwrite -- If an existing feature class is to be overwritten (True or False).
+        clone_of -- The path of a feature class or table with the same fields (based on the same template),
+                    whose fields are copied with the parameter "template" of CreateFeatureclass/CreateTable.
+        clone_fields -- The names of the fields copied from clone_of (see function build_nodes()).
+    """
+    # filter dictionary
+    dic_filtered = filter_dict(dic)
+    # filter dictionary for create_feature_class or create_table
+    dic_create = filter_dict(dic_filtered, dic_type)
+    if clone_of:
+        logger.info(f'The fields of "{dic_filtered["out_name"]}" are copied from "{os.path.basename(clone_of)}"')
+        dic_create['template'] = clone_of
+    if dic_type == "feature":
+        # adding additional parameters
+        dic_create['spatial_reference'] = spatial_reference
+        dic_create['slu_overwrite'] = overwrite
+        # creating feature class
+        create_feature_class(in_workspace, **dic_create)
+    else:
+        # create table
+        create_table(in_workspace, **dic_create)
+    # add GlobalIDs
+    if 'GlobalID' in dic_filtered and dic_filtered['GlobalID'] == 'True':
+        add_global_id(dic_filtered['out_name'])
+    # add subtypes
+    if 'Subtypes' in dic_filtered:
+        dic_subtype = dic_filtered['Subtypes']
+        create_subtype_field(dic_filtered['out_name'], dic_subtype['field_name'])
+        for code in dic_subtype['SubtypeValues']:
+            add_subtype(dic_filtered['out_name'], code, dic_subtype['SubtypeValues'][code])
+        if 'DefaultSubtypeCode' in dic_subtype:
+            set_default_subtype(dic_filtered['out_name'], dic_subtype['DefaultSubtypeCode'])
+    # add fields
+    if 'Fields' in dic_filtered:
+        add_fields_with_domains(dic_filtered['out_name'], dic_filtered['Fields'], clone_fields)
+    # add editor tracking including editor tracking fields
+    if 'EditorTracking' in dic_filtered and dic_filtered['EditorTracking'] == 'True':
+        enable_editor_tracking(in_dataset = dic_filtered['out_name'], add_fields = "ADD_FIELDS")
+    # enable attachments
+    if 'EnableAttachments' in dic_filtered and dic_filtered['EnableAttachments'] == 'True':
+        enable_attachments(dic_filtered['out_name'])
+
+def process_attribute_rules(in_table, rules, overwrite = True) -> None:
+    """Add the attribute rules of a feature class or a table with a single import (see function
+    add_attribute_rules()). Existing rules with the same name (e.g. of a table that is not recreated
+    or of a resumed run) are replaced or kept depending on the parameter overwrite.
 
-    if paramFile:
-        # read the json-file
-        with open(paramFile, encoding='utf-8') as f:
-            data = json.load(f)
-            logfolder = data["LogFolder"]
-            logversion = data["LogVersion"]
-            conpath = data["Conpath"]
-            db_name = data["DBName"]
-            overwrite = data["Overwrite"]
-            if "SpatialReferenceName" in data:
-                spatial_reference_name = data["SpatialReferenceName"]
-            else:
-                spatial_reference_name = "CH1903+ LV95"
-            if "EnvironmentSettings" in data:
-                environment_settings = data["EnvironmentSettings"]
-            else:
-                environment_settings = None
-            if "DeleteAllExisting" in data:
-                delete_existing = data["DeleteAllExisting"]
-            else:
-                delete_existing = "False"
-            if "Domains" in data:
-                domains = data["Domains"]
-            else:
-                domains = None
-            if "Datasets" in data:
-                datasets = data["Datasets"]
-            else:
-                datasets = None
-            if "Features" in data:
-                features = data["Features"]
-            else:
-                features = None
-            if "Tables" in data:
-                tables = data["Tables"]
-            else:
-                tables = None
-            if "Relations" in data:
-                relations = data["Relations"]
-            else:
-                relations = None
-            if "UpdateFeatures" in data:
-                update_features = data["UpdateFeatures"]
-            else:
-                update_features = None
-            if "UpdateTables" in data:
-                update_tables = data["UpdateTables"]
-            else:
-                update_tables = None
-            if "UpdateDomains" in data:
-                update_domains = data["UpdateDomains"]
-            else:
-                update_domains = None
-            if "DeleteFeatures" in data:
-                delete_features = data["DeleteFeatures"]
-            else:
-                delete_features = None
-            if "DeleteDatasets" in data:
-                delete_datasets = data["DeleteDatasets"]
-            else:
-                delete_datasets = None
-            if "DeleteDomains" in data:
-                delete_domains = data["DeleteDomains"]
-            else:
-                delete_domains = None
-            if "DeleteAllDomains" in data:
-                delete_all_domains = data["DeleteAllDomains"]
-            else:
-                delete_all_domains = "False"
-            # instead of the previously implemented parameter "Environment", the parameter "Stage" is used
-            if "Stage" in data:
-                stage = data["Stage"]
+    Required:
+        in_table -- The name of the table or feature class.
+        rules -- A list of dictionaries with the parameters of the function add_attribute_rule().
+
+    Optional:
+        overwrite -- If existing rules are to be overwritten (True or False).
+    """
+    # a table that does not exist has no rules (the error is logged by add_attribute_rules())
+    live_rules = {name.lower(): name for name in get_catalog().rule_names(in_table)}
+    existing = [live_rules[dic_rule['name'].lower()] for dic_rule in rules if dic_rule['name'].lower() in live_rules]
+    if existing and overwrite:
+        logger.info(f'Existing attribute rules of "{in_table}" will be replaced')
+        delete_attribute_rule(in_table, existing)
+    elif existing:
+        logger.warning(f'Existing attribute rules "{";".join(existing)}" of "{in_table}" will not be overwritten')
+        rules = [dic_rule for dic_rule in rules if dic_rule['name'].lower() not in live_rules]
+    if rules:
+        add_attribute_rules(in_table, rules)
+
+def process_relation(dic, overwrite) -> None:
+    """Create a relationship class including attributed fields and rules (JSON section "Relations").
+
+    Required:
+        dic -- The dictionary of the relationship class.
+        overwrite -- If an existing relationship class is to be overwritten (True or False).
+    """
+    # filter dictionary
+    dic_filtered = filter_dict(dic)
+    # adding additional parameters
+    dic_filtered.setdefault('slu_overwrite', overwrite)
+    # remove parameters from dictionary that are not used for create_relationship_class
+    attributed_fields = None
+    if 'AttributedFields' in dic_filtered:
+        attributed_fields = dic_filtered.pop('AttributedFields')
+        # adding parameter to allow realtionship class having fields
+        dic_filtered['attributed'] = 'ATTRIBUTED'
+    rules = None
+    if 'Rules' in dic_filtered:
+        rules = dic_filtered.pop('Rules')
+    # create relationship class
+    create_relationship_class(**dic_filtered)
+    # add fields
+    if attributed_fields:
+        add_fields_with_domains(dic_filtered['out_relationship_class'], attributed_fields)
+    if rules:
+        for dic_rule in rules:
+            add_rule_to_relationship_class(dic_filtered['out_relationship_class'], **dic_rule)
+
+def process_update(dic) -> None:
+    """Update an existing feature class or table (JSON sections "UpdateFeatures" and "UpdateTables").
+
+    Required:
+        dic -- The dictionary of the update.
+    """
+    # filter dictionary (if "" oder None)
+    dic_filtered = filter_dict(dic)
+    in_table = dic_filtered['in_table']
+    # add GlobalIDs
+    if 'GlobalID' in dic_filtered and dic_filtered['GlobalID'] == 'True':
+        add_global_id(in_table)
+    # add subtypes
+    if 'Subtypes' in dic_filtered:
+        dic_subtype = dic_filtered['Subtypes']
+        if 'field_name' in dic_subtype:
+            create_subtype_field(in_table, dic_subtype['field_name'])
+        for code in dic_subtype.get('SubtypeValues', {}):
+            add_subtype(in_table, code, dic_subtype['SubtypeValues'][code])
+        if 'DefaultSubtypeCode' in dic_subtype:
+            set_default_subtype(in_table, dic_subtype['DefaultSubtypeCode'])
+    # remove subtypes
+    if 'RemoveSubtypes' in dic_filtered:
+        remove_subtype(in_table, dic_filtered['RemoveSubtypes'])
+    # delete attribute rules
+    if 'DeleteAttributeRules' in dic_filtered:
+        delete_attribute_rule(in_table, dic_filtered['DeleteAttributeRules'])
+    # add fields
+    if 'AddFields' in dic_filtered:
+        add_fields_with_domains(in_table, dic_filtered['AddFields'])
+    # alter fields
+    if 'AlterFields' in dic_filtered:
+        for dic_field in dic_filtered['AlterFields']:
+            alter_field(in_table, **dic_field)
+    # assign domains
+    if 'AssignDomains' in dic_filtered:
+        for dic_domain in dic_filtered['AssignDomains']:
+            assign_domain_to_field(in_table, dic_domain['field_name'], dic_domain['field_domain'],
+                                   dic_domain.get('subtype_code'))
+    # remove domains
+    if 'RemoveDomains' in dic_filtered:
+        for dic_domain in dic_filtered['RemoveDomains']:
+            remove_domain_from_field(in_table, dic_domain['field_name'], dic_domain.get('subtype_code'))
+    # delete fields
+    if 'DeleteFields' in dic_filtered:
+        # delete Fields
+        delete_field(in_table, dic_filtered['DeleteFields'])
+
+    # calculate fields
+    if 'CalculateFields' in dic_filtered:
+        # backfill in ranges of object IDs (invalid values are logged by the validation)
+        backfill = dic_filtered.get('Backfill') or {}
+        chunk_size = str(backfill.get('ChunkSize', ''))
+        calculate_fields(in_table, dic_filtered['CalculateFields'], int(chunk_size) if chunk_size.isdigit() else None)
+    # add attribute rules (after the fields they use have been added and calculated)
+    if 'AttributeRules' in dic_filtered:
+        add_attribute_rules(in_table, dic_filtered['AttributeRules'])
+    # add editor tracking including editor tracking fields
+    if 'EditorTracking' in dic_filtered and dic_filtered['EditorTracking'] == 'True':
+        enable_editor_tracking(in_dataset = in_table, add_fields = "ADD_FIELDS")
+    # enable attachments
+    if 'EnableAttachments' in dic_filtered and dic_filtered['EnableAttachments'] == 'True':
+        enable_attachments(in_table)
+
+def process_update_domain(in_workspace, dic, bulk_threshold = None) -> None:
+    """Update an existing domain (JSON section "UpdateDomains").
+
+    Required:
+        in_workspace -- The path to the workspace (gdb, sde connection file).
+        dic -- The dictionary of the update.
+
+    Optional:
+        bulk_threshold -- The number of codes from which on the codes are loaded with a single call
+                          (see function add_coded_value_to_domain()).
+    """
+    dic = load_item(dic)
+    # alter the description
+    if dic.get('domain_description'):
+        alter_domain(in_workspace, dic['domain_name'], new_domain_description = dic['domain_description'])
+    # delete values from CODED-domain
+    if dic.get("DeleteCodedValues"):
+        delete_coded_value_from_domain(in_workspace, dic['domain_name'], dic["DeleteCodedValues"])
+    # add values to CODED-domain ("REPLACE": the existing values are replaced)
+    domain_values = {dic_code['code']: dic_code['code_description'] for dic_code in dic.get("AddCodedValues", [])}
+    if domain_values:
+        add_coded_value_to_domain(in_workspace, dic['domain_name'], domain_values,
+                                  slu_update_option = dic.get('update_option', 'APPEND').upper(),
+                                  slu_bulk_threshold = bulk_threshold)
+    # set values of RANGE-domain
+    if dic.get("DomainRange"):
+        set_value_for_range_domain(in_workspace, dic['domain_name'], dic["DomainRange"]["min_value"],
+                                   dic["DomainRange"]["max_value"])
+
+def get_field_domains(fields) -> list:
+    """Returns the names of all domains used by a list of fields.
+
+    Required:
+        fields -- A list of dictionaries with the parameters of the function add_field() and
+                  optionally the key "FieldDomainSubtype".
+    """
+    domain_names = []
+    for dic_field in fields or []:
+        if dic_field.get('field_domain'):
+            domain_names.append(dic_field['field_domain'])
+        for dic_domain in dic_field.get('FieldDomainSubtype') or []:
+            domain_names.append(dic_domain['field_domain'])
+    return domain_names
+
+def resolve_templates(templates, items) -> list:
+    """Resolves the parameter "template_ref" of feature classes or tables: all parameters of the template
+    (JSON section "Templates") that are not defined by the feature class or table itself are taken from
+    the template. The fields and the attribute rules of the template and of the feature class or table
+    are merged by their names (the definition of the feature class or table is used for both).
+
+    Required:
+        templates -- The items of the section "Templates" or None.
+        items -- The items of the section "Features" or "Tables" or None.
+
+    Return:
+        items -- The items with the resolved templates (items without "template_ref" are not changed).
+    """
+    if not templates or not items:
+        return items
+    lookup = {}
+    for template in templates:
+        dic_template = load_item(template)
+        if dic_template.get('name'):
+            lookup[dic_template['name'].lower()] = dic_template
+    resolved = []
+    for item in items:
+        dic = load_item(item)
+        dic_template = lookup.get(str(dic.get('template_ref')).lower())
+        if dic_template is None:
+            # unknown templates are logged by the function validate_model()
+            resolved.append(item)
+            continue
+        merged = {k: v for k, v in dic_template.items() if k not in ('name', 'Fields', 'AttributeRules')}
+        merged.update({k: v for k, v in dic.items() if k not in ('Fields', 'AttributeRules')})
+        for key, name_key in (('Fields', 'field_name'), ('AttributeRules', 'name')):
+            entries = {}
+            for entry in (dic_template.get(key) or []) + (dic.get(key) or []):
+                entries[str(entry.get(name_key)).lower()] = entry
+            if entries:
+                merged[key] = list(entries.values())
+        resolved.append(merged)
+    return resolved
+
+def get_rule_references(rules) -> tuple:
+    """Returns the names of the feature classes, tables and relationship classes that are used
+    in the Arcade expressions of attribute rules ("FeatureSetByName($datastore, ...)" and
+    "FeatureSetByRelationshipName($feature, ...)").
+
+    Required:
+        rules -- A list of dictionaries with the parameters of the function add_attribute_rule().
+
+    Return:
+        (table_names, relationship_names) -- Two lists with the names.
+    """
+    table_names = []
+    relationship_names = []
+    for dic_rule in rules or []:
+        expression = dic_rule.get('script_expression') or ''
+        table_names += re.findall(r'FeatureSetByName\s*\(\s*\$datastore\s*,\s*["\']([^"\']+)["\']', expression)
+        relationship_names += re.findall(r'FeatureSetByRelationshipName\s*\(\s*\$\w+\s*,\s*["\']([^"\']+)["\']',
+                                         expression)
+    return table_names, relationship_names
+
+# tokens of the Arcade language (see class ArcadeParser)
+ARCADE_TOKENS = re.compile(r'''
+      (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+    | (?P<comment>/\*)
+    | (?P<template>`(?:[^`\\]|\\.)*`)
+    | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+    | (?P<number>0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<name>[$A-Za-z_][$\w]*)
+    | (?P<operator>>>>=|>>>|<<=|>>=|[=!<>]=|&&|\|\||\+\+|--|[-+*/%&|^]=|<<|>>|[-+*/%=<>!&|^~?:.,;()\[\]{}])
+    | (?P<error>.)
+    ''', re.VERBOSE | re.DOTALL)
+ARCADE_KEYWORDS = {'var', 'if', 'else', 'for', 'in', 'while', 'return', 'break', 'continue', 'function',
+                   'true', 'false', 'null'}
+# binary operators of Arcade -> precedence
+ARCADE_OPERATORS = {'||': 1, '&&': 2, '|': 3, '^': 4, '&': 5, '==': 6, '!=': 6, '<': 7, '>': 7, '<=': 7, '>=': 7,
+                    '<<': 8, '>>': 8, '>>>': 8, '+': 9, '-': 9, '*': 10, '/': 10, '%': 10}
+ARCADE_ASSIGNMENTS = {'=', '+=', '-=', '*=', '/=', '%=', '&=', '|=', '^=', '<<=', '>>=', '>>>='}
+# variables of the feature of an attribute rule
+ARCADE_FEATURES = {'$feature', '$originalfeature'}
+
+class ArcadeParser:
+    """Parser of Arcade expressions (offline, without ArcGIS): the expression is split into tokens and
+    its statements are checked for syntax errors. The fields of the feature ("$feature.FIELD",
+    "$feature['FIELD']", "$originalFeature.FIELD"), the tables ("FeatureSetByName($datastore, 'TABLE',
+    ['FIELD'])") and the relationship classes ("FeatureSetByRelationshipName($feature, 'REL')") used in
+    the expression are collected. Arcade functions and keywords are not case sensitive.
+
+    Required:
+        expression -- The Arcade expression.
+    """
+    def __init__(self, expression):
+        self.text = expression
+        self.tokens = []
+        self.index = 0
+        self.fields = []
+        self.tables = []
+        self.relations = []
+
+    def parse(self) -> dict:
+        """Parses the expression.
+
+        Return:
+            result -- A dictionary with the syntax error ("error", None if the expression is valid) and the
+                      names of the fields ("fields"), tables ("tables": [name, fields or None]) and
+                      relationship classes ("relations") used in the expression.
+        """
+        try:
+            self.tokenize()
+            while self.peek()[0] != 'end':
+                self.statement()
+            error = None
+        except ValueError:
+            error = str(sys.exc_info()[1])
+        unique = lambda values: [value for i, value in enumerate(values) if value not in values[:i]]
+        return {'error': error, 'fields': unique(self.fields), 'tables': unique(self.tables),
+                'relations': unique(self.relations)}
+
+    def error(self, message, pos):
+        line = self.text.count('\n', 0, pos) + 1
+        column = pos - (self.text.rfind('\n', 0, pos) + 1) + 1
+        raise ValueError(f'{message} (line {line}, column {column})')
+
+    def tokenize(self) -> None:
+        for match in ARCADE_TOKENS.finditer(self.text):
+            kind = match.lastgroup
+            if kind == 'space':
+                continue
+            value, pos = match.group(), match.start()
+            if kind == 'comment':
+                self.error('Unterminated comment', pos)
+            if kind == 'error':
+                self.error('Unterminated string' if value in '"\'`' else f'Unexpected character "{value}"', pos)
+            if kind == 'name' and value.lower() in ARCADE_KEYWORDS:
+                kind, value = 'keyword', value.lower()
+            if kind == 'template':
+                self.template(value, pos)
+            self.tokens.append((kind, value, pos))
+        # the end is repeated for the look ahead of peek()
+        self.tokens += [('end', '', len(self.text))] * 2
+
+    def template(self, value, pos) -> None:
+        # the expressions of a template literal (e.g. `Name: ${$feature.NAME}`) are parsed separately
+        start = value.find('${')
+        while start >= 0:
+            depth, end = 1, start + 2
+            while end < len(value) and depth:
+                depth += {'{': 1, '}': -1}.get(value[end], 0)
+                end += 1
+            if depth:
+                self.error('Unterminated expression in template literal', pos + start)
+            result = ArcadeParser(value[start + 2:end - 1]).parse()
+            if result['error']:
+                self.error(f'Invalid expression in template literal: {result["error"]}', pos + start)
+            self.fields += result['fields']
+            self.tables += result['tables']
+            self.relations += result['relations']
+            start = value.find('${', end)
+
+    def peek(self, offset = 0) -> tuple:
+        return self.tokens[self.index + offset]
+
+    def next(self) -> tuple:
+        token = self.tokens[self.index]
+        if token[0] != 'end':
+            self.index += 1
+        return token
+
+    def accept(self, value) -> bool:
+        kind, token, _ = self.tokens[self.index]
+        if token == value and kind in ('operator', 'keyword'):
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, value) -> None:
+        if not self.accept(value):
+            kind, token, pos = self.peek()
+            self.error(f'"{value}" expected instead of ' + (f'"{token}"' if kind != 'end' else 'the end'), pos)
+
+    def name(self) -> str:
+        kind, value, pos = self.next()
+        if kind not in ('name', 'keyword'):
+            self.error('Name expected instead of ' + (f'"{value}"' if kind != 'end' else 'the end'), pos)
+        return value
+
+    def statement(self) -> None:
+        kind, value, pos = self.peek()
+        if kind == 'operator' and value in (';', '{'):
+            self.block() if value == '{' else self.next()
+        elif kind == 'keyword' and value == 'var':
+            self.next()
+            self.variables()
+        elif kind == 'keyword' and value == 'function':
+            self.next()
+            self.name()
+            self.expect('(')
+            while not self.accept(')'):
+                self.name()
+                if self.peek()[1] != ')':
+                    self.expect(',')
+            self.block()
+        elif kind == 'keyword' and value in ('if', 'while'):
+            self.next()
+            self.expect('(')
+            self.expression()
+            self.expect(')')
+            self.statement()
+            if value == 'if' and self.accept('else'):
+                self.statement()
+        elif kind == 'keyword' and value == 'for':
+            self.next()
+            self.loop()
+        elif kind == 'keyword' and value == 'return':
+            self.next()
+            if self.peek()[0] != 'end' and self.peek()[1] not in (';', '}'):
+                self.expression()
+        elif kind == 'keyword' and value in ('break', 'continue'):
+            self.next()
+        else:
+            self.expression()
+
+    def block(self) -> None:
+        self.expect('{')
+        while not self.accept('}'):
+            if self.peek()[0] == 'end':
+                self.expect('}')
+            self.statement()
+
+    def variables(self) -> None:
+        self.name()
+        if self.accept('='):
+            self.assignment()
+        while self.accept(','):
+            self.name()
+            if self.accept('='):
+                self.assignment()
+
+    def loop(self) -> None:
+        self.expect('(')
+        start = self.index
+        # for (var item in items)
+        self.accept('var')
+        if self.peek()[0] == 'name' and self.peek(1)[:2] == ('keyword', 'in'):
+            self.index += 2
+            self.expression()
+            self.expect(')')
+            self.statement()
+            return
+        # for (var i = 0; i < 10; i++)
+        self.index = start
+        if not self.accept(';'):
+            self.variables() if self.accept('var') else self.expression()
+            self.expect(';')
+        if not self.accept(';'):
+            self.expression()
+            self.expect(';')
+        if not self.accept(')'):
+            self.expression()
+            self.expect(')')
+        self.statement()
+
+    def expression(self):
+        return self.assignment()
+
+    def assignment(self):
+        value = self.binary()
+        if self.accept('?'):
+            self.assignment()
+            self.expect(':')
+            self.assignment()
+            return None
+        kind, token, _ = self.peek()
+        if kind == 'operator' and token in ARCADE_ASSIGNMENTS:
+            self.next()
+            self.assignment()
+            return None
+        return value
+
+    def binary(self, precedence = 1):
+        value = self.unary()
+        while True:
+            kind, token, _ = self.peek()
+            if kind != 'operator' or ARCADE_OPERATORS.get(token, 0) < precedence:
+                return value
+            self.next()
+            self.binary(ARCADE_OPERATORS[token] + 1)
+            value = None
+
+    def unary(self):
+        kind, token, _ = self.peek()
+        if kind == 'operator' and token in ('!', '-', '+', '~', '++', '--'):
+            self.next()
+            self.unary()
+            return None
+        return self.postfix()
+
+    def postfix(self):
+        """Parses a value with its members, indexes and calls. Returns the value of string literals
+        and lists of string literals (the parameters of FeatureSetByName), otherwise None."""
+        kind, token, pos = self.next()
+        value, variable = None, None
+        if kind == 'string':
+            value = re.sub(r'\\(.)', r'\1', token[1:-1])
+        elif kind == 'name':
+            variable = token.lower()
+        elif kind == 'operator' and token == '(':
+            self.expression()
+            self.expect(')')
+        elif kind == 'operator' and token == '[':
+            value = []
+            while not self.accept(']'):
+                value.append(self.assignment())
+                if self.peek()[1] != ']':
+                    self.expect(',')
+        elif kind == 'operator' and token == '{':
+            while not self.accept('}'):
+                if self.next()[0] not in ('string', 'name', 'keyword', 'number'):
+                    self.error('Key of the dictionary expected', self.tokens[self.index - 1][2])
+                self.expect(':')
+                self.assignment()
+                if self.peek()[1] != '}':
+                    self.expect(',')
+        elif kind not in ('number', 'template') and not (kind == 'keyword' and token in ('true', 'false', 'null')):
+            self.error(f'Unexpected "{token}"' if kind != 'end' else 'Unexpected end of the expression', pos)
+        while True:
+            kind, token, pos = self.peek()
+            if kind != 'operator' or token not in ('.', '[', '('):
+                break
+            self.next()
+            if token == '.':
+                member = self.name()
+                if variable in ARCADE_FEATURES:
+                    self.fields.append(member)
+            elif token == '[':
+                index = self.expression()
+                self.expect(']')
+                if variable in ARCADE_FEATURES and isinstance(index, str):
+                    self.fields.append(index)
             else:
-                stage = None
-            # parameter "Environment" maybe still used in an old version of a JSON-file
-            if not stage:
-                if "Environment" in data:
-                    stage = data["Environment"]
-    else:
-        print('No Parameter-JSON file specified!')
-        sys.exit()
+                arguments = []
+                while not self.accept(')'):
+                    arguments.append(self.assignment())
+                    if self.peek()[1] != ')':
+                        self.expect(',')
+                self.call(variable, arguments)
+            value, variable = None, None
+        if self.peek()[0] == 'operator' and self.peek()[1] in ('++', '--'):
+            self.next()
+        return value
+
+    def call(self, function, arguments) -> None:
+        if len(arguments) < 2 or not isinstance(arguments[1], str):
+            return
+        if function == 'featuresetbyname':
+            fields = arguments[2] if len(arguments) > 2 and isinstance(arguments[2], list) and \
+                     all(isinstance(field, str) for field in arguments[2]) else None
+            self.tables.append([arguments[1], fields])
+        elif function == 'featuresetbyrelationshipname':
+            self.relations.append(arguments[1])
+
+class ArcadeCache:
+    """Results of the parser of Arcade expressions (see class ArcadeParser) by the hash of the
+    expression, so that unchanged expressions are not parsed again. The results are kept in a JSON
+    file (e.g. in the log folder) for the next runs.
 
-    # check if logfolder exists
-    if not os.path.isdir(logfolder):
+    Optional:
+        file -- The path to the JSON file (None: the results are only kept in memory).
+        max_entries -- The number of results kept in the file (the results used last are kept).
+    """
+    def __init__(self, file = None, max_entries = 10000):
+        self.file = file
+        self.max_entries = max_entries
+        self.results = {}
+        self.changed = False
+        if file and os.path.isfile(file):
+            try:
+                with open(file, encoding = 'utf-8') as f:
+                    self.results = json.load(f)
+            except (OSError, ValueError):
+                e = sys.exc_info()[1]
+                logger.warning(f'The cache of the Arcade expressions "{file}" could not be read: {e}')
+
+    def parse(self, expression) -> dict:
+        """Returns the result of the parser for an expression (see function ArcadeParser.parse())."""
+        key = hashlib.sha1(expression.encode('utf-8')).hexdigest()
+        result = self.results.pop(key, None)
+        if result is None:
+            result = ArcadeParser(expression).parse()
+        self.results[key] = result
+        self.changed = True
+        return result
+
+    def save(self) -> None:
+        """Writes the results to the JSON file."""
+        if not self.file or not self.changed:
+            return
+        results = dict(list(self.results.items())[-self.max_entries:])
         try:
-            print(f'Creating a log folder: {logfolder}')
-            os.makedirs(logfolder)
-        except:
-            raise ValueError(f'The logfolder "{logfolder}" does not exist and could not be created!')
+            # several runs (see function run_batch()) may write the file at the same time
+            with open(self.file + f'.{os.getpid()}', 'w', encoding = 'utf-8') as f:
+                json.dump(results, f)
+            os.replace(self.file + f'.{os.getpid()}', self.file)
+            self.changed = False
+        except OSError:
+            e = sys.exc_info()[1]
+            logger.warning(f'The cache of the Arcade expressions "{self.file}" could not be written: {e}')
+
+# field types of the domains (see arcpy.management.CreateDomain)
+DOMAIN_FIELD_TYPES = ["SHORT", "LONG", "BIGINTEGER", "FLOAT", "DOUBLE", "TEXT", "DATE", "DATEONLY", "TIMEONLY",
+                      "TIMESTAMPOFFSET"]
+# geometry types of the feature classes (see arcpy.management.CreateFeatureclass)
+GEOMETRY_TYPES = ["POINT", "MULTIPOINT", "POLYGON", "POLYLINE", "MULTIPATCH"]
+# implicit fields of the feature classes depending on the geometry type (field name -> field type)
+SHAPE_FIELDS = {"POLYGON": {"shape_length": "DOUBLE", "shape_area": "DOUBLE", "shape.stlength()": "DOUBLE",
+                            "shape.starea()": "DOUBLE", "shape__length": "DOUBLE", "shape__area": "DOUBLE"},
+                "POLYLINE": {"shape_length": "DOUBLE", "shape.stlength()": "DOUBLE", "shape__length": "DOUBLE"}}
+
+def get_subtype_codes(subtype_code) -> list:
+    """Returns the codes of the subtypes of a parameter "subtype_code" (e.g. "1: Event;2: Boulevard" -> ["1", "2"])."""
+    return [subtype.split(':')[0].strip() for subtype in str(subtype_code).split(';') if subtype.strip()]
+
+class ModelSymbols:
+    """Symbol table of a data model: the domains, datasets, feature classes, tables, relationship classes,
+    fields and subtypes defined in the JSON file and existing in the workspace. All objects are indexed by
+    their key (see function get_object_key()), so that every reference of the JSON file is resolved with a
+    single lookup.
 
-    # initialise logging
-    filename = db_name + '_' + logversion + '.log'
-    log = os.path.join(logfolder, filename)
-    init_logging(log)
+    Optional:
+        workspace_catalog -- The WorkspaceCatalog of the workspace (None: the workspace is empty).
+    """
+    def __init__(self, workspace_catalog = None):
+        # key of the domain -> {"name": name, "field_type": e.g. "SHORT",
+        #                       "path": position in the JSON file (None: existing domain)}
+        self.domains = {}
+        # key of the object -> {"name": name, "type": data type, "path": position in the JSON file,
+        #                       "fields": {field name in lower case: field type} or None if unknown,
+        #                       "subtypes": {code: description} or None if the table has no subtypes}
+        self.objects = {}
+        if workspace_catalog is not None:
+            self.load_workspace(workspace_catalog)
+
+    def load_workspace(self, workspace_catalog) -> None:
+        """Adds the objects of a WorkspaceCatalog (already loaded, no additional call of arcpy)."""
+        for key, domain_name in workspace_catalog.domains.items():
+            self.domains[key] = {'name': domain_name, 'field_type': workspace_catalog.domain_type(domain_name),
+                                 'path': None}
+        for key, item in workspace_catalog.objects.items():
+            fields = None
+            schema = workspace_catalog.object_schema.get(key)
+            if schema is not None and schema.get('fields') is not None:
+                fields = {field.name.lower(): FIELD_TYPES.get(field.type, str(field.type).upper())
+                          for field in schema['fields']}
+            subtypes = None
+            if key in workspace_catalog.subtype_schema:
+                subtypes = {str(code): subtype['Name'] for code, subtype
+                            in workspace_catalog.subtype_schema[key].items()}
+            self.add(item['name'], item['type'], None, fields, subtypes)
+
+    def add(self, name, data_type, path, fields = None, subtypes = None) -> dict:
+        """Adds an object (an existing object with the same name is replaced). If the name is already used
+        by an object of the JSON file, the object is not added and the other object is returned."""
+        key = get_object_key(name)
+        previous = self.objects.get(key)
+        if previous and previous['path']:
+            return previous
+        self.objects[key] = {'name': name, 'type': data_type, 'path': path, 'fields': fields, 'subtypes': subtypes}
+        return None
+
+    def get(self, name, data_types = None) -> dict:
+        """Returns the object with the name (and one of the data types) or None."""
+        item = self.objects.get(get_object_key(name))
+        if item is None or (data_types and item['type'] not in data_types):
+            return None
+        return item
+
+    def has_field(self, item, field_name) -> bool:
+        """Checks whether an object has a field (True if its fields are unknown, e.g. of a template)."""
+        return item['fields'] is None or str(field_name).lower() in item['fields']
+
+    def has_subtype(self, item, subtype) -> bool:
+        """Checks whether an object has a subtype given by its code or its description."""
+        if not item['subtypes']:
+            return False
+        return str(subtype) in item['subtypes'] or str(subtype) in item['subtypes'].values()
+
+def validate_attribute_rules(symbols, rules, arcade_cache = None) -> int:
+    """Validates the Arcade expressions of attribute rules offline before the workspace is changed: the syntax
+    of the expressions, the fields of the feature against the fields of the feature class or table and the
+    tables and relationship classes used with FeatureSetByName and FeatureSetByRelationshipName. Errors are
+    logged as errors, tables and relationship classes that are neither defined in the JSON file nor exist
+    in the workspace as warnings.
+
+    Required:
+        symbols -- The ModelSymbols of the data model.
+        rules -- A list of (position in the JSON file, name of the table, list of rules) tuples.
+
+    Optional:
+        arcade_cache -- An ArcadeCache with the results of previous runs.
+
+    Return:
+        errors -- The number of errors found.
+    """
+    arcade_cache = arcade_cache or ArcadeCache()
+    errors = 0
+    for path, table, table_rules in rules:
+        item = symbols.get(table, ('FeatureClass', 'Table'))
+        for dic_rule in table_rules:
+            rule = f'attribute rule "{dic_rule.get("name")}" of "{table}"'
+            result = arcade_cache.parse(str(dic_rule.get('script_expression') or ''))
+            if result['error']:
+                logger.error(f'{path}: The Arcade expression of the {rule} is not valid: {result["error"]}')
+                errors += 1
+                continue
+            for field_name in result['fields']:
+                if item is not None and not symbols.has_field(item, field_name):
+                    logger.error(f'{path}: The field "{field_name}" used in the {rule} does not exist')
+                    errors += 1
+            for table_name, table_fields in result['tables']:
+                other = symbols.get(table_name, ('FeatureClass', 'Table', 'RelationshipClass'))
+                if other is None:
+                    logger.warning(f'{path}: The table "{table_name}" used in the {rule} does not exist')
+                    continue
+                for field_name in table_fields or []:
+                    if field_name != '*' and not symbols.has_field(other, field_name):
+                        logger.error(f'{path}: The field "{field_name}" of "{table_name}" used in the {rule} '
+                                     f'does not exist')
+                        errors += 1
+            for relation_name in result['relations']:
+                if symbols.get(relation_name, ('RelationshipClass',)) is None:
+                    logger.warning(f'{path}: The relationship class "{relation_name}" used in the {rule} '
+                                   f'does not exist')
+    return errors
+
+def validate_model(workspace_catalog = None, domains = None, datasets = None, features = None, tables = None,
+                   relations = None, update_features = None, update_tables = None, update_domains = None,
+                   delete_features = None, delete_datasets = None, delete_domains = None,
+                   delete_all_domains = None, templates = None, arcade_cache = None) -> int:
+    """Validates the whole data model before the first geoprocessing tool is called. A symbol table of all
+    domains, datasets, feature classes, tables, relationship classes, fields and subtypes of the JSON file
+    and of the workspace is built in a first pass (see class ModelSymbols), all references are resolved
+    against it in a second pass: unknown domains, datasets, tables and fields, domains whose field type does
+    not match the field, unknown subtype codes, names used more than once, invalid field and geometry types
+    and the Arcade expressions of the attribute rules (see function validate_attribute_rules()). All problems
+    are logged with their position in the JSON file (e.g. "Features[2]").
+
+    Optional:
+        workspace_catalog -- The WorkspaceCatalog of the workspace (None: the workspace is empty,
+                             e.g. "DeleteAllExisting": "True").
+        domains, datasets, ... -- The sections of the JSON file (see function main()).
+        templates -- The section "Templates" of the JSON file (see function resolve_templates()).
+        arcade_cache -- An ArcadeCache with the parsed Arcade expressions of previous runs.
+
+    Return:
+        errors -- The number of errors found.
+    """
+    symbols = ModelSymbols(workspace_catalog)
+    if delete_all_domains == 'True':
+        symbols.domains = {}
+    errors = 0
+
+    def error(path, message):
+        nonlocal errors
+        errors += 1
+        logger.error(f'{path}: {message}')
+
+    def add_field(path, fields, dic_field, replace = ()):
+        # adds a field of the sections "Fields", "AddFields" and "AttributedFields"
+        field_name = dic_field.get('field_name')
+        if not field_name:
+            error(path, 'The parameter "field_name" of a field is missing')
+            return
+        field_type = str(dic_field.get('field_type', '')).upper()
+        if fields is not None:
+            if field_name.lower() in fields and field_name.lower() not in replace:
+                error(path, f'The field "{field_name}" is defined more than once')
+            fields[field_name.lower()] = field_type
+
+    def add_subtypes(item, dic_subtype):
+        # adds the subtypes of the sections "Subtypes" (of a new or an existing table)
+        if dic_subtype.get('field_name') and item['fields'] is not None:
+            item['fields'].setdefault(dic_subtype['field_name'].lower(), 'SHORT')
+        if dic_subtype.get('field_name') or item['subtypes'] is not None:
+            item['subtypes'] = dict(item['subtypes'] or {})
+            item['subtypes'].update({str(code): str(description) for code, description
+                                     in (dic_subtype.get('SubtypeValues') or {}).items()})
+
+    def add_implicit_fields(fields, dic):
+        # adds the fields that are added by the settings "GlobalID" and "EditorTracking"
+        if fields is None:
+            return
+        if dic.get('GlobalID') == 'True':
+            fields.setdefault('globalid', 'GLOBALID')
+        if dic.get('EditorTracking') == 'True':
+            for field_name in EDITOR_TRACKING_FIELDS.values():
+                fields.setdefault(field_name.lower(), 'DATE' if field_name.endswith('_DATE') else 'TEXT')
+
+    # first pass: the symbol table
+    for i, item in enumerate(domains or []):
+        path = f'Domains[{i}]'
+        dic = filter_dict(load_item(item))
+        if not dic.get('domain_name'):
+            error(path, 'The parameter "domain_name" is missing')
+            continue
+        previous = symbols.domains.get(dic['domain_name'].lower())
+        if previous and previous['path']:
+            error(path, f'The domain "{dic["domain_name"]}" is already defined in {previous["path"]}')
+        symbols.domains[dic['domain_name'].lower()] = {'name': dic['domain_name'], 'path': path,
+                                                       'field_type': str(dic.get('field_type', 'SHORT')).upper()}
+    class_sections = []
+    for i, item in enumerate(datasets or []):
+        path = f'Datasets[{i}]'
+        dic = filter_dict(load_item(item))
+        if not dic.get('out_name'):
+            error(path, 'The parameter "out_name" is missing')
+            continue
+        previous = symbols.add(dic['out_name'], 'FeatureDataset', path)
+        if previous:
+            error(path, f'The name "{dic["out_name"]}" is already used in {previous["path"]}')
+    template_names = set()
+    for i, item in enumerate(templates or []):
+        dic = filter_dict(load_item(item))
+        if not dic.get('name'):
+            error(f'Templates[{i}]', 'The parameter "name" is missing')
+        else:
+            template_names.add(dic['name'].lower())
+    for section, items, data_type in (('Features', features, 'FeatureClass'), ('Tables', tables, 'Table')):
+        for i, item in enumerate(items or []):
+            path = f'{section}[{i}]'
+            dic = filter_dict(load_item(item))
+            if dic.get('template_ref') and dic['template_ref'].lower() not in template_names:
+                error(path, f'The template "{dic["template_ref"]}" does not exist')
+            if not dic.get('out_name'):
+                error(path, 'The parameter "out_name" is missing')
+                continue
+            fields = None
+            if not dic.get('template'):
+                fields = {'objectid': 'OID'}
+                if data_type == 'FeatureClass':
+                    fields['shape'] = 'GEOMETRY'
+                    fields.update(SHAPE_FIELDS.get(str(dic.get('geometry_type')).upper(), {}))
+            previous = symbols.add(dic['out_name'], data_type, path, fields)
+            if previous:
+                error(path, f'The name "{dic["out_name"]}" is already used in {previous["path"]}')
+                continue
+            add_implicit_fields(fields, dic)
+            subtype_field = ()
+            if dic.get('Subtypes'):
+                add_subtypes(symbols.get(dic['out_name']), dic['Subtypes'])
+                # the subtype field may be defined in the section "Fields" (e.g. of type "LONG")
+                subtype_field = (str(dic['Subtypes'].get('field_name')).lower(),)
+            for dic_field in dic.get('Fields') or []:
+                add_field(path, fields, dic_field, subtype_field)
+    for i, item in enumerate(relations or []):
+        path = f'Relations[{i}]'
+        dic = filter_dict(load_item(item))
+        if not dic.get('out_relationship_class'):
+            error(path, 'The parameter "out_relationship_class" is missing')
+            continue
+        fields = {'rid': 'OID'}
+        for key in ('origin_foreign_key', 'destination_foreign_key'):
+            if dic.get(key):
+                fields[dic[key].lower()] = None
+        previous = symbols.add(dic['out_relationship_class'], 'RelationshipClass', path, fields)
+        if previous:
+            error(path, f'The name "{dic["out_relationship_class"]}" is already used in {previous["path"]}')
+            continue
+        for dic_field in dic.get('AttributedFields') or []:
+            add_field(path, fields, dic_field)
+    for section, items in (('UpdateFeatures', update_features), ('UpdateTables', update_tables)):
+        for i, item in enumerate(items or []):
+            dic = filter_dict(load_item(item))
+            table = symbols.get(dic.get('in_table') or '', ('FeatureClass', 'Table'))
+            if table is None:
+                # the error is logged in the second pass
+                continue
+            add_implicit_fields(table['fields'], dic)
+            if dic.get('Subtypes'):
+                add_subtypes(table, dic['Subtypes'])
+            for dic_field in dic.get('AddFields') or []:
+                if table['fields'] is not None and dic_field.get('field_name'):
+                    table['fields'][dic_field['field_name'].lower()] = str(dic_field.get('field_type', '')).upper()
+
+    # second pass: the references
+    def check_domain(path, item, field_name, domain_name, subtype_code = None):
+        # checks the domain of a field (and the subtypes for which the domain applies)
+        domain = symbols.domains.get(str(domain_name).lower())
+        if domain is None:
+            error(path, f'The domain "{domain_name}" of the field "{field_name}" does not exist')
+        elif item is not None and item['fields'] is not None:
+            field_type = item['fields'].get(str(field_name).lower())
+            if field_type and domain['field_type'] and field_type != domain['field_type']:
+                error(path, f'The domain "{domain_name}" of the type "{domain["field_type"]}" can not be assigned '
+                            f'to the field "{field_name}" of the type "{field_type}"')
+        if subtype_code is not None and item is not None:
+            for code in get_subtype_codes(subtype_code):
+                if not item['subtypes'] or code not in item['subtypes']:
+                    error(path, f'The subtype code "{code}" of the domain "{domain_name}" of the field '
+                                f'"{field_name}" does not exist in "{item["name"]}"')
+
+    def check_fields(path, item, fields):
+        # checks the types and the domains of the fields of the sections "Fields", "AddFields" and
+        # "AttributedFields"
+        for dic_field in fields or []:
+            field_name = dic_field.get('field_name')
+            field_type = str(dic_field.get('field_type', '')).upper()
+            if field_name and field_type not in FIELD_TYPES.values():
+                error(path, f'The field type "{dic_field.get("field_type")}" of the field "{field_name}" is not valid')
+            if dic_field.get('field_length') is not None and not str(dic_field['field_length']).isdigit():
+                error(path, f'The field length "{dic_field["field_length"]}" of the field "{field_name}" is not valid')
+            if dic_field.get('field_domain'):
+                check_domain(path, item, field_name, dic_field['field_domain'])
+            for dic_domain in dic_field.get('FieldDomainSubtype') or []:
+                check_domain(path, item, field_name, dic_domain.get('field_domain'),
+                             dic_domain.get('subtype_code', ''))
+
+    def check_field_exists(path, item, field_name, message = 'does not exist'):
+        if item is not None and not symbols.has_field(item, field_name):
+            error(path, f'The field "{field_name}" of "{item["name"]}" {message}')
+
+    def check_subtypes(path, item, dic_subtype):
+        for code in dic_subtype.get('SubtypeValues') or {}:
+            if not str(code).lstrip('-').isdigit():
+                error(path, f'The subtype code "{code}" is not an integer')
+        default = dic_subtype.get('DefaultSubtypeCode')
+        if default is not None and not symbols.has_subtype(item, default):
+            error(path, f'The default subtype code "{default}" does not exist in "{item["name"]}"')
+
+    for i, item in enumerate(domains or []):
+        path = f'Domains[{i}]'
+        dic = filter_dict(load_item(item))
+        field_type = str(dic.get('field_type', 'SHORT')).upper()
+        if field_type not in DOMAIN_FIELD_TYPES:
+            error(path, f'The field type "{dic.get("field_type")}" of the domain is not valid')
+        domain_type = dic.get('domain_type')
+        if domain_type == 'CODED':
+            if not isinstance(dic.get('DomainValues'), dict):
+                error(path, 'The parameter "DomainValues" of the coded value domain is missing')
+            elif field_type in ('SHORT', 'LONG', 'BIGINTEGER', 'FLOAT', 'DOUBLE'):
+                for code in dic['DomainValues']:
+                    try:
+                        float(code) if field_type in ('FLOAT', 'DOUBLE') else int(code)
+                    except ValueError:
+                        error(path, f'The code "{code}" does not match the field type "{field_type}"')
+        elif domain_type == 'RANGE':
+            domain_range = dic.get('DomainRange')
+            if not isinstance(domain_range, dict) or 'min_value' not in domain_range \
+                    or 'max_value' not in domain_range:
+                error(path, 'The parameters "min_value" and "max_value" of the range domain are missing')
+        else:
+            error(path, f'The domain type "{domain_type}" is not valid ("CODED" or "RANGE")')
+    for section, items, data_type in (('Features', features, 'FeatureClass'), ('Tables', tables, 'Table')):
+        for i, item in enumerate(items or []):
+            path = f'{section}[{i}]'
+            dic = filter_dict(load_item(item))
+            table = symbols.get(dic.get('out_name') or '')
+            if table is None or table['path'] != path:
+                # a missing or a duplicate name (the error is logged in the first pass)
+                continue
+            if data_type == 'FeatureClass':
+                if str(dic.get('geometry_type')).upper() not in GEOMETRY_TYPES and not dic.get('template'):
+                    error(path, f'The geometry type "{dic.get("geometry_type")}" is not valid')
+                if dic.get('out_dataset') and symbols.get(dic['out_dataset'], ('FeatureDataset',)) is None:
+                    error(path, f'The dataset "{dic["out_dataset"]}" does not exist')
+            if dic.get('Subtypes'):
+                check_subtypes(path, table, dic['Subtypes'])
+                subtype_type = (table['fields'] or {}).get(str(dic['Subtypes'].get('field_name')).lower())
+                if subtype_type not in (None, 'SHORT', 'LONG'):
+                    error(path, f'The subtype field "{dic["Subtypes"]["field_name"]}" must be of the type '
+                                f'"SHORT" or "LONG"')
+            check_fields(path, table, dic.get('Fields'))
+    for i, item in enumerate(relations or []):
+        path = f'Relations[{i}]'
+        dic = filter_dict(load_item(item))
+        ends = {}
+        for role in ('origin', 'destination'):
+            table_name = dic.get(f'{role}_table')
+            ends[role] = symbols.get(table_name or '', ('FeatureClass', 'Table'))
+            if ends[role] is None:
+                error(path, f'The {role} table "{table_name}" does not exist')
+        if dic.get('origin_primary_key'):
+            check_field_exists(path, ends['origin'], dic['origin_primary_key'])
+        attributed = bool(dic.get('AttributedFields')) or dic.get('cardinality') == 'MANY_TO_MANY'
+        if attributed and dic.get('destination_primary_key'):
+            check_field_exists(path, ends['destination'], dic['destination_primary_key'])
+        elif not attributed and dic.get('origin_foreign_key'):
+            check_field_exists(path, ends['destination'], dic['origin_foreign_key'])
+        relation = symbols.get(dic.get('out_relationship_class') or '')
+        if relation is not None and relation['path'] == path:
+            check_fields(path, relation, dic.get('AttributedFields'))
+        for dic_rule in dic.get('Rules') or []:
+            for role in ('origin', 'destination'):
+                subtype = dic_rule.get(f'{role}_subtype')
+                if subtype not in (None, '') and ends[role] is not None \
+                        and not symbols.has_subtype(ends[role], subtype):
+                    error(path, f'The subtype "{subtype}" does not exist in "{ends[role]["name"]}"')
+    model_rules = []
+    for section, items in (('Features', features), ('Tables', tables)):
+        for i, item in enumerate(items or []):
+            dic = filter_dict(load_item(item))
+            table = symbols.get(dic.get('out_name') or '')
+            if table is not None and table['path'] == f'{section}[{i}]' and dic.get('AttributeRules'):
+                model_rules.append((f'{section}[{i}]', dic['out_name'], dic['AttributeRules']))
+    for section, items in (('UpdateFeatures', update_features), ('UpdateTables', update_tables)):
+        for i, item in enumerate(items or []):
+            path = f'{section}[{i}]'
+            dic = filter_dict(load_item(item))
+            table = symbols.get(dic.get('in_table') or '', ('FeatureClass', 'Table'))
+            if table is None:
+                error(path, f'The table "{dic.get("in_table")}" to be updated does not exist')
+            else:
+                if dic.get('Subtypes'):
+                    check_subtypes(path, table, dic['Subtypes'])
+                check_fields(path, table, dic.get('AddFields'))
+                for dic_field in dic.get('AlterFields') or []:
+                    check_field_exists(path, table, dic_field.get('field'))
+                for dic_domain in dic.get('AssignDomains') or []:
+                    check_field_exists(path, table, dic_domain.get('field_name'))
+                    check_domain(path, table, dic_domain.get('field_name'), dic_domain.get('field_domain'),
+                                 dic_domain.get('subtype_code'))
+                for dic_domain in dic.get('RemoveDomains') or []:
+                    check_field_exists(path, table, dic_domain.get('field_name'))
+                for dic_field in dic.get('CalculateFields') or []:
+                    check_field_exists(path, table, dic_field.get('field'))
+                for field_name in dic.get('DeleteFields') or []:
+                    if not symbols.has_field(table, field_name):
+                        logger.warning(f'{path}: The field "{field_name}" to be deleted does not exist')
+            value = (dic.get('Backfill') or {}).get('ChunkSize')
+            if value is not None and not (str(value).isdigit() and int(value) > 0):
+                error(path, f'The value "{value}" of "Backfill/ChunkSize" is not a positive integer')
+            if dic.get('AttributeRules'):
+                model_rules.append((path, dic.get('in_table'), dic['AttributeRules']))
+    for path, table_name, rules in model_rules:
+        table = symbols.get(table_name, ('FeatureClass', 'Table'))
+        names = set()
+        for dic_rule in rules:
+            name = str(dic_rule.get('name'))
+            if name.lower() in names:
+                error(path, f'The attribute rule "{name}" is defined more than once')
+            names.add(name.lower())
+            if table is None:
+                continue
+            if dic_rule.get('field'):
+                check_field_exists(path, table, dic_rule['field'])
+            if dic_rule.get('subtype') not in (None, '') and not symbols.has_subtype(table, dic_rule['subtype']):
+                error(path, f'The subtype "{dic_rule["subtype"]}" of the attribute rule "{name}" does not exist '
+                            f'in "{table["name"]}"')
+    errors += validate_attribute_rules(symbols, model_rules, arcade_cache)
+    for i, item in enumerate(update_domains or []):
+        dic = filter_dict(load_item(item))
+        if str(dic.get('domain_name')).lower() not in symbols.domains:
+            error(f'UpdateDomains[{i}]', f'The domain "{dic.get("domain_name")}" to be updated does not exist')
+    for section, items, data_types in (('DeleteFeatures', delete_features, ('FeatureClass', 'Table')),
+                                       ('DeleteDatasets', delete_datasets, ('FeatureDataset',))):
+        for i, name in enumerate(items or []):
+            if symbols.get(str(name), data_types) is None:
+                logger.warning(f'{section}[{i}]: "{name}" to be deleted does not exist')
+    for i, name in enumerate(delete_domains or []):
+        if str(name).lower() not in symbols.domains:
+            logger.warning(f'DeleteDomains[{i}]: The domain "{name}" to be deleted does not exist')
+    return errors
+
+# field types of arcpy.Field -> field types of the function add_field()
+FIELD_TYPES = {"SmallInteger": "SHORT", "Integer": "LONG", "BigInteger": "BIGINTEGER", "Single": "FLOAT",
+               "Double": "DOUBLE", "String": "TEXT", "Date": "DATE", "DateOnly": "DATEONLY",
+               "TimeOnly": "TIMEONLY", "TimestampOffset": "TIMESTAMPOFFSET", "Blob": "BLOB",
+               "Raster": "RASTER", "Guid": "GUID"}
+# types of the attribute rules of arcpy.da.Describe -> types of the function add_attribute_rule()
+RULE_TYPES = {"esriARTCalculation": "CALCULATION", "esriARTConstraint": "CONSTRAINT",
+              "esriARTValidation": "VALIDATION"}
+
+def normalize_code(code) -> str:
+    """Returns a code of a domain or a subtype as string, so that e.g. 1, 1.0 and "1" are equal."""
+    try:
+        number = float(code)
+        return str(int(number)) if number.is_integer() else str(number)
+    except (TypeError, ValueError):
+        return str(code)
+
+def diff_rules(in_table, rules, schema) -> tuple:
+    """Compares attribute rules of the model with the existing attribute rules of a table.
+
+    Required:
+        in_table -- The name of the table or feature class.
+        rules -- A list of dictionaries with the parameters of the function add_attribute_rule().
+        schema -- The Describe dictionary of the existing table.
+
+    Return:
+        (add_rules, delete_rules) -- The rules to be added and the names of the rules to be deleted.
+    """
+    live_rules = {rule['name'].lower(): rule for rule in schema.get('attributeRules', [])}
+    add_rules, delete_rules = [], []
+    for dic_rule in rules or []:
+        live_rule = live_rules.get(dic_rule['name'].lower())
+        if live_rule is None:
+            add_rules.append(dic_rule)
+            continue
+        changed = (RULE_TYPES.get(live_rule.get('type'), live_rule.get('type')) != dic_rule['type'].upper()
+                   or (live_rule.get('scriptExpression') or '').strip() != dic_rule['script_expression'].strip())
+        if dic_rule.get('field'):
+            changed |= (live_rule.get('fieldName') or '').lower() != dic_rule['field'].lower()
+        if dic_rule.get('triggering_events'):
+            live_events = {event.replace('esriARTE', '').upper() for event in live_rule.get('triggeringEvents', [])}
+            changed |= live_events != {event.strip().upper() for event in dic_rule['triggering_events'].split(';')}
+        if dic_rule.get('description'):
+            changed |= (live_rule.get('description') or '') != dic_rule['description']
+        if changed:
+            logger.info(f'The attribute rule "{dic_rule["name"]}" of "{in_table}" has changed')
+            delete_rules.append(live_rule['name'])
+            add_rules.append(dic_rule)
+    return add_rules, delete_rules
+
+def diff_fields(in_table, fields, schema, subtypes) -> dict:
+    """Compares fields of the model with the existing fields of a table.
+
+    Required:
+        in_table -- The name of the table or feature class.
+        fields -- A list of dictionaries with the parameters of the function add_field() and
+                  optionally the key "FieldDomainSubtype".
+        schema -- The Describe dictionary of the existing table.
+        subtypes -- The ListSubtypes dictionary of the existing table or None.
+
+    Return:
+        update -- A dictionary with the keys "AddFields", "AlterFields", "AssignDomains" and
+                  "RemoveDomains" of the JSON section "UpdateFeatures" (only keys with changes).
+    """
+    live_fields = {field.name.lower(): field for field in schema.get('fields') or []}
+    live_subtypes = {normalize_code(code): subtype for code, subtype in (subtypes or {}).items()}
+    update = {}
+    for dic_field in fields or []:
+        dic_field = filter_dict(dic_field)
+        field_name = dic_field['field_name']
+        field = live_fields.get(field_name.lower())
+        if field is None:
+            update.setdefault('AddFields', []).append(dic_field)
+            continue
+        if FIELD_TYPES.get(field.type, field.type.upper()) != dic_field['field_type'].upper():
+            logger.warning(f'The type of the field "{field_name}" in "{in_table}" differs from the model '
+                           f'({field.type}) and can not be changed')
+        elif dic_field.get('field_length') and field.type == 'String' and \
+                int(dic_field['field_length']) != field.length:
+            logger.warning(f'The length of the field "{field_name}" in "{in_table}" differs from the model '
+                           f'({field.length}) and can not be changed')
+        if dic_field.get('field_alias') and dic_field['field_alias'] != field.aliasName:
+            update.setdefault('AlterFields', []).append({'field': field_name,
+                                                         'new_field_alias': dic_field['field_alias']})
+        if (dic_field.get('field_domain') or '').lower() != (field.domain or '').lower():
+            if dic_field.get('field_domain'):
+                update.setdefault('AssignDomains', []).append({'field_name': field_name,
+                                                               'field_domain': dic_field['field_domain']})
+            else:
+                update.setdefault('RemoveDomains', []).append({'field_name': field_name})
+        for dic_domain in dic_field.get('FieldDomainSubtype') or []:
+            for subtype_code in str(dic_domain['subtype_code']).split(';'):
+                subtype = live_subtypes.get(normalize_code(subtype_code.split(':')[0].strip()))
+                live_domain = None
+                if subtype:
+                    field_values = {name.lower(): value for name, value in subtype['FieldValues'].items()}
+                    live_domain = field_values.get(field_name.lower(), (None, None))[1]
+                if live_domain is None or live_domain.name.lower() != dic_domain['field_domain'].lower():
+                    update.setdefault('AssignDomains', []).append({'field_name': field_name,
+                                                                   'field_domain': dic_domain['field_domain'],
+                                                                   'subtype_code': subtype_code.strip()})
+    return update
+
+def diff_model(workspace, domains = None, datasets = None, features = None, tables = None, relations = None,
+               update_features = None, update_tables = None, update_domains = None, delete_features = None,
+               delete_datasets = None, delete_domains = None, delete_all_domains = "False") -> dict:
+    """Compares the data model with the existing schema of the workspace (domains, coded values,
+    datasets, feature classes, tables, fields, subtypes, attribute rules and relationship classes)
+    and returns only the changes. Existing objects are not recreated but updated with the sections
+    "UpdateFeatures", "UpdateTables" and "UpdateDomains". Objects of the workspace that are not
+    defined in the model are kept (a warning is logged), except coded values of a domain of the model.
+
+    Required:
+        workspace -- The path to the workspace (gdb, sde connection file).
+
+    Optional:
+        domains, datasets, ... -- The sections of the JSON file (see function main()).
+
+    Return:
+        changes -- A dictionary with the parameters of the function build_nodes() (without workspace,
+                   spatial_reference and overwrite) that contains only the changes.
+    """
+    # the schema is compared with the current state of the workspace
+    workspace_catalog = get_catalog(workspace)
+    workspace_catalog.load()
+    changes = {'domains': [], 'datasets': [], 'features': [], 'tables': [], 'relations': [],
+               'update_features': [], 'update_tables': [], 'update_domains': [], 'delete_features': [],
+               'delete_datasets': [], 'delete_domains': [], 'delete_all_domains': "False"}
+    # domains that are recreated have to be assigned again: key of the table -> AssignDomains
+    reassign = {}
+
+    # domains
+    for dic in domains or []:
+        dic_filtered = filter_dict(dic)
+        domain_name = dic_filtered['domain_name']
+        domain = workspace_catalog.domain_schema.get(domain_name.lower())
+        if domain is None:
+            changes['domains'].append(dic)
+            continue
+        domain_type = 'CODED' if domain.domainType == 'CodedValue' else 'RANGE'
+        if domain_type != dic_filtered.get('domain_type', 'CODED') or \
+                domain.type.upper() != dic_filtered.get('field_type', 'SHORT').upper():
+            logger.warning(f'The type of the domain "{domain_name}" has changed, the domain will be recreated')
+            changes['domains'].append(dic)
+            for table, field_name, subtype_code in workspace_catalog.get_domain_usages(domain_name):
+                dic_domain = {'field_name': field_name, 'field_domain': domain_name}
+                if subtype_code:
+                    dic_domain['subtype_code'] = subtype_code
+                reassign.setdefault(get_object_key(table), (table, []))[1].append(dic_domain)
+            continue
+        update = {}
+        if dic_filtered.get('domain_description') and dic_filtered['domain_description'] != domain.description:
+            update['domain_description'] = dic_filtered['domain_description']
+        if domain_type == 'CODED':
+            live_values = {normalize_code(code): str(value) for code, value in domain.codedValues.items()}
+            model_values = {normalize_code(code): str(value) for code, value in dic_filtered['DomainValues'].items()}
+            # codes with a new description are deleted and added again
+            delete_codes = [code for code in live_values if live_values[code] != model_values.get(code)]
+            add_codes = [{'code': code, 'code_description': value} for code, value in model_values.items()
+                         if live_values.get(code) != value]
+            if delete_codes:
+                update['DeleteCodedValues'] = delete_codes
+            if add_codes:
+                update['AddCodedValues'] = add_codes
+        else:
+            domain_range = dic_filtered['DomainRange']
+            if [float(value) for value in domain.range] != [float(domain_range['min_value']),
+                                                            float(domain_range['max_value'])]:
+                update['DomainRange'] = domain_range
+        if update:
+            update['domain_name'] = domain_name
+            changes['update_domains'].append(update)
+
+    # datasets
+    for dic in datasets or []:
+        if not workspace_catalog.exists(dic['out_name'], 'FeatureDataset'):
+            changes['datasets'].append(dic)
+
+    # names of the tables that are created in this run and of all attribute rules per table
+    created_tables = set()
+    model_rules = {}
+    for items in (features, tables):
+        for dic in items or []:
+            model_rules.setdefault(dic['out_name'].lower(), []).extend(dic.get('AttributeRules') or [])
+    for items in (update_features, update_tables):
+        for dic in items or []:
+            model_rules.setdefault(str(dic.get('in_table')).lower(), []).extend(dic.get('AttributeRules') or [])
+
+    # feature classes and tables
+    for section, update_section, items in (('features', 'update_features', features),
+                                           ('tables', 'update_tables', tables)):
+        for dic in items or []:
+            dic_filtered = filter_dict(dic)
+            name = dic_filtered['out_name']
+            key = get_object_key(name)
+            schema = workspace_catalog.object_schema.get(key)
+            if schema is None:
+                changes[section].append(dic)
+                created_tables.add(key)
+                continue
+            subtypes = workspace_catalog.subtype_schema.get(key)
+            update = diff_fields(name, dic_filtered.get('Fields'), schema, subtypes)
+            if key in reassign:
+                update.setdefault('AssignDomains', []).extend(reassign.pop(key)[1])
+            if dic_filtered.get('GlobalID') == 'True' and not schema.get('hasGlobalID'):
+                update['GlobalID'] = 'True'
+            if 'Subtypes' in dic_filtered:
+                dic_subtype = dic_filtered['Subtypes']
+                live_subtypes = {normalize_code(code): subtype for code, subtype in (subtypes or {}).items()}
+                if (schema.get('subtypeFieldName') or '').lower() != dic_subtype['field_name'].lower():
+                    update['Subtypes'] = dic_subtype
+                else:
+                    dic_update = {}
+                    missing = {code: value for code, value in dic_subtype['SubtypeValues'].items()
+                               if normalize_code(code) not in live_subtypes}
+                    if missing:
+                        dic_update['SubtypeValues'] = missing
+                    default_code = [code for code, subtype in live_subtypes.items() if subtype.get('Default')]
+                    if 'DefaultSubtypeCode' in dic_subtype and \
+                            [normalize_code(dic_subtype['DefaultSubtypeCode'])] != default_code:
+                        dic_update['DefaultSubtypeCode'] = dic_subtype['DefaultSubtypeCode']
+                    if dic_update:
+                        update['Subtypes'] = dic_update
+                    model_codes = {normalize_code(code) for code in dic_subtype['SubtypeValues']}
+                    for code, subtype in live_subtypes.items():
+                        if code not in model_codes:
+                            logger.warning(f'The subtype "{code}: {subtype["Name"]}" of "{name}" is not '
+                                           f'defined in the model and will not be removed')
+            if dic_filtered.get('EditorTracking') == 'True' and not schema.get('editorTrackingEnabled'):
+                update['EditorTracking'] = 'True'
+            if dic_filtered.get('EnableAttachments') == 'True' and \
+                    not workspace_catalog.exists(name + '__ATTACH'):
+                update['EnableAttachments'] = 'True'
+            add_rules, delete_rules = diff_rules(name, dic_filtered.get('AttributeRules'), schema)
+            if update:
+                update['in_table'] = name
+                changes[update_section].append(update)
+            if add_rules or delete_rules:
+                changes[update_section].append({'in_table': name, 'AttributeRules': add_rules,
+                                                'DeleteAttributeRules': delete_rules})
+            model_fields = {dic_field['field_name'].lower() for dic_field in dic_filtered.get('Fields', [])}
+            for dic_update in (update_features or []) + (update_tables or []):
+                if str(dic_update.get('in_table')).lower() == name.lower():
+                    model_fields |= {f['field_name'].lower() for f in dic_update.get('AddFields') or []}
+            if 'Subtypes' in dic_filtered:
+                model_fields.add(dic_filtered['Subtypes']['field_name'].lower())
+            if dic_filtered.get('EditorTracking') == 'True':
+                model_fields |= {'created_user', 'created_date', 'last_edited_user', 'last_edited_date'}
+            for field in schema.get('fields') or []:
+                if field.name.lower() not in model_fields and not field.required and \
+                        field.type not in ('OID', 'Geometry', 'GlobalID'):
+                    logger.warning(f'The field "{field.name}" of "{name}" is not defined in the model '
+                                   f'and will not be deleted')
+            rule_names = {dic_rule['name'].lower() for dic_rule in model_rules.get(name.lower(), [])}
+            for live_rule in schema.get('attributeRules', []):
+                if live_rule['name'].lower() not in rule_names:
+                    logger.warning(f'The attribute rule "{live_rule["name"]}" of "{name}" is not defined in '
+                                   f'the model and will not be deleted')
+
+    # tables with recreated domains that are not defined in the model
+    for table, dic_domains in reassign.values():
+        changes['update_tables'].append({'in_table': table, 'AssignDomains': dic_domains})
+
+    # relationship classes
+    for dic in relations or []:
+        dic_filtered = filter_dict(dic)
+        name = dic_filtered['out_relationship_class']
+        schema = workspace_catalog.object_schema.get(get_object_key(name))
+        if schema is None:
+            changes['relations'].append(dic)
+            continue
+        live = {'origin_table': get_object_key((schema.get('originClassNames') or [''])[0]),
+                'destination_table': get_object_key((schema.get('destinationClassNames') or [''])[0]),
+                'relationship_type': 'COMPOSITE' if schema.get('isComposite') else 'SIMPLE',
+                'cardinality': CARDINALITIES.get(schema.get('cardinality'), schema.get('cardinality')),
+                'forward_label': schema.get('forwardPathLabel'),
+                'backward_label': schema.get('backwardPathLabel')}
+        model = {'origin_table': get_object_key(dic_filtered['origin_table']),
+                 'destination_table': get_object_key(dic_filtered['destination_table']),
+                 'relationship_type': dic_filtered.get('relationship_type', 'SIMPLE').upper(),
+                 'cardinality': dic_filtered.get('cardinality', 'ONE_TO_ONE').upper(),
+                 'forward_label': dic_filtered.get('forward_label', live['forward_label']),
+                 'backward_label': dic_filtered.get('backward_label', live['backward_label'])}
+        if live != model:
+            if live['cardinality'] == 'MANY_TO_MANY' or schema.get('isAttributed'):
+                logger.warning(f'The relationship class "{name}" differs from the model and will not be '
+                               f'recreated, because it stores the relationships in its own table')
+            else:
+                logger.info(f'The relationship class "{name}" differs from the model and will be recreated')
+                dic_relation = dict(dic)
+                dic_relation['slu_overwrite'] = True
+                changes['relations'].append(dic_relation)
+                continue
+        update = diff_fields(name, dic_filtered.get('AttributedFields'), schema, None)
+        if update:
+            update['in_table'] = name
+            changes['update_tables'].append(update)
+
+    # updates of existing tables
+    for section, items in (('update_features', update_features), ('update_tables', update_tables)):
+        for dic in items or []:
+            dic_filtered = filter_dict(dic)
+            name = dic_filtered['in_table']
+            key = get_object_key(name)
+            schema = workspace_catalog.object_schema.get(key)
+            if schema is None or key in created_tables:
+                changes[section].append(dic)
+                continue
+            update = diff_fields(name, dic_filtered.get('AddFields'), schema,
+                                 workspace_catalog.subtype_schema.get(key))
+            live_fields = {field.name.lower() for field in schema.get('fields') or []}
+            if 'DeleteFields' in dic_filtered:
+                delete_fields = dic_filtered['DeleteFields']
+                if not isinstance(delete_fields, list):
+                    delete_fields = str(delete_fields).split(';')
+                delete_fields = [field for field in delete_fields if field.lower() in live_fields]
+                if delete_fields:
+                    update['DeleteFields'] = delete_fields
+            # fields are only calculated if they are added
+            calculate_fields = [dic_field for dic_field in dic_filtered.get('CalculateFields', [])
+                                if dic_field['field'].lower() not in live_fields]
+            if calculate_fields:
+                update['CalculateFields'] = calculate_fields
+                if 'Backfill' in dic_filtered:
+                    update['Backfill'] = dic_filtered['Backfill']
+            for update_key in ('AlterFields', 'AssignDomains', 'RemoveDomains', 'Subtypes', 'RemoveSubtypes',
+                               'GlobalID', 'EditorTracking', 'EnableAttachments'):
+                if update_key in dic_filtered:
+                    update.setdefault(update_key, dic_filtered[update_key])
+            add_rules, delete_rules = diff_rules(name, dic_filtered.get('AttributeRules'), schema)
+            if update:
+                update['in_table'] = name
+                changes[section].append(update)
+            if add_rules or delete_rules:
+                changes[section].append({'in_table': name, 'AttributeRules': add_rules,
+                                         'DeleteAttributeRules': delete_rules})
+
+    # updates of existing domains
+    for dic in update_domains or []:
+        domain = workspace_catalog.domain_schema.get(dic['domain_name'].lower())
+        if domain is None or domain.domainType != 'CodedValue':
+            changes['update_domains'].append(dic)
+            continue
+        live_values = {normalize_code(code): str(value) for code, value in domain.codedValues.items()}
+        if dic.get('update_option', 'APPEND').upper() == 'REPLACE':
+            # the codes are replaced if they differ from the existing codes
+            model_values = {normalize_code(dic_code['code']): str(dic_code['code_description'])
+                            for dic_code in dic.get('AddCodedValues', [])}
+            if model_values != live_values:
+                changes['update_domains'].append(dic)
+            continue
+        add_codes = [dic_code for dic_code in dic.get('AddCodedValues', [])
+                     if live_values.get(normalize_code(dic_code['code'])) != str(dic_code['code_description'])]
+        if add_codes:
+            changes['update_domains'].append({'domain_name': dic['domain_name'], 'AddCodedValues': add_codes})
+
+    # deletions of existing objects
+    changes['delete_features'] = [fc for fc in delete_features or [] if workspace_catalog.exists(fc)]
+    changes['delete_datasets'] = [ds for ds in delete_datasets or [] if workspace_catalog.exists(ds)]
+    changes['delete_domains'] = [dm for dm in delete_domains or [] if workspace_catalog.domain_exists(dm)]
+    if delete_all_domains == "True" and workspace_catalog.domains:
+        changes['delete_all_domains'] = "True"
+
+    return changes
+
+# values of arcpy.da.Describe -> parameters of the functions create_domain() and create_relationship_class()
+SPLIT_POLICIES = {"DefaultValue": "DEFAULT", "Duplicate": "DUPLICATE", "GeometryRatio": "GEOMETRY_RATIO"}
+MERGE_POLICIES = {"DefaultValue": "DEFAULT", "SumValues": "SUM_VALUES", "AreaWeighted": "AREA_WEIGHTED"}
+MESSAGE_DIRECTIONS = {"None": "NONE", "Forward": "FORWARD", "Backward": "BACK", "Both": "BOTH"}
+CARDINALITIES = {"OneToOne": "ONE_TO_ONE", "OneToMany": "ONE_TO_MANY", "ManyToMany": "MANY_TO_MANY"}
+EDITOR_TRACKING_FIELDS = {"creatorFieldName": "CREATED_USER", "createdAtFieldName": "CREATED_DATE",
+                          "editorFieldName": "LAST_EDITED_USER", "editedAtFieldName": "LAST_EDITED_DATE"}
+
+def export_model(workspace, log_folder = "Logs", log_version = "v01") -> dict:
+    """Exports the schema of an existing workspace into the format of the JSON file (sections "Domains",
+    "Datasets", "Features", "Tables" and "Relations" including subtypes, fields, domains of subtypes,
+    attribute rules, attributed fields and rules of relationship classes). The workspace is read with
+    one call of ListDomains and Describe (see WorkspaceCatalog). Properties that can not be created
+    with the JSON file (e.g. a subtype field that is not of type "SHORT") are logged as warnings.
+
+    Required:
+        workspace -- The path to the workspace (gdb, sde connection file).
+
+    Optional:
+        log_folder -- The value of the parameter "LogFolder" of the JSON file.
+        log_version -- The value of the parameter "LogVersion" of the JSON file.
+
+    Return:
+        model -- A dictionary with the parameters of the JSON file.
+    """
+    workspace_catalog = get_catalog(workspace)
+    workspace_catalog.load()
+    model = {'LogFolder': log_folder, 'LogVersion': log_version,
+             'Conpath': os.path.dirname(os.path.normpath(workspace)),
+             'DBName': os.path.basename(os.path.normpath(workspace)),
+             'Overwrite': "True", 'DeleteAllExisting': "False"}
+    spatial_references = [schema['spatialReference'] for schema in workspace_catalog.object_schema.values()
+                          if schema.get('spatialReference') is not None]
+    if spatial_references:
+        model['SpatialReferenceName'] = getattr(spatial_references[0], 'name', str(spatial_references[0]))
+
+    # domains
+    domains = []
+    for domain in workspace_catalog.domain_schema.values():
+        dic = {'domain_name': domain.name, 'domain_description': domain.description,
+               'field_type': domain.type.upper(),
+               'domain_type': 'CODED' if domain.domainType == 'CodedValue' else 'RANGE'}
+        if SPLIT_POLICIES.get(domain.splitPolicy, 'DEFAULT') != 'DEFAULT':
+            dic['split_policy'] = SPLIT_POLICIES[domain.splitPolicy]
+        if MERGE_POLICIES.get(domain.mergePolicy, 'DEFAULT') != 'DEFAULT':
+            dic['merge_policy'] = MERGE_POLICIES[domain.mergePolicy]
+        if dic['domain_type'] == 'CODED':
+            # the codes of text domains are kept as they are (e.g. "01")
+            convert = str if domain.type.upper() == 'TEXT' else normalize_code
+            dic['DomainValues'] = {convert(code): str(value) for code, value in domain.codedValues.items()}
+        else:
+            dic['DomainRange'] = {'min_value': normalize_code(domain.range[0]),
+                                  'max_value': normalize_code(domain.range[1])}
+        domains.append(dic)
+    model['Domains'] = domains
+
+    # datasets
+    model['Datasets'] = [{'out_name': name} for name in workspace_catalog.list('FeatureDataset')]
+
+    # feature classes and tables
+    model['Features'] = []
+    model['Tables'] = []
+    for key, schema in workspace_catalog.object_schema.items():
+        data_type = schema['dataType']
+        if data_type not in ('FeatureClass', 'Table') or key.endswith('__attach'):
+            continue
+        name = workspace_catalog.objects[key]['name']
+        dic = {'out_name': name}
+        if data_type == 'FeatureClass':
+            dic['geometry_type'] = str(schema.get('shapeType', '')).upper()
+            dataset = workspace_catalog.objects[key]['dataset']
+            if dataset:
+                dic['out_dataset'] = dataset
+            for parameter, flag in (('has_z', 'hasZ'), ('has_m', 'hasM')):
+                if schema.get(flag):
+                    dic[parameter] = 'ENABLED'
+            spatial_reference = schema.get('spatialReference')
+            if spatial_reference is not None and 'SpatialReferenceName' in model and \
+                    getattr(spatial_reference, 'name', str(spatial_reference)) != model['SpatialReferenceName']:
+                logger.warning(f'The spatial reference of "{name}" differs from "{model["SpatialReferenceName"]}" '
+                               f'and is not exported')
+        if schema.get('hasGlobalID'):
+            dic['GlobalID'] = "True"
+
+        # subtypes
+        subtypes = workspace_catalog.subtype_schema.get(key) or {}
+        subtype_field = schema.get('subtypeFieldName') or ''
+        fields = schema.get('fields') or []
+        if subtype_field:
+            field = next((field for field in fields if field.name.lower() == subtype_field.lower()), None)
+            if field is not None and field.type != 'SmallInteger':
+                logger.warning(f'The subtype field "{subtype_field}" of "{name}" is of type "{field.type}" '
+                               f'and is exported as subtype field of type "SHORT"')
+            dic['Subtypes'] = {'field_name': subtype_field,
+                               'SubtypeValues': {normalize_code(code): subtype['Name']
+                                                 for code, subtype in subtypes.items()}}
+            default_code = [code for code, subtype in subtypes.items() if subtype.get('Default')]
+            if default_code:
+                dic['Subtypes']['DefaultSubtypeCode'] = normalize_code(default_code[0])
+
+        # fields (without the fields that are created by the parameters "GlobalID", "Subtypes" and "EditorTracking")
+        excluded = {subtype_field.lower()}
+        if schema.get('editorTrackingEnabled'):
+            dic['EditorTracking'] = "True"
+            for property_name, default in EDITOR_TRACKING_FIELDS.items():
+                field_name = schema.get(property_name) or default
+                if field_name.lower() != default.lower():
+                    logger.warning(f'The editor tracking field "{field_name}" of "{name}" is exported as "{default}"')
+                excluded.add(field_name.lower())
+        dic_fields = []
+        for field in fields:
+            if field.type in ('OID', 'Geometry', 'GlobalID') or field.required or field.name.lower() in excluded:
+                continue
+            dic_field = export_field(field)
+            field_domains = {}
+            for code, subtype in subtypes.items():
+                field_values = {field_name.lower(): value for field_name, value in subtype['FieldValues'].items()}
+                domain = field_values.get(field.name.lower(), (None, None))[1]
+                if domain is not None and domain.name.lower() != field.domain.lower():
+                    field_domains.setdefault(domain.name, []).append(f'{normalize_code(code)}: {subtype["Name"]}')
+            if field_domains:
+                dic_field['FieldDomainSubtype'] = [{'field_domain': domain_name, 'subtype_code': ';'.join(codes)}
+                                                   for domain_name, codes in field_domains.items()]
+            dic_fields.append(dic_field)
+        if dic_fields:
+            dic['Fields'] = dic_fields
+        if workspace_catalog.exists(name + '__ATTACH'):
+            dic['EnableAttachments'] = "True"
+
+        # attribute rules
+        subtype_names = {normalize_code(code): subtype['Name'] for code, subtype in subtypes.items()}
+        dic_rules = []
+        for rule in schema.get('attributeRules') or []:
+            dic_rule = {'name': rule['name'], 'type': RULE_TYPES.get(rule.get('type'), rule.get('type')),
+                        'script_expression': rule.get('scriptExpression') or ''}
+            if rule.get('fieldName'):
+                dic_rule['field'] = rule['fieldName']
+            events = [event.replace('esriARTE', '').upper() for event in rule.get('triggeringEvents') or []]
+            if events:
+                dic_rule['triggering_events'] = ';'.join(events)
+            if rule.get('subtypeCode') not in (None, '', -1):
+                dic_rule['subtype'] = subtype_names.get(normalize_code(rule['subtypeCode']),
+                                                        str(rule['subtypeCode']))
+            if rule.get('description'):
+                dic_rule['description'] = rule['description']
+            if rule.get('errorNumber') not in (None, ''):
+                dic_rule['error_number'] = str(rule['errorNumber'])
+            if rule.get('errorMessage'):
+                dic_rule['error_message'] = rule['errorMessage']
+            if rule.get('isEditable') is False:
+                dic_rule['is_editable'] = 'NONEDITABLE'
+            dic_rules.append(dic_rule)
+        if dic_rules:
+            dic['AttributeRules'] = dic_rules
+        model['Features' if data_type == 'FeatureClass' else 'Tables'].append(dic)
+
+    # relationship classes (without the relationship classes of the attachments)
+    relations = []
+    for key, schema in workspace_catalog.object_schema.items():
+        if schema['dataType'] != 'RelationshipClass' or key.endswith('__attachrel'):
+            continue
+        origin = (schema.get('originClassNames') or [''])[0].split('.')[-1]
+        destination = (schema.get('destinationClassNames') or [''])[0].split('.')[-1]
+        dic = {'origin_table': origin, 'destination_table': destination,
+               'out_relationship_class': workspace_catalog.objects[key]['name'],
+               'relationship_type': 'COMPOSITE' if schema.get('isComposite') else 'SIMPLE',
+               'forward_label': schema.get('forwardPathLabel') or '',
+               'backward_label': schema.get('backwardPathLabel') or '',
+               'message_direction': MESSAGE_DIRECTIONS.get(str(schema.get('notification')),
+                                                           str(schema.get('notification') or 'NONE').upper()),
+               'cardinality': CARDINALITIES.get(schema.get('cardinality'), str(schema.get('cardinality')).upper())}
+        key_fields = set()
+        roles = {'OriginPrimary': 'origin_primary_key', 'OriginForeign': 'origin_foreign_key',
+                 'DestinationPrimary': 'destination_primary_key', 'DestinationForeign': 'destination_foreign_key'}
+        for field_name, role, *_ in list(schema.get('originClassKeys') or []) + \
+                list(schema.get('destinationClassKeys') or []):
+            if role in roles:
+                dic[roles[role]] = field_name
+                key_fields.add(field_name.lower())
+        if schema.get('isAttributed'):
+            dic['AttributedFields'] = [export_field(field) for field in schema.get('fields') or []
+                                       if field.type not in ('OID', 'GlobalID') and not field.required
+                                       and field.name.lower() not in key_fields]
+        subtype_names = {get_object_key(table): {normalize_code(code): subtype['Name'] for code, subtype in
+                                                 (workspace_catalog.subtype_schema.get(get_object_key(table)) or {})
+                                                 .items()}
+                         for table in (origin, destination)}
+        dic_rules = []
+        for rule in schema.get('relationshipRules') or []:
+            value = rule.get if isinstance(rule, dict) else lambda name: getattr(rule, name, None)
+            dic_rule = {}
+            for prefix, table in (('origin', origin), ('destination', destination)):
+                code = value(f'{prefix}SubtypeCode')
+                if code not in (None, '', -1):
+                    dic_rule[f'{prefix}_subtype'] = subtype_names[get_object_key(table)].get(normalize_code(code),
+                                                                                             str(code))
+                for parameter, property_name in (('minimum', 'MinimumCardinality'), ('maximum', 'MaximumCardinality')):
+                    cardinality = value(prefix + property_name)
+                    if cardinality not in (None, ''):
+                        dic_rule[f'{prefix}_{parameter}'] = str(cardinality)
+            dic_rules.append(dic_rule)
+        if dic_rules:
+            dic['Rules'] = dic_rules
+        relations.append(dic)
+    model['Relations'] = relations
+
+    return model
+
+def export_field(field) -> dict:
+    """Returns the parameters of the function add_field() for an existing field.
+
+    Required:
+        field -- The field (arcpy.Field).
+    """
+    dic_field = {'field_name': field.name, 'field_type': FIELD_TYPES.get(field.type, field.type.upper())}
+    if field.type == 'String':
+        dic_field['field_length'] = str(field.length)
+    if field.aliasName and field.aliasName != field.name:
+        dic_field['field_alias'] = field.aliasName
+    if not field.isNullable:
+        dic_field['field_is_nullable'] = 'NON_NULLABLE'
+    if field.domain:
+        dic_field['field_domain'] = field.domain
+    return dic_field
+
+class ModelNode:
+    """An object of the data model (e.g. a domain or a feature class) that is processed as one unit
+    by the function run_nodes().
+
+    Required:
+        node_id -- The path of the object in the JSON file (e.g. "Features[2]").
+        function -- The function that processes the object.
+        kwargs -- A dictionary with the parameters of the function.
+
+    Optional:
+        dependencies -- The IDs of the nodes that have to be processed before this node.
+        catalog_phase -- The phase of the node (0: creations, then each group of deletions and the updates).
+                         The workspace catalog of a worker process is reloaded once when the worker
+                         processes the first node of a later phase, because all nodes of the previous
+                         phases have been processed by the other workers.
+        cache_key -- The key of the object in the ModelCache (e.g. "class:location"), None if the
+                     node is not cached.
+        references -- The keys of the objects the node depends on (e.g. the domains of the fields).
+        invalidates -- The keys of the objects that are removed from the cache by the node (deletions).
+        refresh -- The names of the objects that are read again from the workspace before the node is
+                   processed in a worker process, because they may have been changed by other workers
+                   in the same phase (see WorkspaceCatalog.refresh()).
+    """
+    def __init__(self, node_id, function, kwargs, dependencies = None, catalog_phase = 0, cache_key = None,
+                 references = None, invalidates = None, refresh = None):
+        self.node_id = node_id
+        self.function = function
+        self.kwargs = kwargs
+        self.dependencies = list(dependencies or [])
+        self.catalog_phase = catalog_phase
+        self.refresh = list(refresh or [])
+        self.cache_key = cache_key
+        self.references = list(references or [])
+        self.invalidates = list(invalidates or [])
+
+    def __repr__(self):
+        return f'ModelNode({self.node_id!r})'
+
+def build_nodes(workspace, spatial_reference, overwrite, domains = None, datasets = None, features = None,
+                tables = None, relations = None, update_features = None, update_tables = None,
+                update_domains = None, delete_features = None, delete_datasets = None, delete_domains = None,
+                delete_all_domains = "False", bulk_threshold = None) -> list:
+    """Converts the data model into a list of nodes with their dependencies: domains before the fields
+    that use them, datasets before their feature classes, feature classes and tables before the
+    relationship classes that reference them. The attribute rules of each table are added with one
+    import after all feature classes, tables and relationship classes. The deletions are processed
+    after all objects have been created and the updates after the deletions.
+
+    Required:
+        workspace -- The path to the workspace (gdb, sde connection file).
+        spatial_reference -- The spatial reference of the datasets and feature classes.
+        overwrite -- If existing objects are to be overwritten (True or False).
+
+    Optional:
+        domains, datasets, ... -- The sections of the JSON file (see function main()).
+        bulk_threshold -- The number of codes from which on the codes of a domain are loaded with
+                          a single call (see function add_coded_value_to_domain()).
+
+    Return:
+        nodes -- A list of ModelNode objects in the order of the JSON file.
+    """
+    nodes = []
+    # name of the object in lower case -> ID of the node
+    domain_nodes, dataset_nodes, class_nodes, relation_nodes = {}, {}, {}, {}
+    # name of the table in lower case -> (ID of the node, dictionary of the table) of the attribute rules
+    rule_nodes = {}
+    # ID of the node -> function to determine the dependencies when all objects are known
+    resolve = {}
+    # (section, name of the template in lower case) -> (ID of the node, dictionary) of the first feature class
+    # or table based on the template (the prototype of the others)
+    prototypes = {}
+
+    def depends_on(lookup, names):
+        return [lookup[name.lower()] for name in names if name and name.lower() in lookup]
+
+    def keys(kind, names):
+        # keys of the objects in the ModelCache
+        return [f'{kind}:{get_object_key(name)}' for name in names if name]
+
+    def get_clone_fields(prototype, dic):
+        # the fields of the prototype are copied if the feature class or table has the same fields (and
+        # possibly additional ones), the same subtype field and the same editor tracking fields
+        fields = {str(dic_field.get('field_name')).lower(): dic_field for dic_field in dic.get('Fields') or []}
+        if any(fields.get(str(dic_field.get('field_name')).lower()) != dic_field
+               for dic_field in prototype.get('Fields') or []) \
+                or (prototype.get('Subtypes') or {}).get('field_name') != (dic.get('Subtypes') or {}).get('field_name') \
+                or prototype.get('EditorTracking') != dic.get('EditorTracking'):
+            return None
+        return [dic_field['field_name'] for dic_field in prototype.get('Fields') or []]
+
+    def register(lookup, name, node):
+        # an object that is defined twice is processed in the order of the JSON file
+        if name.lower() in lookup:
+            node.dependencies.append(lookup[name.lower()])
+        lookup[name.lower()] = node.node_id
+
+    # domains
+    for i, dic in enumerate(domains or []):
+        node = ModelNode(f'Domains[{i}]', process_domain, {'in_workspace': workspace, 'dic': dic,
+                                                           'bulk_threshold': bulk_threshold},
+                         cache_key = keys('domain', [dic['domain_name']])[0])
+        register(domain_nodes, dic['domain_name'], node)
+        nodes.append(node)
+
+    # datasets
+    for i, dic in enumerate(datasets or []):
+        node = ModelNode(f'Datasets[{i}]', process_dataset,
+                         {'in_workspace': workspace, 'dic': dic, 'spatial_reference': spatial_reference,
+                          'overwrite': overwrite}, cache_key = keys('dataset', [dic['out_name']])[0])
+        register(dataset_nodes, dic['out_name'], node)
+        nodes.append(node)
+
+    # feature classes and tables including their attribute rules
+    for section, dic_type, items in (('Features', 'feature', features), ('Tables', 'table', tables)):
+        for i, dic in enumerate(items or []):
+            dic_filtered = filter_dict(dic)
+            kwargs = {'in_workspace': workspace, 'dic': dic, 'dic_type': dic_type}
+            if dic_type == 'feature':
+                kwargs.update({'spatial_reference': spatial_reference, 'overwrite': overwrite})
+            # the feature classes and tables based on the same template are created as copies of the first one
+            prototype_id = None
+            template_ref = str(dic_filtered.get('template_ref', '')).lower()
+            if template_ref and not dic_filtered.get('template'):
+                prototype_id, prototype = prototypes.setdefault((section, template_ref),
+                                                                (f'{section}[{i}]', dic_filtered))
+                clone_fields = get_clone_fields(prototype, dic_filtered)
+                if prototype_id == f'{section}[{i}]' or clone_fields is None:
+                    prototype_id = None
+                else:
+                    kwargs.update({'clone_of': os.path.join(workspace, prototype.get('out_dataset', ''),
+                                                            prototype['out_name']),
+                                   'clone_fields': clone_fields})
+            node = ModelNode(f'{section}[{i}]', process_class, kwargs, [prototype_id] if prototype_id else [],
+                             cache_key = keys('class', [dic_filtered['out_name']])[0],
+                             references = keys('dataset', [dic_filtered.get('out_dataset')])
+                             + keys('domain', get_field_domains(dic_filtered.get('Fields')))
+                             + keys('class', [dic_filtered.get('template')]
+                                    + ([prototype['out_name']] if prototype_id else [])))
+            resolve[node.node_id] = lambda node = node, dic = dic_filtered: (
+                depends_on(dataset_nodes, [dic.get('out_dataset')])
+                + depends_on(domain_nodes, get_field_domains(dic.get('Fields')))
+                + depends_on(class_nodes, [dic.get('template')]))
+            register(class_nodes, dic_filtered['out_name'], node)
+            nodes.append(node)
+            if 'AttributeRules' in dic_filtered:
+                # a table that is defined again is recreated, so only the rules of its last definition are added
+                rule_nodes[dic_filtered['out_name'].lower()] = (f'{section}[{i}]/AttributeRules', dic_filtered)
+
+    # relationship classes
+    for i, item in enumerate(relations or []):
+        # the item is kept in the node as it is, and read once here
+        dic = load_item(item)
+        node = ModelNode(f'Relations[{i}]', process_relation, {'dic': item, 'overwrite': overwrite},
+                         depends_on(class_nodes, [dic.get('origin_table'), dic.get('destination_table')])
+                         + depends_on(domain_nodes, get_field_domains(dic.get('AttributedFields'))),
+                         cache_key = keys('relation', [dic['out_relationship_class']])[0],
+                         references = keys('class', [dic.get('origin_table'), dic.get('destination_table')])
+                         + keys('domain', get_field_domains(dic.get('AttributedFields'))))
+        register(relation_nodes, dic['out_relationship_class'], node)
+        nodes.append(node)
+
+    # attribute rules (one import per table after all feature classes, tables and relationship classes
+    # have been created, so that the rules can reference any of them)
+    created = [node.node_id for node in nodes if node.function in (process_class, process_relation)]
+    for node_id, dic in rule_nodes.values():
+        rule_references = get_rule_references(dic['AttributeRules'])
+        nodes.append(ModelNode(node_id, process_attribute_rules,
+                               {'in_table': dic['out_name'], 'rules': dic['AttributeRules'],
+                                'overwrite': overwrite}, created,
+                               cache_key = keys('rules', [dic['out_name']])[0],
+                               references = keys('class', [dic['out_name']] + rule_references[0])
+                               + keys('relation', rule_references[1])))
+
+    for node in nodes:
+        if node.node_id in resolve:
+            node.dependencies += [d for d in resolve[node.node_id]() if d != node.node_id]
+
+    # deletions (each group after the previous one)
+    barrier = [node.node_id for node in nodes]
+    delete_groups = [
+        [ModelNode(f'DeleteFeatures[{i}]', delete_item, {'in_data': fc, 'data_type': 'FeatureClass'},
+                   invalidates = keys('class', [fc])) for i, fc in enumerate(delete_features or [])],
+        [ModelNode(f'DeleteDatasets[{i}]', delete_item, {'in_data': ds, 'data_type': 'FeatureDataset'},
+                   invalidates = keys('dataset', [ds])) for i, ds in enumerate(delete_datasets or [])],
+        [ModelNode(f'DeleteDomains[{i}]', delete_domain, {'in_workspace': workspace, 'domain_name': dm},
+                   invalidates = keys('domain', [dm])) for i, dm in enumerate(delete_domains or [])],
+        [ModelNode('DeleteAllDomains', delete_all_domain, {'in_workspace': workspace}, invalidates = ['domain:*'])]
+        if delete_all_domains == "True" else [],
+    ]
+    phase = 0
+    for group in delete_groups:
+        if group:
+            phase += 1
+        for node in group:
+            node.dependencies = list(barrier)
+            node.catalog_phase = phase
+            nodes.append(node)
+        if group:
+            barrier = [node.node_id for node in group]
+
+    # updates (updates of the same table or domain in the order of the JSON file)
+    last_update = {}
+    update_groups = [('UpdateFeatures', process_update, 'in_table', update_features),
+                     ('UpdateTables', process_update, 'in_table', update_tables),
+                     ('UpdateDomains', process_update_domain, 'domain_name', update_domains)]
+    for section, function, name_key, items in update_groups:
+        for i, item in enumerate(items or []):
+            dic = load_item(item)
+            kwargs = {'dic': item} if function is process_update else {'in_workspace': workspace, 'dic': item,
+                                                                        'bulk_threshold': bulk_threshold}
+            # an update is cached by its content, so that every update of a table is cached separately
+            if function is process_update:
+                references = keys('class', [dic.get('in_table')]) \
+                             + keys('domain', get_field_domains(dic.get('AddFields'))
+                                    + get_field_domains(dic.get('AssignDomains')))
+            else:
+                references = keys('domain', [dic.get('domain_name')])
+            cache_key = f'{"class" if function is process_update else "domain"}:' \
+                        f'{get_object_key(dic.get(name_key))}:update:{operation_hash(function, kwargs)[:16]}'
+            node = ModelNode(f'{section}[{i}]', function, kwargs, barrier, phase + 1, cache_key, references)
+            key = (function, str(dic.get(name_key)).lower())
+            if key in last_update:
+                node.dependencies.append(last_update[key])
+                # the table may have been changed by the previous update in another worker process
+                if function is process_update:
+                    node.refresh = [dic.get('in_table')]
+            last_update[key] = node.node_id
+            nodes.append(node)
+
+    return nodes
+
+def execute_node(function, kwargs, catalog_phase = 0, refresh = ()) -> list:
+    """Processes a node (see function run_nodes()).
+
+    Required:
+        function -- The function that processes the object.
+        kwargs -- A dictionary with the parameters of the function.
+
+    Optional:
+        catalog_phase -- The phase of the node: the workspace catalog is reloaded if it has been loaded
+                         in an earlier phase (see class ModelNode).
+        refresh -- The names of the objects that are read again from the workspace beforehand.
+
+    Return:
+        records -- The operations measured while processing the node (see function timed()).
+        errors -- The number of errors logged while processing the node.
+    """
+    global loaded_catalog_phase
+    if catalog is not None and catalog_phase > loaded_catalog_phase:
+        catalog.load()
+        loaded_catalog_phase = catalog_phase
+    elif catalog is not None:
+        for in_data in refresh:
+            catalog.refresh(in_data)
+    start = len(profile)
+    errors = error_counter.count
+    function(**kwargs)
+    return profile[start:], error_counter.count - errors
+
+def init_worker(workspace, overwrite, environment_settings, checkpoint_file, log_queue) -> None:
+    """Initialises a worker process with its own arcpy session: the workspace, the environment
+    settings, the checkpoints of the backfills and the logging to the main process.
+
+    Required:
+        workspace -- The path to the workspace (gdb, sde connection file).
+        overwrite -- The ArcGIS environment setting "overwrite" (True or False).
+        environment_settings -- A dictionary with ArcGIS environment settings or None.
+        checkpoint_file -- The checkpoint file of the backfills (see class BackfillCheckpoint) or None.
+        log_queue -- The queue to which the log records are sent.
+    """
+    global logger, backfill_file, loaded_catalog_phase
+    logger = logging.getLogger('myapp')
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.addHandler(error_counter)
+    logger.setLevel(logging.INFO)
+    set_environment(workspace, overwrite, environment_settings)
+    backfill_file = checkpoint_file
+    loaded_catalog_phase = 0
+
+def run_nodes(nodes, workers = 1, initargs = None, journal = None, cache = None, stop_on_error = False) -> bool:
+    """Processes the nodes in the order of their dependencies. Nodes without dependencies between
+    each other are processed in parallel if more than one worker is used. Otherwise, the nodes are
+    processed in the order of the list as far as the dependencies allow.
+
+    Required:
+        nodes -- A list of ModelNode objects.
+
+    Optional:
+        workers -- The number of worker processes (1: no worker processes).
+        initargs -- The parameters of the function init_worker() without the log queue (workspace, overwrite,
+                    environment_settings, checkpoint_file). Mandatory if workers > 1.
+        journal -- An OperationJournal: the nodes done in a previous run are skipped and the
+                   processed nodes are recorded.
+        cache -- A ModelCache: the nodes that have been applied unchanged to the workspace are skipped
+                 and the processed nodes are recorded.
+        stop_on_error -- If the processing is stopped after the first node with errors (only without
+                         worker processes, see class StageBatch).
+
+    Return:
+        completed -- False if the processing has been stopped because of an error.
+    """
+    order = {node.node_id: i for i, node in enumerate(nodes)}
+    waiting = {node.node_id: {d for d in node.dependencies if d in order} for node in nodes}
+    dependents = {}
+    for node_id, dependencies in waiting.items():
+        for dependency in dependencies:
+            dependents.setdefault(dependency, []).append(node_id)
+    ready = [order[node_id] for node_id, dependencies in waiting.items() if not dependencies]
+    heapq.heapify(ready)
+    finished = set()
+    # nodes processed in this run
+    processed = set()
+
+    def release(node_id):
+        finished.add(node_id)
+        for dependent in dependents.get(node_id, []):
+            waiting[dependent].discard(node_id)
+            if not waiting[dependent]:
+                heapq.heappush(ready, order[dependent])
+
+    def skip(node):
+        # the node has been processed by a previous run (see class OperationJournal) and the nodes
+        # it depends on have not been processed again (e.g. a recreated domain)
+        if journal and not processed.intersection(node.dependencies) and \
+                journal.is_done(node.node_id, node.function, node.kwargs):
+            logger.info(f'"{node.node_id}" is skipped (done in a previous run)')
+            release(node.node_id)
+            return True
+        # the object has been applied unchanged to the workspace (see class ModelCache)
+        if cache and cache.is_applied(node):
+            logger.info(f'"{node.node_id}" is skipped (unchanged since {cache.applied(node.cache_key)})')
+            release(node.node_id)
+            return True
+        # the objects that depend on the node are processed again in their next run
+        if cache:
+            cache.invalidate([node.cache_key] if node.cache_key else node.invalidates)
+        processed.add(node.node_id)
+        return False
+
+    def record(node, errors):
+        # nodes with errors and nodes depending on them are processed again when the run is resumed
+        if journal and not errors:
+            journal.record(node.node_id, node.function, node.kwargs, [d for d in node.dependencies if d in order])
+        if cache:
+            cache.record(node, errors)
+
+    def check_cycle(running):
+        # nodes with cyclic dependencies are processed in the order of the list
+        if not ready and not running and len(finished) < len(nodes):
+            node = next(node for node in nodes if node.node_id not in finished and waiting[node.node_id])
+            logger.warning(f'"{node.node_id}" has cyclic dependencies and is processed now')
+            waiting[node.node_id] = set()
+            heapq.heappush(ready, order[node.node_id])
+
+    if workers <= 1:
+        while len(finished) < len(nodes):
+            check_cycle(False)
+            node = nodes[heapq.heappop(ready)]
+            if skip(node):
+                continue
+            records, errors = execute_node(node.function, node.kwargs)
+            record(node, errors)
+            release(node.node_id)
+            if stop_on_error and errors:
+                return False
+        return True
+
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *logger.handlers, respect_handler_level = True)
+    listener.start()
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers = workers, initializer = init_worker,
+                                                    initargs = tuple(initargs) + (log_queue,)) as executor:
+            running = {}
+            while len(finished) < len(nodes):
+                check_cycle(running)
+                while ready and len(running) < workers:
+                    node = nodes[heapq.heappop(ready)]
+                    if skip(node):
+                        continue
+                    future = executor.submit(execute_node, node.function, node.kwargs, node.catalog_phase,
+                                             node.refresh)
+                    running[future] = node
+                if not running:
+                    continue
+                done, _ = concurrent.futures.wait(running, return_when = concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        # the operations measured in the worker process
+                        records, errors = future.result()
+                        profile.extend(records)
+                    except Exception:
+                        executor.shutdown(wait = True, cancel_futures = True)
+                        raise
+                    record(node, errors)
+                    release(node.node_id)
+    finally:
+        listener.stop()
+    # the objects have been changed by the worker processes
+    if catalog is not None:
+        catalog.load()
+    return True
+
+# names of the positional parameters of the geoprocessing tools recorded by a stage batch (see class StageBatch)
+BATCH_TOOL_PARAMETERS = {
+    "Delete": ["in_data", "data_type"],
+    "CreateDomain": ["in_workspace", "domain_name"],
+    "DeleteDomain": ["in_workspace", "domain_name"],
+    "AlterDomain": ["in_workspace", "domain_name"],
+    "TableToDomain": ["in_table", "code_field", "description_field", "in_workspace", "domain_name"],
+    "AddCodedValueToDomain": ["in_workspace", "domain_name", "code", "code_description"],
+    "DeleteCodedValueFromDomain": ["in_workspace", "domain_name", "code"],
+    "SetValueForRangeDomain": ["in_workspace", "domain_name", "min_value", "max_value"],
+    "CreateFeatureDataset": ["out_dataset_path", "out_name"],
+    "CreateFeatureclass": ["out_path", "out_name"],
+    "CreateTable": ["out_path", "out_name"],
+    "CreateRelationshipClass": ["origin_table", "destination_table", "out_relationship_class"],
+    "AddRuleToRelationshipClass": ["in_rel_class"],
+    "AddField": ["in_table", "field_name"],
+    "AddFields": ["in_table", "field_description"],
+    "DeleteField": ["in_table", "drop_field"],
+    "AlterField": ["in_table", "field"],
+    "CalculateField": ["in_table", "field"],
+    "MakeTableView": ["in_table", "out_view", "where_clause"],
+    "AssignDomainToField": ["in_table", "field_name", "domain_name", "subtype_code"],
+    "RemoveDomainFromField": ["in_table", "field_name", "subtype_code"],
+    "SetSubtypeField": ["in_table", "field"],
+    "AddSubtype": ["in_table", "subtype_code", "subtype_description"],
+    "RemoveSubtype": ["in_table", "subtype_code"],
+    "SetDefaultSubtype": ["in_table", "subtype_code"],
+    "AddGlobalIDs": ["in_datasets"],
+    "EnableEditorTracking": ["in_dataset", "creator_field", "creation_date_field", "last_editor_field",
+                             "last_edit_date_field", "add_fields", "record_dates_in"],
+    "EnableAttachments": ["in_dataset"],
+    "AddAttributeRule": ["in_table", "name"],
+    "ImportAttributeRules": ["target_table", "csv_file"],
+    "DeleteAttributeRule": ["in_table", "names"],
+}
+# geoprocessing tools that create an object (the tools called on the object afterwards are undone with it)
+BATCH_CREATE_TOOLS = ["CreateDomain", "CreateFeatureDataset", "CreateFeatureclass", "CreateTable",
+                      "CreateRelationshipClass"]
+
+def get_undo_calls(tool, parameters) -> list:
+    """Returns the calls of geoprocessing tools that undo a recorded call (see class StageBatch).
+
+    Required:
+        tool -- The name of the geoprocessing tool.
+        parameters -- A dictionary with the parameters of the call.
+
+    Return:
+        calls -- A list of tuples (name of the tool, arguments, keyword arguments) or None if the
+                 call can not be undone (e.g. deleted objects, calculated values).
+    """
+    p = parameters
+    if tool in ("CreateFeatureclass", "CreateTable"):
+        return [("Delete", (os.path.join(p["out_path"], p["out_name"]),), {})]
+    if tool == "CreateFeatureDataset":
+        return [("Delete", (os.path.join(p["out_dataset_path"], p["out_name"]),), {})]
+    if tool == "CreateRelationshipClass":
+        return [("Delete", (p["out_relationship_class"],), {})]
+    if tool == "CreateDomain" or tool == "TableToDomain" and p.get("created"):
+        return [("DeleteDomain", (p["in_workspace"], p["domain_name"]), {})]
+    if tool == "AddCodedValueToDomain":
+        return [("DeleteCodedValueFromDomain", (p["in_workspace"], p["domain_name"], p["code"]), {})]
+    if tool == "AddField":
+        return [("DeleteField", (p["in_table"], p["field_name"]), {})]
+    if tool == "AddFields":
+        return [("DeleteField", (p["in_table"], [row[0] for row in p["field_description"]]), {})]
+    if tool == "AssignDomainToField":
+        # the domains assigned before the call (see method StageBatch.record()) are assigned again
+        calls = []
+        for subtype, domain_name in p.get("previous_domains") or [(p.get("subtype_code"), None)]:
+            args = (p["in_table"], p["field_name"])
+            if domain_name:
+                calls.append(("AssignDomainToField", args + (domain_name,) + ((subtype,) if subtype else ()), {}))
+            else:
+                calls.append(("RemoveDomainFromField", args + ((subtype,) if subtype else ()), {}))
+        return calls
+    if tool == "SetSubtypeField":
+        return [("SetSubtypeField", (p["in_table"],), {"clear_value": True})]
+    if tool == "AddSubtype":
+        return [("RemoveSubtype", (p["in_table"], p["subtype_code"]), {})]
+    if tool == "AddAttributeRule":
+        return [("DeleteAttributeRule", (p["in_table"], [p["name"]]), {})]
+    if tool == "ImportAttributeRules" and p.get("names"):
+        return [("DeleteAttributeRule", (p["target_table"], p["names"]), {})]
+    if tool == "EnableEditorTracking":
+        # the fields added by the tool (see method StageBatch.prepare()) are deleted
+        return [("DisableEditorTracking", (p["in_dataset"],), {})] + \
+               ([("DeleteField", (p["in_dataset"], p["added_fields"]), {})] if p.get("added_fields") else [])
+    if tool == "EnableAttachments":
+        return [("DisableAttachments", (p["in_dataset"],), {})]
+    return None
+
+class BatchBackend:
+    """Backend that passes all calls to another backend and records the geoprocessing tools of
+    "management" called by a stage batch (see class StageBatch)."""
+    def __init__(self, backend, batch):
+        self.backend = backend
+        self.batch = batch
+
+    def __getattr__(self, name):
+        if name == 'management':
+            return BatchToolbox(self.backend.management, self.batch)
+        return getattr(self.backend, name)
+
+class BatchToolbox:
+    """Toolbox of a BatchBackend: records the tools that have been executed without error."""
+    def __init__(self, toolbox, batch):
+        self.toolbox = toolbox
+        self.batch = batch
+
+    def __getattr__(self, name):
+        function = getattr(self.toolbox, name)
+
+        def tool(*args, **kwargs):
+            state = self.batch.prepare(name, args, kwargs)
+            result = function(*args, **kwargs)
+            self.batch.record(name, args, kwargs, state)
+            return result
+        return tool
+
+# stages of a deployment processed as batches: section of the node -> (rank, name of the stage)
+BATCH_STAGES = {"Domains": (0, "Domains"), "Datasets": (1, None), "Features": (2, None),
+                "Tables": (2, "Feature classes and tables"), "Relations": (3, "Relationship classes"),
+                "AttributeRules": (4, "Attribute rules"), "DeleteFeatures": (5, "Deletions"),
+                "DeleteDatasets": (5, "Deletions"), "DeleteDomains": (5, "Deletions"),
+                "DeleteAllDomains": (5, "Deletions"), "UpdateFeatures": (6, "Updates"),
+                "UpdateTables": (6, "Updates"), "UpdateDomains": (6, "Updates")}
+
+def get_batch_name(node) -> tuple:
+    """Returns the stage of a node (see function get_batches()): the domains, the schema of a feature
+    dataset (the dataset and its feature classes), the feature classes and tables without dataset,
+    the relationship classes, the attribute rules, the deletions or the updates.
+
+    Required:
+        node -- A ModelNode.
+
+    Return:
+        rank -- The position of the stage in the deployment.
+        name -- The name of the stage (e.g. 'Dataset "EVENT_MANAGEMENT"').
+    """
+    section = node.node_id.split('[')[0]
+    if node.node_id.endswith('/AttributeRules'):
+        section = 'AttributeRules'
+    rank, name = BATCH_STAGES[section]
+    if section == 'Datasets':
+        name = f'Dataset "{filter_dict(node.kwargs["dic"])["out_name"]}"'
+    elif section == 'Features':
+        dataset = filter_dict(node.kwargs['dic']).get('out_dataset')
+        rank, name = (1, f'Dataset "{dataset}"') if dataset else BATCH_STAGES['Tables']
+    return rank, name
+
+def get_batches(nodes) -> list:
+    """Groups the nodes into the stages of the deployment (see function get_batch_name()) in the order
+    of their dependencies: a node that depends on a node of a later stage is moved to that stage.
+
+    Required:
+        nodes -- A list of ModelNode objects (see function build_nodes()).
+
+    Return:
+        batches -- A list of tuples (name of the stage, list of the nodes of the stage).
+    """
+    stages = [get_batch_name(node) for node in nodes]
+    # the stages of the same rank in the order of the JSON file (e.g. the datasets)
+    names = list(dict.fromkeys(name for _, _, name in sorted((rank, i, name) for i, (rank, name)
+                                                             in enumerate(stages))))
+    index = {node.node_id: names.index(name) for node, (_, name) in zip(nodes, stages)}
+    for _ in range(len(nodes)):
+        changed = False
+        for node in nodes:
+            latest = max([index[d] for d in node.dependencies if d in index], default = 0)
+            if latest > index[node.node_id]:
+                index[node.node_id] = latest
+                changed = True
+        if not changed:
+            break
+    batches = [(name, [node for node in nodes if index[node.node_id] == i]) for i, name in enumerate(names)]
+    return [(name, batch_nodes) for name, batch_nodes in batches if batch_nodes]
+
+class StageBatch:
+    """A stage of the deployment (e.g. the domains, the schema of a feature dataset or the updates)
+    that is applied as one unit (parameter "StageBatches"). The nodes of the stage are processed on
+    the connection of the main process and the calls of the geoprocessing tools are recorded. After
+    the first error (e.g. a schema lock held by another connection), the remaining nodes of the stage
+    are not processed and the recorded calls are undone in reverse order (e.g. a created table or
+    domain is deleted, an added field or coded value is removed, the previous domain of a field is
+    assigned again). arcpy commits every geoprocessing tool on its own, so calls that change or delete
+    existing objects or data (e.g. DeleteField, AlterField, CalculateField) can not be undone and are
+    listed as warnings. Existing objects that would be deleted to create them again (parameter
+    "Overwrite") can not be restored either: the stages are not processed at all if there are any
+    (see function run_batches()).
+
+    Required:
+        name -- The name of the stage (see function get_batch_name()).
+        workspace -- The path to the workspace (gdb, sde connection file).
+        nodes -- The ModelNode objects of the stage.
+    """
+    def __init__(self, name, workspace, nodes):
+        self.name = name
+        self.workspace = workspace
+        self.nodes = nodes
+        # the recorded calls: dictionaries with the keys "tool", "parameters", "target" (the name of the
+        # object or domain), "key" (the key of the target) and "creates" (if the call creates the target)
+        self.calls = []
+        # name of a table view -> name of its table
+        self.views = {}
+
+    def overwritten_objects(self) -> list:
+        """Returns the names of the existing feature datasets, feature classes, tables and relationship
+        classes that the stage would delete to create them again."""
+        workspace_catalog = get_catalog(self.workspace)
+        overwritten = []
+        for node in self.nodes:
+            if node.function not in (process_dataset, process_class, process_relation):
+                continue
+            overwrite = node.kwargs.get('overwrite', True)
+            if node.function is process_relation:
+                overwrite = filter_dict(node.kwargs['dic']).get('slu_overwrite', overwrite)
+            item = workspace_catalog.objects.get(str(node.cache_key).partition(':')[2])
+            if overwrite and item:
+                overwritten.append(item['name'])
+        return overwritten
+
+    def prepare(self, tool, args, kwargs) -> dict:
+        """Returns the state of the workspace before a call of a geoprocessing tool that is needed to
+        undo the call (see method record()): the editor tracking fields that do not exist yet and are
+        added by the tool."""
+        parameters = dict(zip(BATCH_TOOL_PARAMETERS.get(tool, []), args))
+        parameters.update(kwargs)
+        if tool == 'EnableEditorTracking' and parameters.get('add_fields') == 'ADD_FIELDS':
+            field_names = [field_name.lower() for field_name in get_catalog(self.workspace).field_names(
+                parameters['in_dataset'])]
+            return {'added_fields': [parameters[name] for name in ('creator_field', 'creation_date_field',
+                                                                   'last_editor_field', 'last_edit_date_field')
+                                     if parameters.get(name) and parameters[name].lower() not in field_names]}
+        return {}
+
+    def record(self, tool, args, kwargs, state = None) -> None:
+        """Records a call of a geoprocessing tool that has been executed without error (state: see
+        method prepare())."""
+        parameters = dict(zip(BATCH_TOOL_PARAMETERS.get(tool, []), args))
+        parameters.update(kwargs)
+        parameters.update(state or {})
+        if 'in_workspace' in parameters:
+            target = str(parameters.get('domain_name'))
+            key = f'domain:{target.lower()}'
+        else:
+            target = next((parameters[name] for name in ('in_table', 'in_dataset', 'in_datasets', 'target_table',
+                                                         'in_rel_class', 'in_data', 'out_relationship_class')
+                           if name in parameters), None)
+            if target is None and 'out_name' in parameters:
+                target = os.path.join(parameters.get('out_path', parameters.get('out_dataset_path', '')),
+                                      parameters['out_name'])
+            target = str(target if target is not None else (args[0] if args else ''))
+            # table views (e.g. the rows of a calculation, see function calculate_field()) are not objects
+            # of the workspace: the calls on a view are recorded as calls on its table
+            if tool == 'MakeTableView':
+                self.views[str(parameters.get('out_view'))] = target
+                return
+            if target in self.views:
+                if tool == 'Delete':
+                    return
+                target = self.views[target]
+            # temporary tables (e.g. the codes of a domain loaded with TableToDomain)
+            if target.replace('\\', '/').split('/')[0].lower() in ('memory', 'in_memory'):
+                return
+            key = get_object_key(target)
+        creates = tool in BATCH_CREATE_TOOLS
+        if tool == 'TableToDomain':
+            # the domain is created by the tool if it does not exist (the catalog is updated afterwards)
+            parameters['created'] = creates = not get_catalog(self.workspace).domain_exists(target)
+        if tool == 'AssignDomainToField':
+            # the domains of the field before the call (the catalog is updated after the call)
+            workspace_catalog = get_catalog(self.workspace)
+            workspace_catalog.field_names(target)
+            parameters['previous_domains'] = []
+            for subtype in str(parameters.get('subtype_code') or '').split(';'):
+                subtype = subtype.strip() or None
+                domain_key = workspace_catalog.field_domains.get(
+                    (key, get_object_key(parameters['field_name']), subtype.split(':')[0].strip() if subtype else None))
+                parameters['previous_domains'].append((subtype, workspace_catalog.domains.get(domain_key)))
+        if tool == 'ImportAttributeRules':
+            # the names of the imported rules (the CSV file is deleted after the import)
+            try:
+                with open(parameters['csv_file'], newline = '', encoding = 'utf-8') as f:
+                    parameters['names'] = [row['NAME'] for row in csv.DictReader(f)]
+            except (OSError, KeyError):
+                parameters['names'] = None
+        self.calls.append({'tool': tool, 'parameters': parameters, 'target': target, 'key': key,
+                           'creates': creates})
+
+    def rollback(self) -> None:
+        """Undoes the recorded calls in reverse order. The calls on objects created by the stage are
+        undone with the deletion of the object."""
+        logger.warning(f'The stage "{self.name}" is rolled back ({len(self.calls)} operations)')
+        created = {call['key'] for call in self.calls if call['creates']}
+        for call in reversed(self.calls):
+            if call['key'] in created and not call['creates']:
+                continue
+            undo_calls = get_undo_calls(call['tool'], call['parameters'])
+            if undo_calls is None:
+                logger.warning(f'"{call["tool"]}" on "{call["target"]}" can not be rolled back')
+                continue
+            for tool, args, kwargs in undo_calls:
+                try:
+                    getattr(arcpy.management, tool)(*args, **kwargs)
+                except Exception:
+                    e = sys.exc_info()[1]
+                    logger.error(f'"{call["tool"]}" on "{call["target"]}" could not be rolled back: {e.args[0]}')
+        # the catalog has been changed by the undone calls
+        if catalog is not None:
+            catalog.load()
+
+    def run(self, journal = None, cache = None) -> bool:
+        """Processes the nodes of the stage (see function run_nodes()) and rolls the stage back if an
+        error is logged.
+
+        Optional:
+            journal -- An OperationJournal: the rolled back nodes are removed from the journal.
+            cache -- A ModelCache: the objects of the rolled back stage are removed from the cache.
+
+        Return:
+            committed -- True if the stage has been applied without errors.
+        """
+        global arcpy
+        logger.info(f'Stage "{self.name}": {len(self.nodes)} objects')
+        backend = arcpy
+        errors = error_counter.count
+        done = dict(journal.done) if journal else {}
+        completed = False
+        arcpy = BatchBackend(backend, self)
+        try:
+            completed = run_nodes(self.nodes, 1, None, journal, cache, stop_on_error = True)
+        finally:
+            arcpy = backend
+            if not completed or error_counter.count > errors:
+                self.rollback()
+                if journal:
+                    journal.discard([operation_id for operation_id, value in journal.done.items()
+                                     if done.get(operation_id) != value])
+                if cache:
+                    cache.invalidate([node.cache_key for node in self.nodes if node.cache_key])
+        if error_counter.count > errors:
+            return False
+        logger.info(f'The stage "{self.name}" is committed ({len(self.calls)} operations)')
+        return True
+
+def run_batches(nodes, workspace, journal = None, cache = None) -> bool:
+    """Processes the nodes stage by stage (see class StageBatch). If a stage is rolled back, the
+    following stages are not processed. If the stages would overwrite existing objects, no stage is
+    processed, because the deletion of an object can not be rolled back.
+
+    Required:
+        nodes -- A list of ModelNode objects (see function build_nodes()).
+        workspace -- The path to the workspace (gdb, sde connection file).
+
+    Optional:
+        journal -- An OperationJournal (see function run_nodes()).
+        cache -- A ModelCache (see function run_nodes()).
+
+    Return:
+        committed -- True if all stages have been applied.
+    """
+    batches = get_batches(nodes)
+    # the deletion of an overwritten object can not be rolled back: no stage is processed
+    overwritten = [object_name for name, batch_nodes in batches
+                   for object_name in StageBatch(name, workspace, batch_nodes).overwritten_objects()]
+    if overwritten:
+        logger.error(f'The stages are not processed, because the existing objects {", ".join(overwritten)} '
+                     f'would be deleted and created again and the deletion can not be rolled back (delete them '
+                     f'beforehand, e.g. with "DeleteAllExisting", or set "Overwrite" to "False")')
+        return False
+    logger.info(f'{len(nodes)} objects are processed in {len(batches)} stages: '
+                f'{", ".join(name for name, _ in batches)}')
+    for i, (name, batch_nodes) in enumerate(batches):
+        if not StageBatch(name, workspace, batch_nodes).run(journal, cache):
+            remaining = [name for name, _ in batches[i + 1:]]
+            if remaining:
+                logger.error(f'The run is stopped, the following stages have not been processed: '
+                             f'{", ".join(remaining)}')
+            return False
+    return True
+
+class OperationJournal:
+    """A journal of the operations done by a run (JSON lines file), so that a failed run can be
+    resumed: the operations recorded in the journal of the previous run are skipped. An operation
+    is identified by its path in the JSON file (e.g. "Features[2]") and the hash of its parameters,
+    so an operation that has been changed in the JSON file is processed again together with the
+    operations depending on it (see function run_nodes()). The journal is
+    written after each operation.
+
+    Required:
+        file -- The path to the journal file.
+        workspace -- The path to the workspace (gdb, sde connection file).
+
+    Optional:
+        resume -- If the operations of the existing journal are skipped (otherwise a new journal is started).
+    """
+    def __init__(self, file, workspace, resume = False):
+        self.file = file
+        self.workspace = workspace
+        self.resume = resume
+        # ID of the operation -> hash of the parameters
+        self.done = {}
+        self.skipped = 0
+        self.stream = None
+
+    def open(self) -> None:
+        """Reads the journal of the previous run (if the run is resumed) and starts the journal."""
+        entries = []
+        if self.resume and os.path.isfile(self.file):
+            with open(self.file, encoding = 'utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        # the last line is incomplete if the run was interrupted while writing
+                        break
+            if entries and entries[0].get('workspace') != self.workspace:
+                logger.warning(f'The journal "{self.file}" of the workspace "{entries[0].get("workspace")}" '
+                               f'is not used')
+                entries = []
+            self.done = {entry['id']: entry['hash'] for entry in entries[1:]}
+            # operations that have been rolled back (see function discard())
+            self.done = {operation_id: value for operation_id, value in self.done.items() if value}
+            logger.info(f'Resume the run: {len(self.done)} operations are done according to the journal "{self.file}"')
+        elif self.resume:
+            logger.warning(f'The journal "{self.file}" does not exist: the run is started from the beginning')
+        # the journal is written again (without an incomplete last line)
+        self.stream = open(self.file, 'w', encoding = 'utf-8')
+        for entry in entries or [{'workspace': self.workspace, 'start': time.ctime()}]:
+            self.write(entry)
+
+    def is_done(self, operation_id, function, kwargs) -> bool:
+        """Checks whether the operation has been done by the previous run with the same parameters."""
+        done = self.done.get(operation_id) == operation_hash(function, kwargs)
+        self.skipped += done
+        return done
+
+    def record(self, operation_id, function, kwargs, dependencies = ()) -> None:
+        """Records an operation as done, if the operations it depends on are done as well."""
+        if all(dependency in self.done for dependency in dependencies):
+            self.done[operation_id] = operation_hash(function, kwargs)
+            self.write({'id': operation_id, 'hash': self.done[operation_id], 'time': time.ctime()})
+
+    def discard(self, operation_ids) -> None:
+        """Removes operations from the journal (e.g. operations that have been rolled back, see class
+        StageBatch), so that they are processed again when the run is resumed."""
+        for operation_id in operation_ids:
+            if self.done.pop(operation_id, None) is not None:
+                self.write({'id': operation_id, 'hash': None, 'time': time.ctime()})
+
+    def write(self, entry) -> None:
+        self.stream.write(json.dumps(entry) + '\n')
+        self.stream.flush()
+        os.fsync(self.stream.fileno())
+
+    def close(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+def operation_hash(function, kwargs) -> str:
+    """Returns a hash of an operation: the function and its parameters (items of the JSON file,
+    names, options). The spatial reference is not included because it is an object of arcpy.
+    """
+    parameters = {key: value for key, value in kwargs.items() if key != 'spatial_reference'}
+    text = json.dumps([getattr(function, '__name__', str(function)), parameters], sort_keys = True,
+                      default = lambda value: load_item(value) if isinstance(value, ModelItem) else
+                      dict(value) if isinstance(value, collections.abc.Mapping) else str(value))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+class ModelCache:
+    """A cache of the objects applied to the workspaces (SQLite file), so that the objects that
+    have not been changed in the JSON file since they were applied are skipped. An object (domain,
+    dataset, feature class, table, attribute rules, relationship class, update) is identified by its
+    key (e.g. "class:location") and the hash of its parameters. If an object is applied again, the
+    objects that depend on it (e.g. the relationship classes and the updates of a recreated feature
+    class) are removed from the cache, also if they are defined in another JSON file.
+
+    Required:
+        file -- The path to the SQLite file.
+        workspace -- The path to the workspace (gdb, sde connection file).
+
+    Optional:
+        verify -- If the skipped objects are checked against the schema of the workspace
+                  (see function verify_cached_object()).
+    """
+    def __init__(self, file, workspace, verify = False):
+        self.file = file
+        self.workspace = workspace
+        self.verify = verify
+        self.key = os.path.normcase(os.path.abspath(workspace))
+        # keys of the objects with errors in this run
+        self.failed = set()
+        self.skipped = 0
+        self.connection = sqlite3.connect(file, timeout = 60)
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS applied (workspace TEXT, key TEXT, hash TEXT, '
+                                    'refs TEXT, applied TEXT, PRIMARY KEY (workspace, key))')
+
+    def is_applied(self, node) -> bool:
+        """Checks whether the object of the node has been applied with the same parameters."""
+        if not node.cache_key:
+            return False
+        row = self.connection.execute('SELECT hash FROM applied WHERE workspace = ? AND key = ?',
+                                      (self.key, node.cache_key)).fetchone()
+        if not row or row[0] != operation_hash(node.function, node.kwargs):
+            return False
+        if self.verify and not verify_cached_object(self.workspace, node):
+            logger.info(f'"{node.node_id}" differs from the workspace and is processed again')
+            return False
+        self.skipped += 1
+        return True
+
+    def applied(self, key) -> str:
+        """Returns the time when the object has been applied."""
+        row = self.connection.execute('SELECT applied FROM applied WHERE workspace = ? AND key = ?',
+                                      (self.key, key)).fetchone()
+        return row[0] if row else None
+
+    def record(self, node, errors = 0) -> None:
+        """Records that the object of the node has been applied (if no errors have been logged and
+        the objects it depends on have been applied without errors)."""
+        if not node.cache_key:
+            return
+        if errors or self.failed.intersection(node.references):
+            self.failed.add(node.cache_key)
+            return
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO applied VALUES (?, ?, ?, ?, ?)',
+                                    (self.key, node.cache_key, operation_hash(node.function, node.kwargs),
+                                     json.dumps(node.references), time.strftime('%Y-%m-%d %H:%M:%S')))
+
+    def invalidate(self, keys) -> None:
+        """Removes objects and the objects depending on them from the cache.
+
+        Required:
+            keys -- The keys of the objects ("domain:*": all domains).
+        """
+        if not keys:
+            return
+        rows = self.connection.execute('SELECT key, refs FROM applied WHERE workspace = ?', (self.key,)).fetchall()
+        references = {key: set(json.loads(refs)) for key, refs in rows}
+        removed = {key for key in references for pattern in keys
+                   if key == pattern or pattern.endswith('*') and key.startswith(pattern[:-1])}
+        # objects depending on removed objects
+        while True:
+            dependent = {key for key, refs in references.items() if key not in removed and refs & removed}
+            if not dependent:
+                break
+            removed |= dependent
+        if removed:
+            with self.connection:
+                self.connection.executemany('DELETE FROM applied WHERE workspace = ? AND key = ?',
+                                            [(self.key, key) for key in removed])
+
+    def clear(self) -> None:
+        """Removes all objects of the workspace from the cache."""
+        with self.connection:
+            self.connection.execute('DELETE FROM applied WHERE workspace = ?', (self.key,))
+
+    def close(self) -> None:
+        self.connection.close()
+
+def verify_cached_object(workspace, node) -> bool:
+    """Checks whether an object of the cache still exists in the workspace as defined in the JSON
+    file: domains and their codes, datasets, feature classes and tables and their fields,
+    attribute rules, relationship classes and the fields and codes added by updates.
+
+    Required:
+        workspace -- The path to the workspace (gdb, sde connection file).
+        node -- The ModelNode of the object.
+    """
+    workspace_catalog = get_catalog(workspace)
+    kind = node.cache_key.split(':')[0]
+    update = len(node.cache_key.split(':')) > 2
+    dic = filter_dict(node.kwargs.get('dic') or {})
+    if kind == 'domain' and update:
+        domain = workspace_catalog.domain_schema.get(dic['domain_name'].lower())
+        codes = [dic_code['code'] for dic_code in dic.get('AddCodedValues', [])]
+    elif kind == 'domain':
+        domain = workspace_catalog.domain_schema.get(dic['domain_name'].lower())
+        codes = list(dic.get('DomainValues') or {})
+    elif kind == 'dataset':
+        return workspace_catalog.exists(dic['out_name'], 'FeatureDataset')
+    elif kind == 'class' and update:
+        fields = [dic_field['field_name'] for dic_field in dic.get('AddFields', [])]
+        return workspace_catalog.exists(dic['in_table']) and \
+            all(workspace_catalog.field_exists(dic['in_table'], field_name) for field_name in fields)
+    elif kind == 'class':
+        fields = [dic_field['field_name'] for dic_field in dic.get('Fields', [])]
+        return workspace_catalog.exists(dic['out_name']) and \
+            all(workspace_catalog.field_exists(dic['out_name'], field_name) for field_name in fields)
+    elif kind == 'rules':
+        schema = workspace_catalog.object_schema.get(get_object_key(node.kwargs['in_table'])) or {}
+        live_rules = {live_rule['name'].lower() for live_rule in schema.get('attributeRules', [])}
+        return all(dic_rule['name'].lower() in live_rules for dic_rule in node.kwargs['rules'])
+    elif kind == 'relation':
+        return workspace_catalog.exists(dic['out_relationship_class'], 'RelationshipClass')
+    else:
+        return False
+    if domain is None:
+        return False
+    if domain.domainType != 'CodedValue':
+        return True
+    live_codes = {normalize_code(code) for code in domain.codedValues}
+    return all(normalize_code(code) in live_codes for code in codes)
+
+# parameter that names the object changed by a geoprocessing tool (default: the first parameter)
+TOOL_TARGETS = {
+    'DeleteDomain': 'domain_name', 'CreateDomain': 'domain_name', 'AddCodedValueToDomain': 'domain_name',
+    'DeleteCodedValueFromDomain': 'domain_name', 'AlterDomain': 'domain_name',
+    'SetValueForRangeDomain': 'domain_name', 'TableToDomain': 'domain_name', 'CreateFeatureDataset': 'out_name',
+    'CreateFeatureclass': 'out_name', 'CreateTable': 'out_name', 'CreateRelationshipClass': 'out_relationship_class',
+}
+
+# log messages of the functions above -> geoprocessing tool called after the message
+LOG_OPERATIONS = [
+    (r'The domain "[^"]*" will be created', 'CreateDomain'),
+    (r'(The existing domain|The domain) "[^"]*" will be deleted', 'DeleteDomain'),
+    (r'Coded value is added to the domain', 'AddCodedValueToDomain'),
+    (r'Coded values are loaded into the domain', 'TableToDomain'),
+    (r'Coded values "[^"]*" are deleted', 'DeleteCodedValueFromDomain'),
+    (r'The domain "[^"]*" will be altered', 'AlterDomain'),
+    (r'Adding values to the domain', 'SetValueForRangeDomain'),
+    (r'Removing (the domain|domain "[^"]*") from the field', 'RemoveDomainFromField'),
+    (r'(Existing|The existing|The) (dataset|datasets|feature class|table|relationship class) "[^"]*" '
+     r'will be deleted', 'Delete'),
+    (r'Item "[^"]*" will be deleted', 'Delete'),
+    (r'The dataset "[^"]*" will be created', 'CreateFeatureDataset'),
+    (r'The feature class "[^"]*" will be created', 'CreateFeatureclass'),
+    (r'The table "[^"]*" will be created', 'CreateTable'),
+    (r'Adding the field', 'AddField'),
+    (r'Feld "[^"]*" will be deleted', 'DeleteField'),
+    (r'The field "[^"]*" will be altered', 'AlterField'),
+    (r'Calculate field', 'CalculateField'),
+    (r'The domain "[^"]*" will be assigned', 'AssignDomainToField'),
+    (r'The field "[^"]*" will be defined as subtype field', 'SetSubtypeField'),
+    (r'The subtype "[^"]*":"[^"]*" will be created', 'AddSubtype'),
+    (r'The subtype "[^"]*" will be removed', 'RemoveSubtype'),
+    (r'Adding GlobalID', 'AddGlobalIDs'),
+    (r'Set subtype', 'SetDefaultSubtype'),
+    (r'Activate editor tracking', 'EnableEditorTracking'),
+    (r'Activate attachments', 'EnableAttachments'),
+    (r'Adding attribute rule', 'AddAttributeRule'),
+    (r'attribute rules are imported into', 'ImportAttributeRules'),
+    (r'Deleting attribute rule', 'DeleteAttributeRule'),
+    (r'The relationship class "[^"]*" will be created', 'CreateRelationshipClass'),
+    (r'Adding a rule to the relationship class', 'AddRuleToRelationshipClass'),
+]
+
+# estimated durations in seconds if no log files of previous runs exist (file geodatabase)
+DEFAULT_DURATIONS = {
+    'Delete': 1.0, 'CreateFeatureDataset': 0.5, 'CreateFeatureclass': 1.2, 'CreateTable': 0.5,
+    'CreateRelationshipClass': 0.8, 'AddField': 0.35, 'AddGlobalIDs': 0.4, 'EnableEditorTracking': 0.7,
+    'EnableAttachments': 0.9, 'AddAttributeRule': 0.5, 'ImportAttributeRules': 0.8,
+}
+DEFAULT_DURATION = 0.3
+
+def is_arcpy_run(log_file) -> bool:
+    """Checks whether a log file has been written by a run with the backend "arcpy": all events of the
+    run (see function timed()) are tagged with the backend "arcpy". Runs with the backend "fake" and
+    plans (which do not write log files) are not measured against a geodatabase.
+
+    Required:
+        log_file -- The path to the log file.
+    """
+    backends = set()
+    try:
+        with open(os.path.splitext(log_file)[0] + '_events.jsonl', encoding = 'utf-8') as f:
+            for line in f:
+                try:
+                    backends.add(json.loads(line).get('backend'))
+                except ValueError:
+                    continue
+    except OSError:
+        return False
+    return backends == {'arcpy'}
+
+def load_durations(log_folder) -> dict:
+    """Returns the average duration of the geoprocessing tools in the log files of previous runs with
+    the backend "arcpy" (see function is_arcpy_run()). The duration of a tool is the time between its
+    log message and the next log message.
+
+    Required:
+        log_folder -- The folder with the log files (*.log).
+
+    Return:
+        durations -- A dictionary {tool: seconds}.
+    """
+    patterns = [(re.compile(pattern), tool) for pattern, tool in LOG_OPERATIONS]
+    samples = {}
+    if not log_folder or not os.path.isdir(log_folder):
+        return {}
+    for filename in sorted(os.listdir(log_folder)):
+        if not filename.endswith('.log') or not is_arcpy_run(os.path.join(log_folder, filename)):
+            continue
+        previous = None
+        with open(os.path.join(log_folder, filename), encoding = 'utf-8', errors = 'replace') as f:
+            for line in f:
+                match = re.match(r'(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),(\d{3}) \w+ (.*)', line)
+                if not match:
+                    continue
+                timestamp = time.mktime(time.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')) \
+                            + int(match.group(2)) / 1000
+                if previous:
+                    samples.setdefault(previous[1], []).append(max(0.0, timestamp - previous[0]))
+                tool = next((tool for pattern, tool in patterns if pattern.match(match.group(3))), None)
+                previous = (timestamp, tool) if tool else None
+    return {tool: sum(values) / len(values) for tool, values in samples.items()}
+
+def estimate_duration(operation, durations) -> float:
+    """Returns the estimated duration of a planned operation in seconds.
+
+    Required:
+        operation -- A recorded operation (see class fake_arcpy.FakeArcpy).
+        durations -- A dictionary {tool: seconds} (see function load_durations()).
+    """
+    def duration(tool):
+        return durations.get(tool, DEFAULT_DURATIONS.get(tool, DEFAULT_DURATION))
+
+    if operation['tool'] == 'AddFields':
+        # the log message "Adding the field" is written for every field of the call
+        return duration('AddField') * len(operation['parameters'].get('field_description', []))
+    return duration(operation['tool'])
+
+# sections of the JSON file whose objects have to exist in the workspace (see function plan_model()):
+# parameter of the function main() -> name of the section
+PLAN_ASSUMED_SECTIONS = {'update_features': 'UpdateFeatures', 'update_tables': 'UpdateTables',
+                         'update_domains': 'UpdateDomains', 'delete_features': 'DeleteFeatures',
+                         'delete_datasets': 'DeleteDatasets', 'delete_domains': 'DeleteDomains'}
+
+class PlanFilter(logging.Filter):
+    """Logs the errors of a plan as warnings (see function plan_model()). Only the level shown in the
+    log is changed, the errors are still counted (see class ErrorCounter)."""
+    def filter(self, record) -> bool:
+        if record.levelno >= logging.ERROR:
+            record.levelname = 'WARNING'
+        return True
+
+def plan_model(main_args, log_folder = None) -> list:
+    """Resolves the JSON file with the same logic as the function main() without changing a workspace:
+    The model is created in an empty geodatabase simulated in memory (see module fake_arcpy) and the
+    calls of the geoprocessing tools are recorded in the order of the execution. The workspace is
+    assumed to be empty (e.g. "DeleteAllExisting": "True"). arcpy is not required.
+
+    Required:
+        main_args -- A dictionary with the parameters of the function main().
+
+    Optional:
+        log_folder -- The folder with the log files of previous runs to estimate the durations.
+
+    Return:
+        operations -- A list of dictionaries with the keys "index", "tool", "target", "parameters",
+                      "estimated_duration" (seconds) and "error" (only if the tool would fail).
+    """
+    # the objects of the updates and deletions do not exist in the empty geodatabase: their errors are
+    # logged as warnings (the operations are marked with "error")
+    assumed = [section for name, section in PLAN_ASSUMED_SECTIONS.items() if main_args.get(name)]
+    plan_filter = PlanFilter()
+    if assumed:
+        logger.warning(f'The plan assumes an empty workspace: the objects of {", ".join(assumed)} do not exist, '
+                       f'so the errors of their operations are logged as warnings')
+        logger.addFilter(plan_filter)
+    previous_backend = set_backend(get_backend("fake"))
+    try:
+        main(**main_args, plan = True)
+        operations = arcpy.operations
+    finally:
+        set_backend(previous_backend)
+        logger.removeFilter(plan_filter)
+
+    durations = load_durations(log_folder)
+    planned = []
+    for index, operation in enumerate(operations, 1):
+        parameters = operation['parameters']
+        target = parameters.get(TOOL_TARGETS.get(operation['tool']), next(iter(parameters.values()), None))
+        planned.append({'index': index, 'tool': operation['tool'], 'target': str(target),
+                        'parameters': parameters, 'estimated_duration': round(estimate_duration(operation, durations), 3)})
+        if operation.get('error'):
+            planned[-1]['error'] = True
+    return planned
+
+def get_db_fullname(db_name, stage) -> str:
+    """Returns the file name of the workspace (sde connection file or gdb) of a stage.
+
+    Required:
+        db_name -- The name of the workspace (parameter "DBName").
+        stage -- The stage (e.g. "TEST", "INTE", "PROD") or None.
+    """
+    if stage:
+        if "." in db_name:
+            # Assumption: db_name has the file ending included
+            db_fullname = db_name
+        else:
+            # Assumption: db_name ends as following, depending on the server stage (default at city of Lucerne)
+            if stage == 'TEST':
+                    db_fullname = db_name + '.owner.test.sde'
+            elif stage == 'INTE':
+                    db_fullname = db_name + '.owner.inte.sde'
+            elif stage == 'PROD':
+                    db_fullname = db_name + '.owner.prod.sde'
+            else:
+                # Assumption: Esri file geodatabse (.gdb)
+                db_fullname = db_name + '.gdb'
+    else:
+        db_fullname = db_name
+    return db_fullname
+
+# Main module: Check input parameters and call functions
+def main(conpath, db_name, overwrite, spatial_reference_name, environment_settings,
+         delete_existing, domains, datasets, features, tables, relations, update_features, update_tables,
+         update_domains, delete_features, delete_datasets, delete_domains, delete_all_domains, stage,
+         workers = None, mode = "create", plan = False, bulk_domain_threshold = None, journal = None,
+         cache = None, arcade_cache = None, strict_validation = "False", templates = None,
+         stage_batches = "False") -> None:
+    """Check input parameters and call functions
+
+    Optional:
+        workers -- The number of worker processes (default: 1 for file geodatabases).
+        mode -- "create": Creates and updates the objects as defined in the JSON file (default).
+                "diff": Compares the JSON file with the schema of the workspace and applies only the changes.
+        plan -- If the deployment is only planned (see function plan_model()).
+        bulk_domain_threshold -- The number of codes from which on the codes of a domain are loaded with
+                                 a single call of TableToDomain (default: BULK_DOMAIN_THRESHOLD).
+        journal -- An OperationJournal to resume a failed run (see function run_nodes()).
+        cache -- A ModelCache to skip the objects that have not been changed since they were applied
+                 (see function run_nodes()).
+        arcade_cache -- An ArcadeCache with the parsed Arcade expressions of previous runs
+                        (see function validate_attribute_rules()).
+        strict_validation -- "True": Nothing is changed if the validation of the data model finds errors
+                             (see function validate_model()). "False": The errors are logged only (default).
+        templates -- The definitions of the templates used by the feature classes and tables with the
+                     parameter "template_ref" (see function resolve_templates()).
+        stage_batches -- "True": Each stage of the deployment is applied as one unit and rolled back
+                         on errors (see class StageBatch). "False": The objects are processed one by one (default).
+    """
+    # define the path to the workspace (sde connection file oder gdb)
+    db_fullname = get_db_fullname(db_name, stage)
+    workspace = os.path.join(conpath, db_fullname)
+
+    # check if path exists
+    # Assumption: if it does not end with ".gdb" it's a file and not a folder
+    if plan and mode == "diff":
+        raise ValueError('The mode "diff" needs the schema of the workspace and can not be planned!')
+
+    # the parameters of the templates of the feature classes and tables
+    features = resolve_templates(templates, features)
+    tables = resolve_templates(templates, tables)
+
+    # (the workspace of an in-memory backend is created on the first access)
+    if isinstance(arcpy, ArcpyBackend):
+        if ".gdb" in db_fullname:
+            if not os.path.isdir(workspace):
+                logger.error(f'workspace "{workspace}" does not exist!')
+                raise ValueError(f'Workspace "{workspace}" does not exist!')
+        else:
+            if not os.path.isfile(workspace):
+                logger.error(f'Workspace "{workspace}" does not exist!')
+                raise ValueError(f'Workspace "{workspace}" does not exist!')
+
+    # check spatial reference system
+    spatial_reference = get_spatial_reference(spatial_reference_name)
+
+    # set workspace and env settings
+    overwrite = overwrite == 'True'
+    if environment_settings:
+        logger.info("Adjust default environment settings")
+    set_environment(workspace, overwrite, environment_settings)
+
+    sections = {'domains': domains, 'datasets': datasets, 'features': features, 'tables': tables,
+                'relations': relations, 'update_features': update_features, 'update_tables': update_tables,
+                'update_domains': update_domains, 'delete_features': delete_features,
+                'delete_datasets': delete_datasets, 'delete_domains': delete_domains,
+                'delete_all_domains': delete_all_domains}
+
+    # check the whole data model against itself and the workspace before the first geoprocessing tool is called
+    # (the existing objects are ignored if they are deleted beforehand). The catalog is loaded once here and
+    # used by the whole run: the catalog of a previous run in the same process is discarded, because the
+    # schema read from the workspace (e.g. the fields of the tables) is not updated by the functions.
+    logger.info("Validate the data model")
+    workspace_catalog = get_catalog(workspace, reload = True)
+    if delete_existing == 'True' and mode != "diff":
+        workspace_catalog = None
+    validation_errors = validate_model(workspace_catalog, **sections, templates = templates,
+                                       arcade_cache = arcade_cache)
+    if validation_errors:
+        logger.info(f'The validation of the data model has found {validation_errors} errors')
+        if strict_validation == 'True' and not plan:
+            raise ValueError(f'The data model is not valid ({validation_errors} errors), '
+                             f'the workspace has not been changed!')
+
+    # number of worker processes (opt-in, the objects are processed sequentially by default)
+    if workers is None:
+        workers = 1
+    # an in-memory backend can not be shared with worker processes
+    workers = max(1, int(workers)) if isinstance(arcpy, ArcpyBackend) else 1
+    # the stages are processed on the connection of the main process (a plan is not rolled back)
+    stage_batches = stage_batches == 'True' and not plan
+
+    # the checkpoint file of the backfills is passed to the worker processes
+    initargs = (workspace, overwrite, environment_settings, backfill_file)
+
+    # remove existing feature datasets, feature classes, tables and domains
+    if delete_existing == 'True':
+        if mode == "diff":
+            logger.warning('The parameter "DeleteAllExisting" is ignored in the mode "diff"')
+        elif journal and journal.is_done('DeleteAllExisting', delete_all, {'in_workspace': workspace}):
+            logger.info('"DeleteAllExisting" is skipped (done in a previous run)')
+        else:
+            logger.info("Delete all existing data")
+            errors = error_counter.count
+            delete_all(workspace, workers, initargs)
+            if cache:
+                cache.clear()
+            if journal and error_counter.count == errors:
+                journal.record('DeleteAllExisting', delete_all, {'in_workspace': workspace})
+
+    # apply only the differences between the model and the workspace
+    if mode == "diff":
+        if cache:
+            # the changes are determined from the workspace (the objects of the cache are not skipped)
+            logger.info('The cache is not used in the mode "diff"')
+            cache = None
+        logger.info("Compare the data model with the workspace")
+        sections = diff_model(workspace, **sections)
+
+    # the spatial reference is passed as string to the worker processes
+    if workers > 1 and not stage_batches:
+        spatial_reference = spatial_reference.exportToString()
+
+    # create, delete and update the objects in the order of their dependencies
+    nodes = build_nodes(workspace, spatial_reference, overwrite, **sections, bulk_threshold = bulk_domain_threshold)
+    if mode == "diff":
+        logger.info(f'{len(nodes)} objects have changed')
+    if stage_batches:
+        run_batches(nodes, workspace, journal, cache)
+    else:
+        if workers > 1:
+            logger.info(f'{len(nodes)} objects are processed with {workers} worker processes')
+        run_nodes(nodes, workers, initargs, journal, cache)
+    if journal and journal.skipped:
+        logger.info(f'{journal.skipped} operations have been skipped (done in a previous run)')
+    if cache and cache.skipped:
+        logger.info(f'{cache.skipped} objects have been skipped (unchanged since they were applied)')
+
+def read_parameters(param_file) -> tuple:
+    """Reads the JSON file of a data model.
+
+    Required:
+        param_file -- The path to the JSON file.
+
+    Return:
+        main_args -- The parameters of the function main() (without "mode").
+        logfolder -- The folder of the log files (parameter "LogFolder").
+        logversion -- The version of the log files (parameter "LogVersion").
+    """
+    # the items of the sections are read when they are used
+    data = ModelReader(param_file).read()
+    conpath = data["Conpath"]
+    db_name = data["DBName"]
+    overwrite = data["Overwrite"]
+    if "SpatialReferenceName" in data:
+        spatial_reference_name = data["SpatialReferenceName"]
+    else:
+        spatial_reference_name = "CH1903+ LV95"
+    if "EnvironmentSettings" in data:
+        environment_settings = data["EnvironmentSettings"]
+    else:
+        environment_settings = None
+    if "DeleteAllExisting" in data:
+        delete_existing = data["DeleteAllExisting"]
+    else:
+        delete_existing = "False"
+    if "Domains" in data:
+        domains = data["Domains"]
+    else:
+        domains = None
+    if "Datasets" in data:
+        datasets = data["Datasets"]
+    else:
+        datasets = None
+    if "Features" in data:
+        features = data["Features"]
+    else:
+        features = None
+    if "Tables" in data:
+        tables = data["Tables"]
+    else:
+        tables = None
+    if "Relations" in data:
+        relations = data["Relations"]
+    else:
+        relations = None
+    if "UpdateFeatures" in data:
+        update_features = data["UpdateFeatures"]
+    else:
+        update_features = None
+    if "UpdateTables" in data:
+        update_tables = data["UpdateTables"]
+    else:
+        update_tables = None
+    if "UpdateDomains" in data:
+        update_domains = data["UpdateDomains"]
+    else:
+        update_domains = None
+    if "DeleteFeatures" in data:
+        delete_features = data["DeleteFeatures"]
+    else:
+        delete_features = None
+    if "DeleteDatasets" in data:
+        delete_datasets = data["DeleteDatasets"]
+    else:
+        delete_datasets = None
+    if "DeleteDomains" in data:
+        delete_domains = data["DeleteDomains"]
+    else:
+        delete_domains = None
+    if "DeleteAllDomains" in data:
+        delete_all_domains = data["DeleteAllDomains"]
+    else:
+        delete_all_domains = "False"
+    # instead of the previously implemented parameter "Environment", the parameter "Stage" is used
+    if "Stage" in data:
+        stage = data["Stage"]
+    else:
+        stage = None
+    # parameter "Environment" maybe still used in an old version of a JSON-file
+    if not stage:
+        if "Environment" in data:
+            stage = data["Environment"]
+    if "Workers" in data:
+        workers = data["Workers"]
+    else:
+        workers = None
+    if "BulkDomainThreshold" in data:
+        bulk_domain_threshold = int(data["BulkDomainThreshold"])
+    else:
+        bulk_domain_threshold = None
+    if "Templates" in data:
+        templates = data["Templates"]
+    else:
+        templates = None
+    if "StrictValidation" in data:
+        strict_validation = data["StrictValidation"]
+    else:
+        strict_validation = "False"
+    if "StageBatches" in data:
+        stage_batches = data["StageBatches"]
+    else:
+        stage_batches = "False"
+
+    main_args = {'conpath': conpath, 'db_name': db_name, 'overwrite': overwrite,
+                 'spatial_reference_name': spatial_reference_name, 'environment_settings': environment_settings,
+                 'delete_existing': delete_existing, 'domains': domains, 'datasets': datasets,
+                 'features': features, 'tables': tables, 'relations': relations,
+                 'update_features': update_features, 'update_tables': update_tables,
+                 'update_domains': update_domains, 'delete_features': delete_features,
+                 'delete_datasets': delete_datasets, 'delete_domains': delete_domains,
+                 'delete_all_domains': delete_all_domains, 'stage': stage, 'workers': workers,
+                 'bulk_domain_threshold': bulk_domain_threshold, 'strict_validation': strict_validation,
+                 'templates': templates, 'stage_batches': stage_batches}
+    return main_args, data["LogFolder"], data["LogVersion"]
+
+def run_model(main_args, logfolder, log_name, console = True, resume = False, cache = None) -> dict:
+    """Creates or updates a data model (see function main()) and writes the log file and the profile
+    of the run to the log folder.
+
+    Required:
+        main_args -- The parameters of the function main().
+        logfolder -- The folder of the log files.
+        log_name -- The name of the log file without file ending.
+
+    Optional:
+        console -- If the messages are logged on the console.
+        resume -- If the operations done by the previous run are skipped (see class OperationJournal).
+        cache -- The use of the cache of the applied objects in the log folder (see class ModelCache):
+                 None: no cache (default), "use": skip the unchanged objects, "verify": skip the
+                 unchanged objects that match the workspace, "clear": apply all objects again.
+
+    Return:
+        result -- A dictionary with the path to the log file ("log"), the number of errors ("errors")
+                  and warnings ("warnings") and the duration of the run in seconds ("duration").
+    """
+    global catalog, backfill_file
+    # check if logfolder exists
+    if not os.path.isdir(logfolder):
+        try:
+            print(f'Creating a log folder: {logfolder}')
+            os.makedirs(logfolder, exist_ok = True)
+        except:
+            raise ValueError(f'The logfolder "{logfolder}" does not exist and could not be created!')
+
+    # initialise logging (a process may run several data models, see function run_batch())
+    log = os.path.join(logfolder, log_name + '.log')
+    handlers = init_logging(log, console)
+    profile.clear()
+    errors, warnings = error_counter.count, error_counter.warnings
+    catalog = None
+    # journal of the operations done (next to the log file)
+    workspace = os.path.join(main_args['conpath'], get_db_fullname(main_args['db_name'], main_args['stage']))
+    journal = OperationJournal(os.path.join(logfolder, log_name + '_journal.jsonl'), workspace, resume)
+    # checkpoints of the backfills of the fields (next to the journal)
+    backfill_file = os.path.join(logfolder, log_name + '_backfill.sqlite')
+    # parsed Arcade expressions of the previous runs
+    arcade_cache = ArcadeCache(os.path.join(logfolder, 'arcade_cache.json'))
+    model_cache = None
+    if cache:
+        model_cache = ModelCache(os.path.join(logfolder, 'model_cache.sqlite'), workspace, cache == 'verify')
+        if cache == 'clear':
+            model_cache.clear()
+    try:
+        logger.info('****************************************************************')
+        logger.info(f'Start logging: {time.ctime()}')
+        start_time = time.time()
+
+        # Main
+        try:
+            journal.open()
+            main(**main_args, journal = journal, cache = model_cache, arcade_cache = arcade_cache)
+        except Exception:
+            e = sys.exc_info()[1]
+            logger.error(f'The data model could not be created: {e}')
+            raise
+
+        # profile of the operations
+        profile_file = os.path.join(logfolder, log_name + '_profile')
+        write_profile(profile_file)
+        log_profile_summary()
+        logger.info(f'Profile written to "{profile_file}.json" and "{profile_file}.csv"')
+
+        # end logging
+        end_time = time.time()
+        i_error = error_counter.count - errors
+        i_warning = error_counter.warnings - warnings
+        logger.info("Datamodel created in " + str(round(end_time - start_time)) + " sec.")
+        logger.info(f'# {i_error} errors found')
+        logger.info(f'# {i_warning} warnings found')
+        logger.info(f'End time: {time.ctime()}')
+        logger.info('****************************************************************\n')
+    finally:
+        journal.close()
+        arcade_cache.save()
+        if model_cache:
+            model_cache.close()
+        close_logging(handlers)
+    return {'log': log, 'errors': i_error, 'warnings': i_warning, 'duration': round(end_time - start_time, 1)}
+
+def run_batch_model(main_args, logfolder, log_name, backend, resume = False, cache = None) -> dict:
+    """Runs a data model of a batch in a worker process (see function run_batch()). Errors are
+    returned instead of raised. The run does not start worker processes of its own ("Workers" is 1),
+    so that the number of processes is limited by "Processes" of the manifest.
+    """
+    if backend != 'arcpy':
+        set_backend(get_backend(backend))
+    main_args = dict(main_args, workers = 1)
+    try:
+        return run_model(main_args, logfolder, log_name, console = False, resume = resume, cache = cache)
+    except Exception:
+        e = sys.exc_info()[1]
+        return {'log': os.path.join(logfolder, log_name + '.log'), 'errors': None, 'warnings': None,
+                'duration': None, 'exception': f'{type(e).__name__}: {e}'}
+
+def run_batch(manifest, mode = "create", backend = "arcpy", resume = False, cache = None) -> list:
+    """Runs the data models of a manifest file on a pool of processes. Each run has its own log file.
+    Runs on the same workspace are limited to "WorkspaceLimit" at the same time (file geodatabases
+    and enterprise geodatabases do not allow parallel schema changes of the same objects) and are
+    started in the order of the manifest.
+
+    Manifest (JSON):
+        Runs -- A list of runs: "ParamFile" (the JSON file of the data model, relative to the manifest)
+                and optionally "Stage", "Conpath", "DBName" and "LogFolder", which replace the
+                parameters of the JSON file.
+        Processes -- The number of runs at the same time (optional, default: number of CPUs).
+        WorkspaceLimit -- The number of runs on the same workspace at the same time (optional, default: 1).
+        LogFolder -- The folder of the log files of all runs (optional, default: "LogFolder" of the JSON file).
+
+    Required:
+        manifest -- The path to the manifest file.
+
+    Optional:
+        mode -- The mode of the function main() for all runs.
+        backend -- The backend of the worker processes (see function get_backend()).
+        resume -- If the runs are resumed (see class OperationJournal).
+        cache -- The use of the cache of the applied objects (see function run_model()).
+
+    Return:
+        results -- A dictionary for each run (see function run_model()) with additionally the
+                   JSON file ("param_file"), the workspace ("workspace") and if it succeeded ("success").
+    """
+    with open(manifest, encoding = 'utf-8') as f:
+        data = json.load(f)
+    folder = os.path.dirname(os.path.abspath(manifest))
+    processes = int(data.get("Processes") or os.cpu_count() or 1)
+    workspace_limit = int(data.get("WorkspaceLimit") or 1)
+
+    results = []
+    pending = []
+    log_names = set()
+    for run in data["Runs"]:
+        param_file = os.path.join(folder, run["ParamFile"])
+        result = {'param_file': run["ParamFile"], 'workspace': None, 'log': None, 'errors': None,
+                  'warnings': None, 'duration': None, 'success': False}
+        results.append(result)
+        try:
+            main_args, logfolder, logversion = read_parameters(param_file)
+        except Exception:
+            e = sys.exc_info()[1]
+            result['exception'] = f'{type(e).__name__}: {e}'
+            continue
+        for key, parameter in (("Stage", 'stage'), ("Conpath", 'conpath'), ("DBName", 'db_name')):
+            if key in run:
+                main_args[parameter] = run[key]
+        main_args['mode'] = mode
+        logfolder = run.get("LogFolder") or data.get("LogFolder") or logfolder
+        db_fullname = get_db_fullname(main_args['db_name'], main_args['stage'])
+        result['workspace'] = os.path.join(main_args['conpath'], db_fullname)
+        # each run has its own log file
+        log_name = db_fullname + '_' + logversion
+        number = 1
+        while os.path.normcase(os.path.join(logfolder, log_name)) in log_names:
+            number += 1
+            log_name = f'{db_fullname}_{logversion}_{number}'
+        log_names.add(os.path.normcase(os.path.join(logfolder, log_name)))
+        pending.append((os.path.normcase(os.path.abspath(result['workspace'])), result,
+                        (main_args, logfolder, log_name, backend, resume, cache)))
 
-    logger.info('****************************************************************')
-    logger.info(f'Start logging: {time.ctime()}')
     start_time = time.time()
+    running = {}
+    workspace_runs = {}
+    finished = len(results) - len(pending)
+    with concurrent.futures.ProcessPoolExecutor(max_workers = processes) as executor:
+        while pending or running:
+            # the runs are started in the order of the manifest as far as the workspace limit allows
+            for item in list(pending):
+                if len(running) >= processes:
+                    break
+                workspace, result, args = item
+                if workspace_runs.get(workspace, 0) < workspace_limit:
+                    pending.remove(item)
+                    workspace_runs[workspace] = workspace_runs.get(workspace, 0) + 1
+                    running[executor.submit(run_batch_model, *args)] = (workspace, result)
+            done, _ = concurrent.futures.wait(running, return_when = concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                workspace, result = running.pop(future)
+                workspace_runs[workspace] -= 1
+                try:
+                    result.update(future.result())
+                except Exception:
+                    e = sys.exc_info()[1]
+                    result['exception'] = f'{type(e).__name__}: {e}'
+                result['success'] = 'exception' not in result and result['errors'] == 0
+                finished += 1
+                print(f'[{finished}/{len(results)}] {result["workspace"]}: '
+                      f'{"succeeded" if result["success"] else "failed"}'
+                      + (f' in {result["duration"]} sec.' if result['duration'] is not None else ''))
+    print_batch_summary(results, time.time() - start_time)
+    return results
+
+def print_batch_summary(results, duration) -> None:
+    """Prints the result and the duration of the runs of a batch (see function run_batch())."""
+    print('****************************************************************')
+    print(f'{"#":>3}  {"Status":<9} {"Errors":>6} {"Warnings":>8} {"Duration":>9}  Workspace / JSON file')
+    for i, result in enumerate(results, 1):
+        status = 'OK' if result['success'] else 'FAILED'
+        errors = '' if result['errors'] is None else result['errors']
+        warnings = '' if result['warnings'] is None else result['warnings']
+        run_duration = '' if result['duration'] is None else f'{result["duration"]:.1f} s'
+        print(f'{i:>3}  {status:<9} {errors:>6} {warnings:>8} {run_duration:>9}  '
+              f'{result["workspace"] or "-"} ({result["param_file"]})')
+        if 'exception' in result:
+            print(f'{"":>5}{result["exception"]}')
+        elif result['log'] and not result['success']:
+            print(f'{"":>5}see log file "{result["log"]}"')
+    succeeded = sum(1 for result in results if result['success'])
+    total = sum(result['duration'] or 0 for result in results)
+    print(f'{len(results)} runs: {succeeded} succeeded, {len(results) - succeeded} failed '
+          f'in {round(duration)} sec. (sum of the run durations: {round(total)} sec.)')
+    print('****************************************************************')
+
+if __name__ == "__main__":
+    # path to the input JSON-file and options
+    parser = argparse.ArgumentParser(description = 'Create and update an ArcGIS data model based on a JSON file.')
+    parser.add_argument('paramFile', nargs = '?', help = 'The path to the JSON file.')
+    parser.add_argument('--mode', choices = ['create', 'diff'], default = 'create',
+                        help = '"create": create and update the objects of the JSON file (default), '
+                               '"diff": apply only the differences between the JSON file and the workspace.')
+    parser.add_argument('--backend', choices = ['arcpy', 'fake'], default = 'arcpy',
+                        help = '"arcpy": change the workspace with ArcGIS Pro (default), '
+                               '"fake": run the model against an empty geodatabase simulated in memory (test).')
+    parser.add_argument('--plan', nargs = '?', const = '-', metavar = 'FILE',
+                        help = 'List the geoprocessing operations and their estimated durations without changing '
+                               'the workspace (arcpy is not required). The list is written as JSON to FILE if given.')
+    parser.add_argument('--batch', metavar = 'MANIFEST',
+                        help = 'Run the JSON files and stages/workspaces of a manifest file (JSON) on a pool of '
+                               'processes and print a summary.')
+    parser.add_argument('--resume', action = 'store_true',
+                        help = 'Resume a failed run: the operations recorded in the journal of the previous run '
+                               '(log folder) are skipped.')
+    parser.add_argument('--cache', nargs = '?', const = 'use', choices = ['use', 'verify', 'clear'],
+                        help = 'Skip the objects that have not been changed since they were applied to the workspace '
+                               '(cache in the log folder). "verify": check the skipped objects against the workspace, '
+                               '"clear": apply all objects again.')
+    parser.add_argument('--export', metavar = 'WORKSPACE',
+                        help = 'Export the schema of an existing workspace (gdb, sde connection file) into the JSON '
+                               'file "paramFile" instead of creating a data model.')
+    args = parser.parse_args()
+    paramFile = args.paramFile
+    #paramFile = r'C:\Datamodels\event_test.json'
+
+    if args.backend == 'arcpy' and not args.plan and importlib.util.find_spec('arcpy') is None:
+        print('arcpy is not available: only the options "--plan" and "--backend fake" can be used!')
+        sys.exit(1)
+
+    # run the data models of a manifest
+    if args.batch:
+        if args.plan:
+            print('The option "--plan" can not be combined with "--batch"!')
+            sys.exit(1)
+        results = run_batch(args.batch, args.mode, args.backend, args.resume, args.cache)
+        sys.exit(0 if all(result['success'] for result in results) else 1)
+
+    # export the schema of a workspace into a JSON file
+    if args.export:
+        if not paramFile:
+            print('No output JSON file specified!')
+            sys.exit(1)
+        if args.backend != 'arcpy':
+            set_backend(get_backend(args.backend))
+        init_logging(None)
+        model = export_model(args.export)
+        with open(paramFile, 'w', encoding = 'utf-8') as f:
+            json.dump(model, f, indent = 3, ensure_ascii = False)
+        print(f'The schema of "{args.export}" has been exported to "{paramFile}"')
+        sys.exit()
+
+    if paramFile:
+        # read the json-file
+        try:
+            main_args, logfolder, logversion = read_parameters(paramFile)
+        except ValueError:
+            print(f'The Parameter-JSON file is not valid: {sys.exc_info()[1]}')
+            sys.exit(1)
+        main_args['mode'] = args.mode
+    else:
+        print('No Parameter-JSON file specified!')
+        sys.exit()
+
+    # plan the deployment (only warnings and errors are logged on the console)
+    if args.plan:
+        init_logging(None)
+        logger.setLevel(logging.WARNING)
+        operations = plan_model(main_args, logfolder)
+        total = sum(operation['estimated_duration'] for operation in operations)
+        if args.plan == '-':
+            for operation in operations:
+                print(f'{operation["index"]:>5}  {operation["tool"]:<28} {operation["target"]:<40} '
+                      f'{operation["estimated_duration"]:>7.2f} s')
+            print(f'{len(operations)} operations, estimated duration: {round(total)} sec.')
+        else:
+            with open(args.plan, 'w', encoding = 'utf-8') as f:
+                json.dump({'operations': operations, 'estimated_duration': round(total, 3)},
+                          f, indent = 3, default = str)
+            print(f'{len(operations)} operations written to "{args.plan}", estimated duration: {round(total)} sec.')
+        sys.exit()
+
+    if args.backend != 'arcpy':
+        set_backend(get_backend(args.backend))
 
-    # Main
-    main(conpath, db_name, overwrite, spatial_reference_name, environment_settings, delete_existing, 
-         domains, datasets, features, tables, relations, update_features, update_tables, update_domains, 
-         delete_features, delete_datasets, delete_domains, delete_all_domains, stage)
-    
-    # end logging
-    end_time = time.time()
-    i_error = search(log, "error")
-    i_warning = search(log, "warning")
-    logger.info("Datamodel created in " + str(round(end_time - start_time)) + " sec.")
-    logger.info(f'# {i_error} errors found')
-    logger.info(f'# {i_warning} warnings found')
-    logger.info(f'End time: {time.ctime()}')
-    logger.info('****************************************************************\n')
+    run_model(main_args, logfolder, main_args['db_name'] + '_' + logversion, resume = args.resume,
+              cache = args.cache)
@@ -0,0 +1,964 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Name: fake_arcpy
+#
+# Purpose: In-memory backend of the script "create_db_model.py" (see function set_backend()).
+# The class "FakeArcpy" provides the part of arcpy used by the script and simulates a geodatabase
+# in memory: domains, feature datasets, feature classes, tables, fields, subtypes, attribute rules
+# and relationship classes. Only the rows written with the data access cursors are stored. The calls of
+# the geoprocessing tools are recorded in the list "operations" (e.g. to plan a deployment or to test the
+# script without ArcGIS Pro). All calls (including the functions that only read the geodatabase) are
+# counted in "calls" and can be slowed down by a latency per call (e.g. to benchmark the script, see
+# script "benchmark_db_model.py").
+#
+# Author: Timo Wicki, City of Lucerne
+#
+# Created: 18.10.2026
+# -----------------------------------------------------------------------------
+import os, re, copy, types, inspect, functools, csv, time, collections
+
+# field types of the geoprocessing tools -> field types of arcpy.Field
+FIELD_TYPES = {"SHORT": "SmallInteger", "LONG": "Integer", "BIGINTEGER": "BigInteger", "FLOAT": "Single",
+               "DOUBLE": "Double", "TEXT": "String", "DATE": "Date", "DATEONLY": "DateOnly",
+               "TIMEONLY": "TimeOnly", "TIMESTAMPOFFSET": "TimestampOffset", "BLOB": "Blob",
+               "RASTER": "Raster", "GUID": "Guid"}
+# field types of the geoprocessing tools -> field types of arcpy.da.Domain
+DOMAIN_TYPES = {"SHORT": "Short", "LONG": "Long", "BIGINTEGER": "BigInteger", "FLOAT": "Float",
+                "DOUBLE": "Double", "TEXT": "Text", "DATE": "Date", "DATEONLY": "DateOnly",
+                "TIMEONLY": "TimeOnly", "TIMESTAMPOFFSET": "TimestampOffset"}
+CARDINALITIES = {"ONE_TO_ONE": "OneToOne", "ONE_TO_MANY": "OneToMany", "MANY_TO_MANY": "ManyToMany"}
+
+class ExecuteError(Exception):
+    """Error of a geoprocessing tool (see arcpy.ExecuteError)."""
+
+class Field:
+    """Field of a table (see arcpy.Field)."""
+    def __init__(self, name, type, length = 0, aliasName = None, domain = '', required = False,
+                 isNullable = True, defaultValue = None):
+        self.name = name
+        self.type = type
+        self.length = length
+        self.aliasName = aliasName or name
+        self.domain = domain or ''
+        self.required = required
+        self.isNullable = isNullable
+        self.editable = not required
+        self.defaultValue = defaultValue
+        self.precision = 0
+        self.scale = 0
+        self.baseName = name
+
+class Domain:
+    """Attribute domain (see arcpy.da.Domain)."""
+    def __init__(self, name, description, domainType, type, splitPolicy = 'DefaultValue',
+                 mergePolicy = 'DefaultValue'):
+        self.name = name
+        self.description = description or ''
+        self.domainType = domainType
+        self.type = type
+        self.codedValues = {}
+        self.range = []
+        self.splitPolicy = splitPolicy
+        self.mergePolicy = mergePolicy
+        self.owner = ''
+
+class SpatialReference:
+    """Spatial reference (see arcpy.SpatialReference). Every name is accepted."""
+    def __init__(self, item = None, vcs = None):
+        self.name = str(item) if item is not None else 'Unknown'
+        self.VCS = vcs
+
+    def exportToString(self) -> str:
+        return self.name
+
+    def __str__(self) -> str:
+        return self.name
+
+class Workspace:
+    """Objects of a simulated geodatabase.
+
+    Attributes:
+        domains -- key of the domain -> Domain
+        objects -- key of the object -> dictionary with the key "dataType" and the properties of
+                   the object ("fields", "subtypes", "attributeRules", ...)
+    """
+    def __init__(self, path):
+        self.path = path
+        self.domains = {}
+        self.objects = {}
+
+def get_key(name) -> str:
+    """Returns the key of an object: the name without path and qualification in lowercase."""
+    return str(name).replace('\\', '/').rstrip('/').split('/')[-1].split('.')[-1].lower()
+
+def counted(function):
+    """Counts the call of a function in the dictionary "calls" of the class FakeArcpy and waits for
+    the latency of the function (see FakeArcpy.call())."""
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        getattr(self, 'arcpy', self).call(function.__name__)
+        return function(self, *args, **kwargs)
+    return wrapper
+
+def tool(function):
+    """Records the call of a geoprocessing tool in the list "operations" of the class FakeArcpy."""
+    signature = inspect.signature(function)
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        parameters = {}
+        for name, value in list(bound.arguments.items())[1:]:
+            if signature.parameters[name].kind == inspect.Parameter.VAR_KEYWORD:
+                parameters.update(value)
+            else:
+                parameters[name] = value
+        operation = {'tool': function.__name__, 'parameters': parameters}
+        self.arcpy.operations.append(operation)
+        self.arcpy.call(function.__name__)
+        try:
+            return function(self, *args, **kwargs)
+        except ExecuteError:
+            operation['error'] = True
+            raise
+    return wrapper
+
+class Management:
+    """Geoprocessing tools of the toolbox "arcpy.management" used by the script "create_db_model.py"."""
+    def __init__(self, arcpy):
+        self.arcpy = arcpy
+
+    # objects
+    @tool
+    def Delete(self, in_data, data_type = None):
+        if str(in_data).lower() in self.arcpy.views:
+            del self.arcpy.views[str(in_data).lower()]
+            return
+        workspace, key = self.arcpy.resolve(in_data)
+        if key not in workspace.objects:
+            raise ExecuteError(f'ERROR 000732: Input Data Element: Dataset {in_data} does not exist or is not supported')
+        self.arcpy.remove(workspace, key)
+
+    @tool
+    def MakeTableView(self, in_table, out_view, where_clause = None, workspace = None, field_info = None):
+        table = self.arcpy.get_table(in_table)
+        self.arcpy.views[str(out_view).lower()] = (table['catalogPath'], where_clause)
+
+    @tool
+    def CreateFeatureDataset(self, out_dataset_path, out_name, spatial_reference = None):
+        workspace, _ = self.arcpy.resolve(out_dataset_path, is_workspace = True)
+        self.arcpy.create(workspace, out_name, {'dataType': 'FeatureDataset', 'dataset': '',
+                                                'spatialReference': spatial_reference})
+
+    @tool
+    def CreateFeatureclass(self, out_path, out_name, geometry_type = 'POLYGON', template = None,
+                           has_m = 'DISABLED', has_z = 'DISABLED', spatial_reference = None, **kwargs):
+        workspace, dataset = self.arcpy.resolve_container(out_path)
+        fields = [Field('OBJECTID', 'OID', 4, required = True, isNullable = False),
+                  Field('Shape', 'Geometry', 0, required = True)]
+        # shape fields of a file geodatabase (SQL Server names in other workspaces)
+        file_gdb = workspace.path.lower().endswith('.gdb')
+        if str(geometry_type).upper() in ('POLYLINE', 'POLYGON'):
+            fields.append(Field('Shape_Length' if file_gdb else 'Shape.STLength()', 'Double', 8, required = True))
+        if str(geometry_type).upper() == 'POLYGON':
+            fields.append(Field('Shape_Area' if file_gdb else 'Shape.STArea()', 'Double', 8, required = True))
+        self.arcpy.create(workspace, out_name, {'dataType': 'FeatureClass', 'dataset': dataset,
+                                                'shapeType': str(geometry_type).capitalize(),
+                                                'spatialReference': spatial_reference,
+                                                'hasZ': str(has_z).upper() == 'ENABLED',
+                                                'hasM': str(has_m).upper() == 'ENABLED',
+                                                'fields': fields + self.arcpy.template_fields(template)})
+
+    @tool
+    def CreateTable(self, out_path, out_name, template = None, config_keyword = None, **kwargs):
+        workspace, dataset = self.arcpy.resolve_container(out_path)
+        if dataset:
+            raise ExecuteError(f'A table can not be created in the feature dataset "{dataset}"')
+        fields = [Field('OBJECTID', 'OID', 4, required = True, isNullable = False)]
+        self.arcpy.create(workspace, out_name, {'dataType': 'Table', 'dataset': '',
+                                                'fields': fields + self.arcpy.template_fields(template)})
+
+    @tool
+    def CreateRelationshipClass(self, origin_table, destination_table, out_relationship_class,
+                                relationship_type = 'SIMPLE', forward_label = None, backward_label = None,
+                                message_direction = 'NONE', cardinality = 'ONE_TO_ONE', attributed = 'NONE',
+                                origin_primary_key = None, origin_foreign_key = None,
+                                destination_primary_key = None, destination_foreign_key = None):
+        origin = self.arcpy.get_table(origin_table)
+        destination = self.arcpy.get_table(destination_table)
+        workspace, dataset = self.arcpy.resolve_container(os.path.dirname(str(out_relationship_class)) or None)
+        if not dataset and origin['dataset'] and origin['dataset'] == destination['dataset']:
+            dataset = origin['dataset']
+        attributed = str(attributed).upper() == 'ATTRIBUTED'
+        fields = []
+        if attributed:
+            # the foreign keys are created in the table of the relationship class
+            keys = ((origin, origin_primary_key), (destination, destination_primary_key))
+            fields.append(Field('RID', 'OID', 4, required = True, isNullable = False))
+            for (table, primary_key), foreign_key in zip(keys, (origin_foreign_key, destination_foreign_key)):
+                if primary_key and foreign_key:
+                    key_type = self.arcpy.get_field(table, primary_key).type
+                    fields.append(Field(foreign_key, 'Guid' if key_type == 'GlobalID' else key_type, 38))
+        else:
+            keys = ((origin, origin_primary_key), (destination, origin_foreign_key))
+        for table, key_field in keys:
+            if key_field:
+                self.arcpy.get_field(table, key_field)
+        origin_keys = [(origin_primary_key, 'OriginPrimary', ''), (origin_foreign_key, 'OriginForeign', '')]
+        destination_keys = [(destination_primary_key, 'DestinationPrimary', ''),
+                            (destination_foreign_key, 'DestinationForeign', '')] if attributed else []
+        self.arcpy.create(workspace, out_relationship_class, {
+            'dataType': 'RelationshipClass', 'dataset': dataset,
+            'originClassNames': [origin['name']], 'destinationClassNames': [destination['name']],
+            'isComposite': str(relationship_type).upper() == 'COMPOSITE',
+            'cardinality': CARDINALITIES.get(str(cardinality).upper(), cardinality),
+            'forwardPathLabel': forward_label or '', 'backwardPathLabel': backward_label or '',
+            'notification': message_direction,
+            'isAttributed': attributed, 'fields': fields,
+            'originClassKeys': [key for key in origin_keys if key[0]],
+            'destinationClassKeys': [key for key in destination_keys if key[0]],
+            'relationshipRules': []})
+
+    @tool
+    def AddRuleToRelationshipClass(self, in_rel_class, origin_subtype = None, origin_minimum = None,
+                                   origin_maximum = None, destination_subtype = None, destination_minimum = None,
+                                   destination_maximum = None):
+        relation = self.arcpy.get_object(in_rel_class, 'RelationshipClass')
+
+        def subtype_code(table_name, subtype):
+            # the subtype is given by its description (or its code)
+            if subtype is None or str(subtype) == '':
+                return None
+            workspace, _ = self.arcpy.resolve(relation['catalogPath'])
+            table = workspace.objects[get_key(table_name)]
+            for code, description in table.get('subtypes', {}).items():
+                if str(subtype) in (description, str(code)):
+                    return code
+            raise ExecuteError(f'The subtype "{subtype}" does not exist in "{table_name}"')
+
+        def cardinality(value):
+            return None if value is None or str(value) == '' else int(value)
+
+        relation['relationshipRules'].append({
+            'originSubtypeCode': subtype_code(relation['originClassNames'][0], origin_subtype),
+            'originMinimumCardinality': cardinality(origin_minimum),
+            'originMaximumCardinality': cardinality(origin_maximum),
+            'destinationSubtypeCode': subtype_code(relation['destinationClassNames'][0], destination_subtype),
+            'destinationMinimumCardinality': cardinality(destination_minimum),
+            'destinationMaximumCardinality': cardinality(destination_maximum)})
+
+    # domains
+    @tool
+    def CreateDomain(self, in_workspace, domain_name, domain_description = None, field_type = 'SHORT',
+                     domain_type = 'CODED', split_policy = 'DEFAULT', merge_policy = 'DEFAULT'):
+        workspace, _ = self.arcpy.resolve(in_workspace, is_workspace = True)
+        if domain_name.lower() in workspace.domains:
+            raise ExecuteError(f'Invalid value for Domain Name: {domain_name} already exists')
+        domain_type = 'CodedValue' if str(domain_type).upper() == 'CODED' else 'Range'
+        workspace.domains[domain_name.lower()] = Domain(domain_name, domain_description, domain_type,
+                                                        DOMAIN_TYPES.get(str(field_type).upper(), field_type))
+
+    @tool
+    def TableToDomain(self, in_table, code_field, description_field, in_workspace, domain_name,
+                      domain_description = None, update_option = 'APPEND'):
+        table = self.arcpy.get_table(in_table)
+        code_type = self.arcpy.get_field(table, code_field).type
+        self.arcpy.get_field(table, description_field)
+        workspace, _ = self.arcpy.resolve(in_workspace, is_workspace = True)
+        domain = workspace.domains.get(domain_name.lower())
+        if domain is None:
+            field_type = next(key for key, value in FIELD_TYPES.items() if value == code_type)
+            domain = Domain(domain_name, domain_description, 'CodedValue', DOMAIN_TYPES.get(field_type, 'Text'))
+            workspace.domains[domain_name.lower()] = domain
+        if str(update_option).upper() == 'REPLACE':
+            domain.codedValues = {}
+        for row in table['rows']:
+            domain.codedValues[self.arcpy.convert_code(domain, row[code_field])] = row[description_field]
+
+    @tool
+    def DeleteDomain(self, in_workspace, domain_name):
+        workspace, _ = self.arcpy.resolve(in_workspace, is_workspace = True)
+        self.arcpy.get_domain(workspace, domain_name)
+        for item in workspace.objects.values():
+            used = [field.name for field in item.get('fields', []) if field.domain.lower() == domain_name.lower()]
+            used += [field for domains in item.get('subtypeDomains', {}).values()
+                     for field, domain in domains.items() if domain.lower() == domain_name.lower()]
+            if used:
+                raise ExecuteError(f'The domain "{domain_name}" is used by the field "{used[0]}" of "{item["name"]}"')
+        del workspace.domains[domain_name.lower()]
+
+    @tool
+    def AlterDomain(self, in_workspace, in_domain, new_domain_name = None, new_domain_description = None,
+                    split_policy = None, merge_policy = None, new_domain_owner = None):
+        workspace, _ = self.arcpy.resolve(in_workspace, is_workspace = True)
+        domain = self.arcpy.get_domain(workspace, in_domain)
+        if new_domain_description:
+            domain.description = new_domain_description
+        if split_policy:
+            domain.splitPolicy = split_policy
+        if merge_policy:
+            domain.mergePolicy = merge_policy
+        if new_domain_name:
+            del workspace.domains[in_domain.lower()]
+            domain.name = new_domain_name
+            workspace.domains[new_domain_name.lower()] = domain
+
+    @tool
+    def AddCodedValueToDomain(self, in_workspace, domain_name, code, code_description):
+        workspace, _ = self.arcpy.resolve(in_workspace, is_workspace = True)
+        domain = self.arcpy.get_domain(workspace, domain_name)
+        if domain.domainType != 'CodedValue':
+            raise ExecuteError(f'The domain "{domain_name}" is not a coded value domain')
+        domain.codedValues[self.arcpy.convert_code(domain, code)] = code_description
+
+    @tool
+    def DeleteCodedValueFromDomain(self, in_workspace, domain_name, code):
+        workspace, _ = self.arcpy.resolve(in_workspace, is_workspace = True)
+        domain = self.arcpy.get_domain(workspace, domain_name)
+        codes = code if isinstance(code, (list, tuple)) else str(code).split(';')
+        for value in codes:
+            domain.codedValues.pop(self.arcpy.convert_code(domain, value), None)
+
+    @tool
+    def SetValueForRangeDomain(self, in_workspace, domain_name, min_value, max_value):
+        workspace, _ = self.arcpy.resolve(in_workspace, is_workspace = True)
+        domain = self.arcpy.get_domain(workspace, domain_name)
+        if domain.domainType != 'Range':
+            raise ExecuteError(f'The domain "{domain_name}" is not a range domain')
+        domain.range = [float(min_value), float(max_value)]
+
+    @tool
+    def AssignDomainToField(self, in_table, field_name, domain_name, subtype_code = None):
+        table = self.arcpy.get_table(in_table)
+        workspace, _ = self.arcpy.resolve(in_table)
+        domain = self.arcpy.get_domain(workspace, domain_name)
+        field = self.arcpy.get_field(table, field_name)
+        if subtype_code:
+            for code in self.arcpy.subtype_codes(table, subtype_code):
+                table['subtypeDomains'][code][field.name] = domain.name
+        else:
+            field.domain = domain.name
+
+    @tool
+    def RemoveDomainFromField(self, in_table, field_name, subtype_code = None):
+        table = self.arcpy.get_table(in_table)
+        field = self.arcpy.get_field(table, field_name)
+        if subtype_code:
+            for code in self.arcpy.subtype_codes(table, subtype_code):
+                table['subtypeDomains'][code].pop(field.name, None)
+        else:
+            field.domain = ''
+
+    # fields
+    @tool
+    def AddField(self, in_table, field_name, field_type, field_precision = None, field_scale = None,
+                 field_length = None, field_alias = None, field_is_nullable = 'NULLABLE',
+                 field_is_required = 'NON_REQUIRED', field_domain = None):
+        table = self.arcpy.get_table(in_table)
+        self.arcpy.add_field(table, in_table, field_name, field_type, field_length, field_alias, field_domain,
+                             field_is_nullable != 'NON_NULLABLE', field_is_required == 'REQUIRED')
+
+    @tool
+    def AddFields(self, in_table, field_description, template = None):
+        table = self.arcpy.get_table(in_table)
+        names = [str(row[0]).lower() for row in field_description]
+        for row in field_description:
+            if names.count(str(row[0]).lower()) > 1 or self.arcpy.find_field(table, row[0]) is not None:
+                raise ExecuteError(f'ERROR 000012: {row[0]} already exists')
+        for row in field_description:
+            row = list(row) + [None] * (6 - len(row))
+            self.arcpy.add_field(table, in_table, row[0], row[1], row[3], row[2], row[5])
+
+    @tool
+    def DeleteField(self, in_table, drop_field, method = 'DELETE_FIELDS'):
+        table = self.arcpy.get_table(in_table)
+        names = drop_field if isinstance(drop_field, (list, tuple)) else str(drop_field).split(';')
+        fields = [self.arcpy.get_field(table, name) for name in names]
+        for field in fields:
+            if field.required:
+                raise ExecuteError(f'The field {field.name} is required and can not be deleted')
+        for field in fields:
+            table['fields'].remove(field)
+            for domains in table.get('subtypeDomains', {}).values():
+                domains.pop(field.name, None)
+
+    @tool
+    def AlterField(self, in_table, field, new_field_name = None, new_field_alias = None, field_type = None,
+                   field_length = None, field_is_nullable = None, clear_field_alias = None):
+        table = self.arcpy.get_table(in_table)
+        existing = self.arcpy.get_field(table, field)
+        if new_field_name and new_field_name.lower() != existing.name.lower():
+            if self.arcpy.find_field(table, new_field_name) is not None:
+                raise ExecuteError(f'ERROR 000012: {new_field_name} already exists')
+            existing.name = new_field_name
+        if new_field_alias:
+            existing.aliasName = new_field_alias
+        if clear_field_alias in (True, 'TRUE', 'CLEAR_ALIAS'):
+            existing.aliasName = existing.name
+        if field_length:
+            existing.length = int(field_length)
+
+    @tool
+    def CalculateField(self, in_table, field, expression, expression_type = 'PYTHON3', code_block = None,
+                       field_type = 'TEXT', enforce_domains = None):
+        table = self.arcpy.get_table(in_table)
+        if self.arcpy.find_field(table, field) is None:
+            self.arcpy.add_field(table, in_table, field, field_type)
+        target = self.arcpy.get_field(table, field)
+        if not table['rows'] or not str(expression_type).upper().startswith('PYTHON'):
+            return
+        # only the rows of a table view are calculated
+        rows = UpdateCursor(table, [target], self.arcpy.views.get(str(in_table).lower(), (None, None))[1])
+        # Python expressions are evaluated row by row (Arcade expressions are not simulated)
+        namespace = {}
+        if code_block:
+            exec(code_block, namespace)
+        names = {}
+        for name in re.findall(r'!([^!]+)!', str(expression)):
+            names[name] = self.arcpy.get_field(table, name.strip())
+        code = re.sub(r'!([^!]+)!', lambda match: f'__row[{match.group(1)!r}]', str(expression))
+        values = []
+        for row in table['rows']:
+            if not rows.matches(row):
+                continue
+            try:
+                values.append(eval(code, namespace, {'__row': {name: row['OID@'] if item.type == 'OID' else
+                                                               row.get(item.name) for name, item in names.items()}}))
+            except Exception as e:
+                raise ExecuteError(f'ERROR 000539: {e.__class__.__name__}: {e}')
+        for value, _ in zip(values, rows):
+            if target.type == 'String' and value is not None:
+                value = str(value)
+            rows.updateRow([value])
+
+    @tool
+    def AddGlobalIDs(self, in_datasets):
+        names = in_datasets if isinstance(in_datasets, (list, tuple)) else str(in_datasets).split(';')
+        for name in names:
+            table = self.arcpy.get_table(name)
+            if not table.get('hasGlobalID'):
+                table['fields'].append(Field('GlobalID', 'GlobalID', 38, required = True, isNullable = False))
+                table['hasGlobalID'] = True
+                table['globalIDFieldName'] = 'GlobalID'
+
+    @tool
+    def EnableEditorTracking(self, in_dataset, creator_field = None, creation_date_field = None,
+                             last_editor_field = None, last_edit_date_field = None, add_fields = 'NO_ADD_FIELDS',
+                             record_dates_in = 'UTC'):
+        table = self.arcpy.get_table(in_dataset)
+        for field_name, field_type in ((creator_field, 'TEXT'), (creation_date_field, 'DATE'),
+                                       (last_editor_field, 'TEXT'), (last_edit_date_field, 'DATE')):
+            if field_name and self.arcpy.find_field(table, field_name) is None:
+                if add_fields != 'ADD_FIELDS':
+                    raise ExecuteError(f'ERROR 000728: Field {field_name} does not exist within table')
+                self.arcpy.add_field(table, in_dataset, field_name, field_type)
+        table.update({'editorTrackingEnabled': True, 'creatorFieldName': creator_field or '',
+                      'createdAtFieldName': creation_date_field or '', 'editorFieldName': last_editor_field or '',
+                      'editedAtFieldName': last_edit_date_field or ''})
+
+    @tool
+    def EnableAttachments(self, in_dataset):
+        table = self.arcpy.get_table(in_dataset)
+        if not table.get('hasGlobalID'):
+            raise ExecuteError(f'"{table["name"]}" does not have a GlobalID field')
+        workspace, _ = self.arcpy.resolve(in_dataset)
+        name = table['name'] + '__ATTACH'
+        if get_key(name) in workspace.objects:
+            return
+        fields = [Field('ATTACHMENTID', 'OID', 4, required = True, isNullable = False),
+                  Field('REL_GLOBALID', 'Guid', 38), Field('CONTENT_TYPE', 'String', 150),
+                  Field('ATT_NAME', 'String', 250), Field('DATA_SIZE', 'Integer', 4), Field('DATA', 'Blob', 0)]
+        self.arcpy.create(workspace, name, {'dataType': 'Table', 'dataset': '', 'fields': fields}, False)
+        self.arcpy.create(workspace, table['name'] + '__ATTACHREL', {
+            'dataType': 'RelationshipClass', 'dataset': table['dataset'],
+            'originClassNames': [table['name']], 'destinationClassNames': [name], 'isComposite': True,
+            'cardinality': 'OneToMany', 'forwardPathLabel': name, 'backwardPathLabel': table['name'],
+            'notification': 'NONE', 'isAttributed': False, 'fields': [], 'relationshipRules': []}, False)
+
+    @tool
+    def DisableEditorTracking(self, in_dataset, creator = 'DISABLE_CREATOR', creation_date = 'DISABLE_CREATION_DATE',
+                              last_editor = 'DISABLE_LAST_EDITOR', last_edit_date = 'DISABLE_LAST_EDIT_DATE'):
+        table = self.arcpy.get_table(in_dataset)
+        table.update({'editorTrackingEnabled': False, 'creatorFieldName': '', 'createdAtFieldName': '',
+                      'editorFieldName': '', 'editedAtFieldName': ''})
+
+    @tool
+    def DisableAttachments(self, in_dataset):
+        table = self.arcpy.get_table(in_dataset)
+        workspace, _ = self.arcpy.resolve(in_dataset)
+        if get_key(table['name'] + '__ATTACH') not in workspace.objects:
+            raise ExecuteError(f'"{table["name"]}" does not have attachments')
+        self.arcpy.remove(workspace, get_key(table['name'] + '__ATTACHREL'))
+        self.arcpy.remove(workspace, get_key(table['name'] + '__ATTACH'))
+
+    # subtypes
+    @tool
+    def SetSubtypeField(self, in_table, field = None, clear_value = False):
+        table = self.arcpy.get_table(in_table)
+        if clear_value or not field:
+            table['subtypeFieldName'] = ''
+            return
+        table['subtypeFieldName'] = self.arcpy.get_field(table, field).name
+
+    @tool
+    def AddSubtype(self, in_table, subtype_code, subtype_description):
+        table = self.arcpy.get_table(in_table)
+        if not table.get('subtypeFieldName'):
+            raise ExecuteError(f'"{table["name"]}" does not have a subtype field')
+        code = int(subtype_code)
+        if code in table['subtypes']:
+            raise ExecuteError(f'The subtype code {code} already exists')
+        table['subtypes'][code] = subtype_description
+        table['subtypeDomains'][code] = {}
+
+    @tool
+    def RemoveSubtype(self, in_table, subtype_code):
+        table = self.arcpy.get_table(in_table)
+        codes = subtype_code if isinstance(subtype_code, (list, tuple)) else str(subtype_code).split(';')
+        for code in self.arcpy.subtype_codes(table, ';'.join(str(code) for code in codes)):
+            del table['subtypes'][code]
+            del table['subtypeDomains'][code]
+
+    @tool
+    def SetDefaultSubtype(self, in_table, subtype_code):
+        table = self.arcpy.get_table(in_table)
+        table['defaultSubtypeCode'] = self.arcpy.subtype_codes(table, subtype_code)[0]
+
+    # attribute rules
+    @tool
+    def AddAttributeRule(self, in_table, name, type, script_expression, is_editable = 'EDITABLE',
+                         triggering_events = None, error_number = None, error_message = None, description = None,
+                         subtype = None, field = None, **kwargs):
+        table = self.arcpy.get_table(in_table)
+        self.arcpy.add_attribute_rule(table, name, type, script_expression, is_editable, triggering_events,
+                                      error_number, error_message, description, subtype, field)
+
+    @tool
+    def ImportAttributeRules(self, target_table, csv_file):
+        table = self.arcpy.get_table(target_table)
+        with open(csv_file, newline = '', encoding = 'utf-8') as f:
+            rows = list(csv.DictReader(f))
+        # the rules are imported completely or not at all
+        rules = list(table['attributeRules'])
+        try:
+            for row in rows:
+                events = [event for event in ('INSERT', 'UPDATE', 'DELETE') if row.get('TRIGGER' + event) == 'True']
+                self.arcpy.add_attribute_rule(table, row['NAME'], row['TYPE'].replace('esriART', ''),
+                                              row['SCRIPTEXPRESSION'],
+                                              'EDITABLE' if row.get('ISEDITABLE', 'True') == 'True' else 'NONEDITABLE',
+                                              ';'.join(events), row.get('ERRORNUMBER') or None,
+                                              row.get('ERRORMESSAGE'), row.get('DESCRIPTION'), row.get('SUBTYPE'),
+                                              row.get('FIELD'))
+        except ExecuteError:
+            table['attributeRules'] = rules
+            raise
+
+    @tool
+    def DeleteAttributeRule(self, in_table, names, type = None):
+        table = self.arcpy.get_table(in_table)
+        names = names if isinstance(names, (list, tuple)) else str(names).split(';')
+        for name in names:
+            rules = [rule for rule in table['attributeRules'] if rule['name'].lower() == name.strip().lower()]
+            if not rules:
+                raise ExecuteError(f'The attribute rule "{name}" does not exist')
+            table['attributeRules'].remove(rules[0])
+
+class DataAccess:
+    """Functions of the module "arcpy.da" used by the script "create_db_model.py"."""
+    def __init__(self, arcpy):
+        self.arcpy = arcpy
+
+    @counted
+    def ListDomains(self, in_workspace = None):
+        workspace, _ = self.arcpy.resolve(in_workspace or self.arcpy.env.workspace, is_workspace = True)
+        return [copy.deepcopy(domain) for domain in workspace.domains.values()]
+
+    @counted
+    def Describe(self, value):
+        workspace, key = self.arcpy.resolve(value)
+        if key is None:
+            children = [self.arcpy.describe(workspace, item) for item in workspace.objects.values()
+                        if not item['dataset']]
+            return {'dataType': 'Workspace', 'name': os.path.basename(workspace.path),
+                    'catalogPath': workspace.path, 'children': children}
+        if key not in workspace.objects:
+            raise OSError(f'"{value}" does not exist')
+        return self.arcpy.describe(workspace, workspace.objects[key])
+
+    @counted
+    def InsertCursor(self, in_table, field_names):
+        table = self.arcpy.get_table(in_table)
+        names = field_names if isinstance(field_names, (list, tuple)) else str(field_names).split(';')
+        return InsertCursor(table, [self.arcpy.get_field(table, name).name for name in names])
+
+    @counted
+    def SearchCursor(self, in_table, field_names, where_clause = None, spatial_reference = None,
+                     explode_to_points = False, sql_clause = (None, None)):
+        table = self.arcpy.get_table(in_table)
+        return SearchCursor(table, self.arcpy.cursor_fields(table, field_names), where_clause)
+
+    @counted
+    def UpdateCursor(self, in_table, field_names, where_clause = None, spatial_reference = None,
+                     explode_to_points = False, sql_clause = (None, None)):
+        table = self.arcpy.get_table(in_table)
+        return UpdateCursor(table, self.arcpy.cursor_fields(table, field_names), where_clause)
+
+    @counted
+    def ListSubtypes(self, table):
+        table = self.arcpy.get_table(table)
+        workspace, _ = self.arcpy.resolve(table['catalogPath'])
+
+        def field_values(domains):
+            values = {}
+            for field in table['fields']:
+                domain_name = domains.get(field.name, field.domain) if domains is not None else field.domain
+                domain = workspace.domains.get(domain_name.lower()) if domain_name else None
+                values[field.name] = (field.defaultValue, copy.deepcopy(domain))
+            return values
+
+        if not table.get('subtypeFieldName'):
+            return {0: {'Name': table['name'], 'Default': True, 'SubtypeField': '',
+                        'FieldValues': field_values(None)}}
+        return {code: {'Name': description, 'Default': code == table.get('defaultSubtypeCode'),
+                       'SubtypeField': table['subtypeFieldName'],
+                       'FieldValues': field_values(table['subtypeDomains'][code])}
+                for code, description in table['subtypes'].items()}
+
+class InsertCursor:
+    """Inserts rows into a table (see arcpy.da.InsertCursor). The rows are stored as dictionaries with
+    their object ID under the key "OID@"."""
+    def __init__(self, table, field_names):
+        self.table = table
+        self.field_names = list(field_names)
+
+    def insertRow(self, row):
+        # the object IDs are not reused after a row has been deleted
+        self.table['lastOID'] = self.table.get('lastOID', 0) + 1
+        self.table['rows'].append(dict(zip(self.field_names, row), **{'OID@': self.table['lastOID']}))
+        return self.table['lastOID']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+class SearchCursor:
+    """Reads the rows of a table (see arcpy.da.SearchCursor). The object ID of a row is stored under the
+    key "OID@" of the row (see class InsertCursor). The rows are always returned in the order of the
+    object IDs. A where clause may only compare fields with numbers ("OBJECTID >= 1 AND OBJECTID <= 100")."""
+    def __init__(self, table, fields, where_clause = None):
+        self.table = table
+        self.fields = fields
+        self.conditions = []
+        for condition in re.split(r'\s+AND\s+', str(where_clause or '').strip(), flags = re.IGNORECASE):
+            if not condition:
+                continue
+            match = re.fullmatch(r'(\w+)\s*(>=|<=|<>|=|<|>)\s*(-?[\d.]+)', condition.strip())
+            if match is None:
+                raise RuntimeError(f'An invalid SQL statement was used. [{where_clause}]')
+            field = next((field for field in table['fields'] if field.name.lower() == match.group(1).lower()), None)
+            if field is None:
+                raise RuntimeError(f'Cannot find field {match.group(1)}')
+            self.conditions.append((field, match.group(2), float(match.group(3))))
+
+    def matches(self, row):
+        for field, operator, value in self.conditions:
+            current = row['OID@'] if field.type == 'OID' else row.get(field.name)
+            if current is None or not {'>=': current >= value, '<=': current <= value, '<>': current != value,
+                                       '=': current == value, '<': current < value, '>': current > value}[operator]:
+                return False
+        return True
+
+    def read(self, row):
+        return tuple(row['OID@'] if field.type == 'OID' else row.get(field.name) for field in self.fields)
+
+    def __iter__(self):
+        for row in self.table['rows']:
+            if self.matches(row):
+                yield self.read(row)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+class UpdateCursor(SearchCursor):
+    """Updates and deletes the rows of a table (see arcpy.da.UpdateCursor). The values are checked against
+    the field types and lengths."""
+    def __iter__(self):
+        for row in list(self.table['rows']):
+            if self.matches(row):
+                self.row = row
+                yield self.read(row)
+
+    def deleteRow(self):
+        self.table['rows'].remove(self.row)
+
+    def updateRow(self, values):
+        for field, value in zip(self.fields, values):
+            if field.type == 'OID' or value is None:
+                continue
+            if field.type == 'String':
+                if not isinstance(value, str):
+                    raise TypeError(f'The value type is incompatible with the field type. [{field.name}]')
+                if len(value) > field.length:
+                    raise RuntimeError(f'The value is too long for the field. [{field.name}]')
+            elif field.type in ('SmallInteger', 'Integer', 'BigInteger') and not isinstance(value, int):
+                raise TypeError(f'The value type is incompatible with the field type. [{field.name}]')
+            elif field.type in ('Single', 'Double') and not isinstance(value, (int, float)):
+                raise TypeError(f'The value type is incompatible with the field type. [{field.name}]')
+        for field, value in zip(self.fields, values):
+            if field.type != 'OID':
+                self.row[field.name] = value
+
+class FakeArcpy:
+    """In-memory replacement of arcpy (see the description of the module). The geodatabases are
+    created on the first access to their path and are empty.
+
+    Attributes:
+        operations -- The recorded calls of the geoprocessing tools: a list of dictionaries with the
+                      keys "tool", "parameters" and "error" (only if the tool failed).
+        workspaces -- path of the workspace -> Workspace
+        views -- name of a table view (lower case) -> (path of the table, where clause)
+        calls -- name of the function -> number of calls (geoprocessing tools and functions that
+                 read the geodatabase, e.g. "ListDomains")
+
+    Optional:
+        latency -- The time in seconds a call waits before it is executed (simulates the response
+                   time of a geodatabase): a number for all functions or a dictionary with the names
+                   of the functions and the key "default" for the others (default: no latency).
+    """
+    ExecuteError = ExecuteError
+    SpatialReference = SpatialReference
+    Field = Field
+
+    def __init__(self, latency = None):
+        self.operations = []
+        self.workspaces = {}
+        self.views = {}
+        self.calls = collections.Counter()
+        self.latency = latency
+        self.env = types.SimpleNamespace(workspace = None, overwriteOutput = False)
+        self.management = Management(self)
+        self.da = DataAccess(self)
+
+    # functions of arcpy
+    @counted
+    def Exists(self, dataset) -> bool:
+        try:
+            workspace, key = self.resolve(dataset)
+        except ExecuteError:
+            return False
+        return key is None or key in workspace.objects
+
+    @counted
+    def ListFields(self, dataset, wild_card = None, field_type = None) -> list:
+        try:
+            table = self.get_table(dataset)
+        except ExecuteError:
+            raise OSError(f'"{dataset}" does not exist')
+        return [copy.deepcopy(field) for field in table['fields']]
+
+    # simulated geodatabase
+    def call(self, name) -> None:
+        """Counts the call of a function and waits for its latency."""
+        self.calls[name] += 1
+        if isinstance(self.latency, dict):
+            delay = self.latency.get(name, self.latency.get('default', 0))
+        else:
+            delay = self.latency
+        if delay:
+            time.sleep(delay)
+
+    def get_workspace(self, path) -> Workspace:
+        """Returns the workspace of a path (the workspace is created if it does not exist)."""
+        path = os.path.normpath(str(path).replace('\\', '/'))
+        key = path.lower()
+        if key not in self.workspaces:
+            self.workspaces[key] = Workspace(path)
+        return self.workspaces[key]
+
+    def resolve(self, path, is_workspace = False) -> tuple:
+        """Returns the workspace of an object and the key of the object (None for the workspace).
+        Paths without workspace (e.g. "ROAD") are relative to env.workspace.
+
+        Required:
+            path -- The path or the name of the workspace or the object.
+
+        Optional:
+            is_workspace -- If the path is the path of the workspace.
+        """
+        parts = str(path).replace('\\', '/').rstrip('/').split('/')
+        if is_workspace:
+            return self.get_workspace(path), None
+        for i in range(len(parts), 0, -1):
+            prefix = '/'.join(parts[:i])
+            if os.path.splitext(parts[i - 1])[1].lower() in ('.gdb', '.sde') or \
+                    parts[i - 1].lower() in ('memory', 'in_memory') or \
+                    os.path.normpath(prefix).lower() in self.workspaces:
+                return self.get_workspace(prefix), get_key(parts[-1]) if i < len(parts) else None
+        if not self.env.workspace:
+            raise ExecuteError(f'ERROR 000732: Dataset {path} does not exist or is not supported')
+        return self.get_workspace(self.env.workspace), get_key(parts[-1])
+
+    def resolve_container(self, path) -> tuple:
+        """Returns the workspace and the name of the feature dataset ("" for the workspace) of an output path."""
+        workspace, key = self.resolve(path or self.env.workspace)
+        if key is None:
+            return workspace, ''
+        dataset = workspace.objects.get(key)
+        if dataset is None or dataset['dataType'] != 'FeatureDataset':
+            raise ExecuteError(f'ERROR 000732: Output Location: Dataset {path} does not exist or is not supported')
+        return workspace, dataset['name']
+
+    def create(self, workspace, name, item, overwrite = None) -> None:
+        """Adds an object to the workspace. An existing object is only replaced if overwriteOutput is set."""
+        name = str(name).replace('\\', '/').split('/')[-1].split('.')[-1]
+        key = get_key(name)
+        if key in workspace.objects:
+            if not (self.env.overwriteOutput if overwrite is None else overwrite):
+                raise ExecuteError(f'ERROR 000258: Output {name} already exists')
+            self.remove(workspace, key)
+        item.update({'name': name, 'catalogPath': os.path.join(workspace.path, *([item['dataset'], name]
+                                                                                if item['dataset'] else [name]))})
+        if item['dataType'] in ('FeatureClass', 'Table'):
+            item.update({'subtypeFieldName': '', 'subtypes': {}, 'subtypeDomains': {}, 'defaultSubtypeCode': 0,
+                         'attributeRules': [], 'hasGlobalID': False, 'editorTrackingEnabled': False, 'rows': []})
+        workspace.objects[key] = item
+
+    def remove(self, workspace, key) -> None:
+        """Removes an object and the objects deleted with it (members of a feature dataset,
+        relationship classes and attachment tables of a table)."""
+        item = workspace.objects.pop(key, None)
+        if item is None:
+            return
+        if item['dataType'] == 'FeatureDataset':
+            for member in [k for k, other in workspace.objects.items() if other['dataset'] == item['name']]:
+                self.remove(workspace, member)
+        elif item['dataType'] in ('FeatureClass', 'Table'):
+            for other_key, other in list(workspace.objects.items()):
+                if other['dataType'] == 'RelationshipClass' and item['name'] in \
+                        other['originClassNames'] + other['destinationClassNames']:
+                    self.remove(workspace, other_key)
+            self.remove(workspace, key + '__attach')
+
+    def get_object(self, path, data_type = None) -> dict:
+        """Returns an object of a workspace (the table of a table view)."""
+        path = self.views.get(str(path).lower(), (path, None))[0]
+        workspace, key = self.resolve(path)
+        item = workspace.objects.get(key)
+        if item is None or (data_type and item['dataType'] not in data_type):
+            raise ExecuteError(f'ERROR 000732: Dataset {path} does not exist or is not supported')
+        return item
+
+    def get_table(self, path) -> dict:
+        """Returns a feature class, a table or an (attributed) relationship class."""
+        return self.get_object(path, ('FeatureClass', 'Table', 'RelationshipClass'))
+
+    def get_domain(self, workspace, domain_name) -> Domain:
+        """Returns a domain of a workspace."""
+        domain = workspace.domains.get(str(domain_name).lower())
+        if domain is None:
+            raise ExecuteError(f'The domain "{domain_name}" does not exist')
+        return domain
+
+    def convert_code(self, domain, code):
+        """Returns a code of a coded value domain in the type of the domain."""
+        if domain.type in ('Short', 'Long', 'BigInteger'):
+            return int(float(code))
+        if domain.type in ('Float', 'Double'):
+            return float(code)
+        return str(code)
+
+    def find_field(self, table, field_name) -> Field:
+        """Returns a field of a table or None."""
+        return next((field for field in table.get('fields', []) if field.name.lower() == str(field_name).lower()), None)
+
+    def get_field(self, table, field_name) -> Field:
+        """Returns a field of a table."""
+        field = self.find_field(table, field_name)
+        if field is None:
+            raise ExecuteError(f'ERROR 000728: Field {field_name} does not exist within table')
+        return field
+
+    def cursor_fields(self, table, field_names) -> list:
+        """Returns the fields of a cursor (the token "OID@" stands for the object ID field)."""
+        names = field_names if isinstance(field_names, (list, tuple)) else str(field_names).split(';')
+        fields = []
+        for name in names:
+            if str(name).upper() == 'OID@':
+                fields.append(next((field for field in table['fields'] if field.type == 'OID'), Field('OID@', 'OID')))
+            else:
+                fields.append(self.get_field(table, name))
+        return fields
+
+    def add_field(self, table, in_table, field_name, field_type, field_length = None, field_alias = None,
+                  field_domain = None, nullable = True, required = False) -> None:
+        """Adds a field to a table."""
+        if self.find_field(table, field_name) is not None:
+            raise ExecuteError(f'ERROR 000012: {field_name} already exists')
+        if field_domain:
+            workspace, _ = self.resolve(in_table)
+            field_domain = self.get_domain(workspace, field_domain).name
+        field_type = FIELD_TYPES.get(str(field_type).upper())
+        if field_type is None:
+            raise ExecuteError(f'The field type of {field_name} is not valid')
+        length = int(field_length) if field_length else (255 if field_type == 'String' else 0)
+        table['fields'].append(Field(field_name, field_type, length, field_alias, field_domain or '',
+                                     required, nullable))
+
+    def template_fields(self, template) -> list:
+        """Returns copies of the fields of template tables without OID, geometry and GlobalID fields."""
+        fields = []
+        names = template if isinstance(template, (list, tuple)) else str(template or '').split(';')
+        for name in [name for name in names if name]:
+            for field in self.get_table(name)['fields']:
+                if field.type not in ('OID', 'Geometry', 'GlobalID') and \
+                        all(other.name.lower() != field.name.lower() for other in fields):
+                    fields.append(copy.deepcopy(field))
+        return fields
+
+    def add_attribute_rule(self, table, name, type, script_expression, is_editable = 'EDITABLE',
+                           triggering_events = None, error_number = None, error_message = None, description = None,
+                           subtype = None, field = None) -> None:
+        """Adds an attribute rule to a table."""
+        if not table.get('hasGlobalID'):
+            raise ExecuteError(f'"{table["name"]}" does not have a GlobalID field')
+        if any(rule['name'].lower() == name.lower() for rule in table['attributeRules']):
+            raise ExecuteError(f'The attribute rule "{name}" already exists')
+        if field:
+            field = self.get_field(table, field).name
+        if subtype is not None and str(subtype) != '':
+            codes = [code for code, description in table.get('subtypes', {}).items()
+                     if str(subtype) in (description, str(code))]
+            if not codes:
+                raise ExecuteError(f'The subtype "{subtype}" does not exist in "{table["name"]}"')
+            subtype = codes[0]
+        events = [event.strip() for event in str(triggering_events or '').split(';') if event.strip()]
+        table['attributeRules'].append({
+            'name': name, 'type': 'esriART' + str(type).capitalize(), 'scriptExpression': script_expression,
+            'fieldName': field or '', 'triggeringEvents': ['esriARTE' + event.capitalize() for event in events],
+            'description': description or '', 'errorNumber': error_number, 'errorMessage': error_message or '',
+            'isEnabled': True, 'isEditable': is_editable != 'NONEDITABLE', 'subtypeCode': subtype})
+
+    def subtype_codes(self, table, subtype_code) -> list:
+        """Returns the codes of subtypes like "1: Event;2: Boulevard" as integers."""
+        codes = []
+        for subtype in str(subtype_code).split(';'):
+            code = int(float(subtype.split(':')[0].strip()))
+            if code not in table.get('subtypes', {}):
+                raise ExecuteError(f'The subtype code {code} does not exist in "{table["name"]}"')
+            codes.append(code)
+        return codes
+
+    def describe(self, workspace, item) -> dict:
+        """Returns a copy of an object in the form of arcpy.da.Describe."""
+        describe = copy.deepcopy({key: value for key, value in item.items()
+                                  if key not in ('subtypes', 'subtypeDomains', 'defaultSubtypeCode', 'rows')})
+        describe['baseName'] = item['name']
+        if item['dataType'] == 'FeatureDataset':
+            describe['children'] = [self.describe(workspace, other) for other in workspace.objects.values()
+                                    if other['dataset'] == item['name']]
+        return describe
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Fixtures of the tests of the script "create_db_model.py". The tests use the in-memory backend
+# (see module fake_arcpy), so they run without ArcGIS Pro.
+import os, sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import create_db_model
+
+TUTORIALS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tutorial')
+
+@pytest.fixture
+def fake(tmp_path):
+    """Sets a new in-memory backend, logs without console and returns the backend."""
+    backend = create_db_model.get_backend('fake')
+    create_db_model.set_backend(backend)
+    handlers = create_db_model.init_logging(None, console = False)
+    create_db_model.catalog = None
+    yield backend
+    create_db_model.close_logging(handlers)
+    create_db_model.catalog = None
+
+def read_tutorial(number, name, conpath):
+    """Returns the parameters of the function main() of a tutorial JSON file with another workspace folder."""
+    main_args, _, _ = create_db_model.read_parameters(
+        os.path.join(TUTORIALS, f'tutorial_{number}', f'tutorial_{number}_{name}.json'))
+    main_args['conpath'] = str(conpath)
+    return main_args
+
+FIELDS = [('A', 'LONG', None), ('B', 'DOUBLE', None), ('N', 'DOUBLE', None), ('S', 'TEXT', 10),
+          ('L', 'LONG', None), ('D', 'DOUBLE', None), ('T', 'TEXT', 10)]
+
+def create_table(fake, workspace, name, rows = 10):
+    """Creates a table with the fields FIELDS and rows with the values of A, B, N (null in the last row) and S."""
+    fake.management.CreateTable(workspace, name)
+    for field_name, field_type, field_length in FIELDS:
+        fake.management.AddField(f'{workspace}/{name}', field_name, field_type, field_length = field_length)
+    with fake.da.InsertCursor(f'{workspace}/{name}', ['A', 'B', 'N', 'S']) as cursor:
+        for i in range(rows):
+            cursor.insertRow([i, i * 0.5, None if i == rows - 1 else i * 1.5, 'x' * (i % 4 + 1)])
+    return f'{workspace}/{name}'
+
+@pytest.fixture
+def workspace(fake, tmp_path):
+    workspace = str(tmp_path / 'model.gdb')
+    fake.env.workspace = workspace
+    return workspace
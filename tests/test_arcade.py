@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Tests of the offline validation of the Arcade expressions of the attribute rules (see class ArcadeParser).
+import pytest
+
+import create_db_model
+
+@pytest.mark.parametrize('expression, error', [
+    ('return $feature.A + ;', 'Unexpected ";" (line 1, column 21)'),
+    ('var x = 1\nif (x > 0 {\n  return 1\n}', '")" expected instead of "{" (line 2, column 11)'),
+    ('return "abc', 'Unterminated string (line 1, column 8)'),
+    ('var a = [1, 2;\nreturn a', '"," expected instead of ";" (line 1, column 14)'),
+    ('/* never closed', 'Unterminated comment (line 1, column 1)'),
+    ('var x = 1 @ 2', 'Unexpected character "@" (line 1, column 11)'),
+])
+def test_syntax_error_positions(expression, error):
+    assert create_db_model.ArcadeParser(expression).parse()['error'] == error
+
+def test_references():
+    result = create_db_model.ArcadeParser(
+        "// the number of events\nvar events = FeatureSetByName($datastore, 'EVENT', ['NAME', 'START_DATE'])\n"
+        "var related = FeatureSetByRelationshipName($feature, 'EVENT_LOCATION_REL')\n"
+        "if (IsEmpty($feature['OWNER'])) { return $originalFeature.NAME }\nreturn Count(events)").parse()
+    assert result == {'error': None, 'fields': ['OWNER', 'NAME'], 'tables': [['EVENT', ['NAME', 'START_DATE']]],
+                      'relations': ['EVENT_LOCATION_REL']}
+
+def test_rules_validated_against_model(fake, caplog):
+    symbols = create_db_model.ModelSymbols()
+    symbols.add('LOCATION', 'FeatureClass', 'Features[0]', {'name': 'TEXT', 'owner': 'TEXT'})
+    rules = [{'name': 'Valid', 'script_expression': 'return $feature.NAME'},
+             {'name': 'Syntax', 'script_expression': 'return ($feature.NAME'},
+             {'name': 'Field', 'script_expression': 'return $feature.MISSING'},
+             {'name': 'Table', 'script_expression': "return Count(FeatureSetByName($datastore, 'OTHER'))"}]
+    assert create_db_model.validate_attribute_rules(symbols, [('Features[0]', 'LOCATION', rules)]) == 2
+    assert 'Features[0]: The Arcade expression of the attribute rule "Syntax" of "LOCATION" is not valid: ' \
+           '")" expected instead of the end (line 1, column 22)' in caplog.text
+    assert 'The field "MISSING" used in the attribute rule "Field" of "LOCATION" does not exist' in caplog.text
+    # a table that is neither defined nor exists is a warning
+    assert [record.levelname for record in caplog.records if '"OTHER"' in record.getMessage()] == ['WARNING']
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Tests of the ranges of object IDs and the checkpoints of a backfill (see function backfill_fields()) 
+# and of the calculation of fields without NumPy. These tests do not need NumPy.
+import create_db_model
+
+from conftest import create_table
+
+def test_oid_ranges(fake, workspace):
+    in_table = create_table(fake, workspace, 'T', rows = 10)
+    assert create_db_model.get_oid_ranges(in_table, 'OBJECTID', 4) == [(1, 4, 4), (5, 8, 4), (9, 10, 2)]
+    assert create_db_model.get_oid_ranges(in_table, 'OBJECTID', 10) == [(1, 10, 10)]
+    assert create_db_model.get_oid_ranges(create_table(fake, workspace, 'EMPTY', rows = 0), 'OBJECTID', 4) == []
+    # the ranges end before the skipped object IDs
+    assert create_db_model.get_oid_ranges(in_table, 'OBJECTID', 4, [(5, 6), (1, 2)]) == \
+        [(3, 4, 2), (7, 10, 4)]
+
+def test_checkpoint(tmp_path):
+    checkpoint = create_db_model.BackfillCheckpoint(str(tmp_path / 'backfill.sqlite'), 'T:1')
+    other = create_db_model.BackfillCheckpoint(str(tmp_path / 'backfill.sqlite'), 'T:2')
+    checkpoint.record(1, 3)
+    checkpoint.record(4, 6)
+    other.record(1, 10)
+    assert sorted(checkpoint.ranges()) == [(1, 3), (4, 6)]
+    checkpoint.clear()
+    assert checkpoint.ranges() == [] and other.ranges() == [(1, 10)]
+    checkpoint.close()
+    other.close()
+
+def test_calculations_without_numpy(fake, workspace, monkeypatch):
+    import_module = create_db_model.importlib.import_module
+
+    def without_numpy(name, *args):
+        if name == 'numpy':
+            raise ImportError(name)
+        return import_module(name, *args)
+
+    monkeypatch.setattr(create_db_model.importlib, 'import_module', without_numpy)
+    in_table = create_table(fake, workspace, 'T', rows = 3)
+    create_db_model.calculate_fields(in_table, [{'field': 'L', 'expression': '!A! + 1'}], chunk_size = 2)
+    assert [operation['parameters']['field'] for operation in fake.operations
+            if operation['tool'] == 'CalculateField' and operation['parameters']['in_table'] == in_table] == ['L']
+    with fake.da.SearchCursor(in_table, ['A', 'L']) as cursor:
+        assert [l for _, l in cursor] == [1, 2, 3]
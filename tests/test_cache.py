@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Tests of the cache of the objects applied to the workspaces (see class ModelCache).
+import create_db_model
+from conftest import read_tutorial
+
+def run(fake, main_args, logfolder, cache) -> list:
+    """Runs the function run_model() and returns the geoprocessing tools called."""
+    operations = len(fake.operations)
+    create_db_model.run_model(main_args, str(logfolder), 'model_v01', console = False, cache = cache)
+    return [operation['tool'] for operation in fake.operations[operations:]]
+
+def tutorial(tmp_path) -> dict:
+    # without "DeleteAllExisting", so that a run applies only the objects of the JSON file
+    return dict(read_tutorial(1, 'create', tmp_path), delete_existing = False)
+
+def test_unchanged_objects_are_skipped(fake, tmp_path):
+    main_args = tutorial(tmp_path)
+    tools = run(fake, main_args, tmp_path / 'Logs', 'use')
+    assert run(fake, main_args, tmp_path / 'Logs', 'use') == []
+    # all objects are applied again
+    cleared = run(fake, main_args, tmp_path / 'Logs', 'clear')
+    for tool in ['CreateDomain', 'CreateFeatureDataset', 'CreateFeatureclass', 'CreateRelationshipClass']:
+        assert cleared.count(tool) == tools.count(tool) > 0
+
+def test_changed_object_is_applied_with_dependents(fake, tmp_path):
+    main_args = tutorial(tmp_path)
+    run(fake, main_args, tmp_path / 'Logs', 'use')
+    main_args['features'] = [create_db_model.load_item(item) for item in main_args['features']]
+    main_args['features'][0]['out_alias'] = 'Location'
+    operations = len(fake.operations)
+    assert run(fake, main_args, tmp_path / 'Logs', 'use') == [
+        'Delete', 'CreateFeatureclass', 'AddGlobalIDs', 'AddFields', 'EnableEditorTracking',
+        'CreateRelationshipClass', 'AddAttributeRule']
+    # the feature class "ASSET" has not been changed
+    assert all(operation['parameters'].get('in_table', 'LOCATION') == 'LOCATION'
+               for operation in fake.operations[operations:] if operation['tool'] == 'AddFields')
+    assert run(fake, main_args, tmp_path / 'Logs', 'use') == []
+
+def test_verify_against_workspace(fake, tmp_path):
+    main_args = tutorial(tmp_path)
+    run(fake, main_args, tmp_path / 'Logs', 'use')
+    # a field deleted outside of the data model is only found with "verify"
+    fake.management.DeleteField(f'{tmp_path}/infrastructure_management.gdb/ASSET', 'HEIGHT')
+    assert run(fake, main_args, tmp_path / 'Logs', 'use') == []
+    tools = run(fake, main_args, tmp_path / 'Logs', 'verify')
+    assert tools[:2] == ['Delete', 'CreateFeatureclass'] and 'CreateDomain' not in tools
+    fields = fake.get_table(f'{tmp_path}/infrastructure_management.gdb/ASSET')['fields']
+    assert 'HEIGHT' in [field.name for field in fields]
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# Tests of the calculation of fields with cursors and NumPy (see function calculate_fields()). The results
+# are compared with the tool CalculateField of the in-memory backend (see module fake_arcpy).
+import pytest
+
+import create_db_model, fake_arcpy
+from conftest import FIELDS, create_table
+
+numpy = pytest.importorskip('numpy')
+
+def read_rows(fake, in_table):
+    with fake.da.SearchCursor(in_table, [name for name, _, _ in FIELDS]) as cursor:
+        return list(cursor)
+
+def calculated_with_tool(fake, in_table):
+    """Returns the fields calculated with the tool CalculateField."""
+    return [operation['parameters']['field'] for operation in fake.operations
+            if operation['tool'] == 'CalculateField' and operation['parameters']['in_table'] == in_table]
+
+def fallback_calls(fake, in_table):
+    """Returns the calls of the tool CalculateField: tuples (field, where clause of the table view or None)."""
+    calls, where_clause = [], None
+    for operation in fake.operations:
+        if operation['tool'] == 'MakeTableView':
+            where_clause = operation['parameters']['where_clause']
+        elif operation['tool'] == 'CalculateField' and operation['parameters']['in_table'] == in_table:
+            calls.append((operation['parameters']['field'], None))
+        elif operation['tool'] == 'CalculateField' and \
+                operation['parameters']['in_table'] == create_db_model.CALCULATION_VIEW:
+            calls.append((operation['parameters']['field'], where_clause))
+    return calls
+
+BATCHES = {1: 'OBJECTID >= 1 AND OBJECTID <= 3', 2: 'OBJECTID >= 4 AND OBJECTID <= 6',
+           3: 'OBJECTID >= 7 AND OBJECTID <= 9', 4: 'OBJECTID >= 10 AND OBJECTID <= 10'}
+
+@pytest.mark.parametrize('batch_rows', [3, 50000])
+@pytest.mark.parametrize('calculations, fallback, batches', [
+    ([{'field': 'L', 'expression': '7'}], [], []),
+    ([{'field': 'L', 'expression': '!A!'}], [], []),
+    ([{'field': 'D', 'expression': '!A! * 2 + !B! - 1'}, {'field': 'D', 'expression': '!D! / 4'}], [], []),
+    ([{'field': 'L', 'expression': '!A! // 3 % 2 + !A! ** 2'}], [], []),
+    ([{'field': 'T', 'expression': '!S! + "-" + !S!'}], [], []),
+    ([{'field': 'L', 'expression': '$feature.A * 3', 'expression_type': 'ARCADE'}], None, []),
+    # a null value (in the last batch), values too long for the field, a float result for an integer field
+    ([{'field': 'D', 'expression': '!N!'}], ['D'], [4]),
+    ([{'field': 'T', 'expression': '!S! + "abcdefghi"'}], ['T'], [1, 2, 3, 4]),
+    ([{'field': 'L', 'expression': '!A! / 2'}], ['L'], [1, 2, 3, 4]),
+    # values out of the range of the integer field (from the second batch on) and an integer overflow
+    ([{'field': 'L', 'expression': '!A! * 1000000000'}], ['L'], [2, 3, 4]),
+    ([{'field': 'L', 'expression': '!A! ** 40'}], ['L'], [1, 2, 3, 4]),
+    # all calculations of a batch are calculated with the tool, the other batches with cursors
+    ([{'field': 'D', 'expression': '!N!'}, {'field': 'L', 'expression': '!A! + 1'}], ['D', 'L'], [4]),
+])
+def test_calculations_match_calculate_field(fake, workspace, monkeypatch, calculations, fallback, batches,
+                                            batch_rows):
+    monkeypatch.setattr(create_db_model, 'CALCULATION_BATCH_ROWS', batch_rows)
+    expected = create_table(fake, workspace, 'EXPECTED')
+    for dic_field in calculations:
+        create_db_model.calculate_field(expected, **dic_field)
+    in_table = create_table(fake, workspace, 'CALCULATED')
+    create_db_model.calculate_fields(in_table, calculations)
+    if fallback is None:
+        # Arcade expressions are not simulated by the tool CalculateField of the backend
+        with fake.da.SearchCursor(in_table, ['A', 'L']) as cursor:
+            assert all(l == a * 3 for a, l in cursor)
+    else:
+        assert read_rows(fake, in_table) == read_rows(fake, expected)
+        if batch_rows == 3:
+            assert fallback_calls(fake, in_table) == [(field, BATCHES[batch]) for batch in batches
+                                                      for field in fallback]
+        else:
+            assert fallback_calls(fake, in_table) == [(field, None) for field in (fallback if batches else [])]
+
+def test_integer_overflow(fake):
+    tree, fields = create_db_model.compile_calculation('!A! * !A! + 1')
+    assert fields == ['A']
+    assert create_db_model.evaluate_calculation(tree, [numpy.asarray([2 ** 31])], numpy).tolist() == [2 ** 62 + 1]
+    # 2 ** 64 wraps around to 0 with int64 arrays
+    with pytest.raises(OverflowError):
+        create_db_model.evaluate_calculation(tree, [numpy.asarray([1, 2 ** 32])], numpy)
+
+def test_failed_batch_is_calculated_with_tool(fake, workspace, monkeypatch):
+    monkeypatch.setattr(create_db_model, 'CALCULATION_BATCH_ROWS', 3)
+    calculations = [{'field': 'L', 'expression': '!L! + !A!'}, {'field': 'D', 'expression': '!B! * 2'}]
+    expected = create_table(fake, workspace, 'EXPECTED')
+    for field_name in ('L', 'D'):
+        fake.management.CalculateField(expected, field_name, '0')
+    for dic_field in calculations:
+        create_db_model.calculate_field(expected, **dic_field)
+    in_table = create_table(fake, workspace, 'CALCULATED')
+    for field_name in ('L', 'D'):
+        fake.management.CalculateField(in_table, field_name, '0')
+    # the second batch (object IDs 4 to 6) can not be written after its first row
+    update_row = fake_arcpy.UpdateCursor.updateRow
+    failed = []
+
+    def fail_once(cursor, values):
+        if not failed and cursor.fields[0].type == 'OID' and values[0] == 5:
+            failed.append(values[0])
+            raise RuntimeError('The table is locked')
+        update_row(cursor, values)
+
+    monkeypatch.setattr(fake_arcpy.UpdateCursor, 'updateRow', fail_once)
+    create_db_model.calculate_fields(in_table, calculations)
+    # the first batch is not calculated again and the second batch is restored before the tool is used
+    assert read_rows(fake, in_table) == read_rows(fake, expected)
+    assert failed
+    views = [operation['parameters']['where_clause'] for operation in fake.operations
+             if operation['tool'] == 'MakeTableView']
+    assert views == ['OBJECTID >= 4 AND OBJECTID <= 6'] * 2
+    assert calculated_with_tool(fake, create_db_model.CALCULATION_VIEW) == ['L', 'D']
+
+@pytest.fixture
+def backfill(fake, workspace, tmp_path, monkeypatch):
+    """Returns a table with the results of CalculateField and a function that backfills a table with
+    the same calculations in ranges of 3 rows (the ranges read are recorded in the list "read")."""
+    monkeypatch.setattr(create_db_model, 'backfill_file', str(tmp_path / 'backfill.sqlite'))
+    calculations = [{'field': 'L', 'expression': '!L! + !A!'}, {'field': 'D', 'expression': '!N!'}]
+    expected = create_table(fake, workspace, 'EXPECTED')
+    fake.management.CalculateField(expected, 'L', '0')
+    for dic_field in calculations:
+        create_db_model.calculate_field(expected, **dic_field)
+    read_calculations = create_db_model.read_calculations
+
+    def read_range(in_table, calculations, numpy, where_clause = None):
+        run.read.append(where_clause)
+        return read_calculations(in_table, calculations, numpy, where_clause)
+
+    def run(in_table):
+        create_db_model.calculate_fields(in_table, calculations, chunk_size = 3)
+
+    run.read = []
+    run.expected = expected
+    monkeypatch.setattr(create_db_model, 'read_calculations', read_range)
+    return run
+
+def test_backfill_matches_calculate_field(fake, workspace, backfill, caplog):
+    in_table = create_table(fake, workspace, 'CALCULATED')
+    fake.management.CalculateField(in_table, 'L', '0')
+    backfill(in_table)
+    assert read_rows(fake, in_table) == read_rows(fake, backfill.expected)
+    assert len(backfill.read) == 4
+    # the null value of the last range: the range is calculated with the tool CalculateField
+    assert 'The object IDs 10 to 10' in caplog.text and 'have not been calculated' not in caplog.text
+    assert [operation['parameters']['where_clause'] for operation in fake.operations
+            if operation['tool'] == 'MakeTableView'] == ['OBJECTID >= 10 AND OBJECTID <= 10'] * 2
+
+def test_backfill_continues_from_checkpoint(fake, workspace, backfill, monkeypatch):
+    in_table = create_table(fake, workspace, 'CALCULATED')
+    fake.management.CalculateField(in_table, 'L', '0')
+    write_calculations = create_db_model.write_calculations
+
+    def stop_at_third_range(in_table, oids, results, where_clause = None):
+        if oids[0] == 7:
+            raise KeyboardInterrupt
+        write_calculations(in_table, oids, results, where_clause)
+
+    monkeypatch.setattr(create_db_model, 'write_calculations', stop_at_third_range)
+    with pytest.raises(KeyboardInterrupt):
+        backfill(in_table)
+    monkeypatch.setattr(create_db_model, 'write_calculations', write_calculations)
+    backfill.read.clear()
+    backfill(in_table)
+    # the first two ranges are not calculated again ("!L! + !A!" is applied once)
+    assert backfill.read == ['OBJECTID >= 7 AND OBJECTID <= 9', 'OBJECTID >= 10 AND OBJECTID <= 10']
+    assert read_rows(fake, in_table) == read_rows(fake, backfill.expected)
+
+def change_rows(fake, in_table, calculated = False):
+    """Deletes the row with the object ID 2 and inserts a row (object ID 11, calculated: with the results
+    of the backfill)."""
+    with fake.da.UpdateCursor(in_table, ['OID@'], 'OBJECTID = 2') as cursor:
+        for _ in cursor:
+            cursor.deleteRow()
+    with fake.da.InsertCursor(in_table, ['A', 'B', 'N', 'S', 'L', 'D']) as cursor:
+        cursor.insertRow([20, 1.0, 3.0, 'y', 20 if calculated else 0, 3.0 if calculated else None])
+
+def test_backfill_continues_after_rows_changed(fake, workspace, backfill, monkeypatch):
+    in_table = create_table(fake, workspace, 'CALCULATED')
+    fake.management.CalculateField(in_table, 'L', '0')
+    write_calculations = create_db_model.write_calculations
+
+    def stop_at_third_range(in_table, oids, results, where_clause = None):
+        if oids[0] == 7:
+            raise KeyboardInterrupt
+        write_calculations(in_table, oids, results, where_clause)
+
+    monkeypatch.setattr(create_db_model, 'write_calculations', stop_at_third_range)
+    with pytest.raises(KeyboardInterrupt):
+        backfill(in_table)
+    monkeypatch.setattr(create_db_model, 'write_calculations', write_calculations)
+    change_rows(fake, in_table)
+    change_rows(fake, backfill.expected, calculated = True)
+    backfill.read.clear()
+    backfill(in_table)
+    # the ranges of the next run start after the recorded object IDs 1 to 6 ("!L! + !A!" is applied once)
+    assert backfill.read == ['OBJECTID >= 7 AND OBJECTID <= 9', 'OBJECTID >= 10 AND OBJECTID <= 11']
+    assert read_rows(fake, in_table) == read_rows(fake, backfill.expected)
+
+def test_backfill_error_is_not_calculated_with_tool(fake, workspace, backfill, monkeypatch, caplog):
+    in_table = create_table(fake, workspace, 'CALCULATED')
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('The table is locked')
+
+    monkeypatch.setattr(create_db_model, 'get_oid_ranges', fail)
+    backfill(in_table)
+    assert 'Error in the backfill of' in caplog.text
+    assert not [operation for operation in fake.operations if operation['tool'] == 'CalculateField'
+                and operation['parameters']['in_table'] == in_table]
+
+def test_backfill_reports_failed_range(fake, workspace, backfill, monkeypatch, caplog):
+    in_table = create_table(fake, workspace, 'CALCULATED')
+    fake.management.CalculateField(in_table, 'L', '0')
+    write_calculations = create_db_model.write_calculations
+
+    def fail_second_range(in_table, oids, results, where_clause = None):
+        if oids[0] == 4:
+            raise RuntimeError('The table is locked')
+        write_calculations(in_table, oids, results, where_clause)
+
+    monkeypatch.setattr(create_db_model, 'write_calculations', fail_second_range)
+    backfill(in_table)
+    assert 'Error when writing the object IDs 4 to 6' in caplog.text
+    assert '1 ranges (3 rows) have not been calculated because of the errors above and are calculated ' \
+           'again by the next run' in caplog.text
+    # the next run only calculates the failed range
+    monkeypatch.setattr(create_db_model, 'write_calculations', write_calculations)
+    backfill.read.clear()
+    backfill(in_table)
+    assert backfill.read == ['OBJECTID >= 4 AND OBJECTID <= 6']
+    assert read_rows(fake, in_table) == read_rows(fake, backfill.expected)
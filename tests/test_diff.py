@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Tests of the mode "diff" that applies only the differences between the JSON file and the workspace
+# (see function diff_model()).
+import pytest
+
+import create_db_model
+from conftest import read_tutorial
+
+def run(fake, main_args, **kwargs) -> list:
+    """Runs the function main() and returns the geoprocessing tools called."""
+    operations = len(fake.operations)
+    create_db_model.main(**dict(main_args, **kwargs))
+    return [operation['tool'] for operation in fake.operations[operations:]]
+
+@pytest.mark.parametrize('number', [1, 2, 3, 4, 5])
+def test_unchanged_model_has_no_operations(fake, tmp_path, number, caplog):
+    main_args = read_tutorial(number, 'create', tmp_path)
+    run(fake, main_args)
+    errors = create_db_model.error_counter.count
+    assert run(fake, main_args, mode = 'diff') == []
+    assert '0 objects have changed' in caplog.text
+    assert create_db_model.error_counter.count == errors
+
+@pytest.mark.parametrize('number', [1, 2, 3])
+def test_update_is_applied_once(fake, tmp_path, number):
+    run(fake, read_tutorial(number, 'create', tmp_path))
+    errors = create_db_model.error_counter.count
+    update_args = read_tutorial(number, 'update', tmp_path)
+    assert run(fake, update_args, mode = 'diff')
+    # the second run finds the changes of the update in the workspace
+    assert run(fake, update_args, mode = 'diff') == []
+    assert create_db_model.error_counter.count == errors
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Tests of the creation of the domains and the loading of their coded values (see function process_domain()).
+import pytest
+
+import create_db_model
+
+def domain_model(codes, field_type = 'SHORT'):
+    return {'domain_name': 'STATE', 'domain_description': 'State', 'field_type': field_type,
+            'domain_type': 'CODED', 'DomainValues': {code: f'State {code}' for code in codes}}
+
+def tools(fake):
+    return [operation['tool'] for operation in fake.operations]
+
+@pytest.fixture
+def workspace(fake, tmp_path):
+    workspace = str(tmp_path / 'model.gdb')
+    fake.get_workspace(workspace)
+    fake.env.workspace = workspace
+    return workspace
+
+def test_default_threshold():
+    assert 500 <= create_db_model.BULK_DOMAIN_THRESHOLD <= 3000
+
+@pytest.mark.parametrize('count, bulk', [(2, False), (3, True), (4, True)])
+def test_codes_loaded_with_table_to_domain(fake, workspace, count, bulk):
+    codes = [str(code) for code in range(1, count + 1)]
+    create_db_model.process_domain(workspace, domain_model(codes), bulk_threshold = 3)
+    # the domain is created with the field type of the model before the codes are loaded
+    assert tools(fake)[0] == 'CreateDomain'
+    if bulk:
+        assert tools(fake).count('TableToDomain') == 1 and 'AddCodedValueToDomain' not in tools(fake)
+    else:
+        assert tools(fake).count('AddCodedValueToDomain') == count and 'TableToDomain' not in tools(fake)
+    domain = fake.get_domain(fake.get_workspace(workspace), 'STATE')
+    assert domain.type == 'Short'
+    assert domain.codedValues == {code: f'State {code}' for code in range(1, count + 1)}
+    # the temporary table is deleted
+    assert not fake.Exists('memory/slu_domain_STATE')
+
+def test_non_integer_code_is_rejected(fake, workspace, caplog):
+    create_db_model.process_domain(workspace, domain_model(['1', '2.0', '2.5']), bulk_threshold = 3)
+    assert 'The code "2.5" does not match the type SHORT of the domain "STATE"' in caplog.text
+    assert 'TableToDomain' not in tools(fake)
+    assert fake.get_domain(fake.get_workspace(workspace), 'STATE').codedValues == {}
+
+def test_codes_are_not_loaded_without_domain(fake, workspace, caplog):
+    create_db_model.add_coded_values_from_table(workspace, 'MISSING', {'1': 'One'})
+    assert 'the domain "MISSING" does not exist' in caplog.text
+    assert tools(fake) == []
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# Tests of the export of an existing workspace into the format of the JSON file (see function export_model()).
+import json, os
+
+import pytest
+
+import create_db_model
+from conftest import read_tutorial
+
+@pytest.mark.parametrize('number', [1, 2, 3, 4, 5])
+def test_round_trip(fake, tmp_path, number):
+    main_args = read_tutorial(number, 'create', tmp_path)
+    create_db_model.main(**main_args)
+    errors = create_db_model.error_counter.count
+    workspace = os.path.join(str(tmp_path), create_db_model.get_db_fullname(main_args['db_name'], main_args['stage']))
+    model = create_db_model.export_model(workspace)
+    (tmp_path / 'export.json').write_text(json.dumps(model), encoding = 'utf-8')
+
+    # the exported JSON file creates a copy of the workspace
+    export_args, _, _ = create_db_model.read_parameters(str(tmp_path / 'export.json'))
+    export_args['conpath'] = str(tmp_path / 'copy')
+    create_db_model.main(**export_args)
+    copy = os.path.join(export_args['conpath'], os.path.basename(workspace))
+    assert dict(create_db_model.export_model(copy), Conpath = model['Conpath']) == model
+    # the exported JSON file does not differ from the workspace
+    operations = len(fake.operations)
+    create_db_model.main(**dict(export_args, conpath = str(tmp_path), mode = 'diff'))
+    assert fake.operations[operations:] == []
+    assert create_db_model.error_counter.count == errors
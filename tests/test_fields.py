@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Tests of the creation of several fields with a single call of AddFields (see function add_fields()).
+import logging
+
+import create_db_model
+
+def field(name, **kwargs):
+    return dict({'field_name': name, 'field_type': 'TEXT', 'field_length': 20}, **kwargs)
+
+def calls(fake) -> list:
+    """Returns the tools and the names of the fields that have been added."""
+    return [(operation['tool'], [row[0] for row in operation['parameters']['field_description']]
+             if operation['tool'] == 'AddFields' else operation['parameters'].get('field_name'))
+            for operation in fake.operations if operation['tool'] in ('AddField', 'AddFields')]
+
+def field_names(fake, table) -> list:
+    return [f.name for f in fake.get_table(table)['fields'] if f.name not in ('OBJECTID', 'Shape')]
+
+def test_consecutive_fields_are_batched(fake, workspace):
+    fake.management.CreateTable(workspace, 'ROAD')
+    create_db_model.add_fields('ROAD', [field('A'), field('B'), field('C', field_is_nullable = 'NON_NULLABLE'),
+                                        field('D'), field('E', field_type = 'LONG', field_length = None)])
+    assert calls(fake) == [('AddFields', ['A', 'B']), ('AddField', 'C'), ('AddFields', ['D', 'E'])]
+    # the order of the fields is kept
+    assert field_names(fake, f'{workspace}/ROAD') == ['A', 'B', 'C', 'D', 'E']
+
+def test_failed_batch_adds_missing_fields(fake, workspace, caplog):
+    fake.management.CreateTable(workspace, 'ROAD')
+    fake.management.AddField(f'{workspace}/ROAD', 'B', 'TEXT', field_length = 20)
+    create_db_model.add_fields('ROAD', [field('A'), field('B'), field('C')])
+    assert calls(fake)[1:] == [('AddFields', ['A', 'B', 'C']), ('AddField', 'A'), ('AddField', 'C')]
+    assert fake.operations[-3].get('error')
+    assert 'the missing fields will be added one by one' in caplog.text
+    assert field_names(fake, f'{workspace}/ROAD') == ['B', 'A', 'C']
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Tests of the journal of the operations that allows to resume a failed run (see class OperationJournal).
+import json
+
+import create_db_model
+from conftest import read_tutorial
+
+def run(fake, main_args, logfolder, **kwargs) -> list:
+    """Runs the function run_model() and returns the geoprocessing tools called."""
+    operations = len(fake.operations)
+    create_db_model.run_model(main_args, str(logfolder), 'model_v01', console = False, **kwargs)
+    return [operation['tool'] for operation in fake.operations[operations:]]
+
+def test_resume_skips_journaled_operations(fake, tmp_path):
+    main_args = read_tutorial(1, 'create', tmp_path)
+    logfolder = tmp_path / 'Logs'
+    tools = run(fake, main_args, logfolder)
+    journal = logfolder / 'model_v01_journal.jsonl'
+    ids = [json.loads(line).get('id') for line in journal.read_text().splitlines()]
+    assert ids[1:4] == ['DeleteAllExisting', 'Domains[0]', 'Domains[1]']
+    # all operations are done
+    assert run(fake, main_args, logfolder, resume = True) == []
+
+    # a run that failed after the domains (with an incomplete last line)
+    lines = journal.read_text().splitlines(keepends = True)
+    domains = max(i for i, line in enumerate(lines) if '"Domains[' in line) + 1
+    journal.write_text(''.join(lines[:domains]) + lines[domains][:20])
+    resumed = run(fake, main_args, logfolder, resume = True)
+    assert resumed[0] == 'Delete' and 'CreateDomain' not in resumed and 'DeleteDomain' not in resumed
+    assert resumed[-len(resumed) + 1:] == tools[-len(resumed) + 1:]
+
+def test_changed_operation_is_not_skipped(fake, tmp_path):
+    main_args = read_tutorial(1, 'create', tmp_path)
+    logfolder = tmp_path / 'Logs'
+    run(fake, main_args, logfolder)
+    main_args['domains'] = [create_db_model.load_item(item) for item in main_args['domains']]
+    main_args['domains'][2]['domain_description'] = 'Changed'
+    tools = run(fake, main_args, logfolder, resume = True)
+    assert tools[:4] == ['RemoveDomainFromField', 'DeleteDomain', 'CreateDomain', 'SetValueForRangeDomain']
+    # the feature class using the recreated domain is processed again, the other domains are skipped
+    assert 'CreateFeatureclass' in tools and tools.count('CreateDomain') == 1
+    fields = fake.get_table(f'{main_args["conpath"]}/infrastructure_management.gdb/ASSET')['fields']
+    assert [field.domain for field in fields if field.name == 'HEIGHT'] == ['AssetHeight']
+
+def test_journal_of_other_workspace_is_not_used(fake, tmp_path, caplog):
+    main_args = read_tutorial(1, 'create', tmp_path)
+    logfolder = tmp_path / 'Logs'
+    tools = run(fake, main_args, logfolder)
+    main_args['conpath'] = str(tmp_path / 'other')
+    assert run(fake, main_args, logfolder, resume = True) == tools
+    assert 'is not used' in caplog.text
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Tests of the reader of the JSON files that reads the items of the sections on demand (see class ModelReader).
+import json, os
+
+import pytest
+
+import create_db_model
+
+MODEL = '{\n "LogFolder": "Logs",\n "Features": [\n  {"out_name": "STRASSE", "alias": "Straße"},\n' \
+        '  {"out_name": "PLATZ", "Fields": [{"field_name": "NAME"}]}\n ],\n "Overwrite": "True"\n}\n'
+
+@pytest.mark.parametrize('chunk_size', [4, 1 << 20])
+@pytest.mark.parametrize('text', [
+    MODEL.replace('"PLATZ",', '"PLATZ"'),
+    MODEL.replace('"Straße"}', '"Straße"'),
+    MODEL.replace('"True"', 'True'),
+    MODEL + '{',
+])
+def test_error_positions(tmp_path, text, chunk_size):
+    path = tmp_path / 'model.json'
+    # with a BOM: the positions are counted in characters of the text without BOM
+    path.write_bytes(b'\xef\xbb\xbf' + text.encode('utf-8'))
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(text)
+    with pytest.raises(ValueError) as error:
+        create_db_model.ModelReader(str(path), chunk_size).read()
+    assert f'line {expected.value.lineno} column {expected.value.colno} (char {expected.value.pos})' \
+        in str(error.value)
+
+def test_items_are_read_on_demand(tmp_path):
+    path = tmp_path / 'model.json'
+    path.write_text(MODEL, encoding = 'utf-8')
+    data = create_db_model.ModelReader(str(path), 4).read()
+    assert isinstance(data['Features'][0], create_db_model.ModelItem)
+    assert [dict(item) for item in data['Features']] == json.loads(MODEL)['Features']
+    assert data['Overwrite'] == 'True'
+
+def test_changed_file_is_not_read(tmp_path):
+    path = tmp_path / 'model.json'
+    path.write_text(MODEL, encoding = 'utf-8')
+    data = create_db_model.ModelReader(str(path)).read()
+    # the items move when the file is changed after it has been indexed
+    path.write_text(MODEL.replace('"Logs"', '"Logs/Stage"'), encoding = 'utf-8')
+    stat = os.stat(path)
+    os.utime(path, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    with pytest.raises(ValueError, match = 'has been changed'):
+        create_db_model.load_item(data['Features'][1])
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Tests of the plan of a deployment and its estimated durations (see functions plan_model() and load_durations()).
+import json, logging
+
+import create_db_model
+from conftest import read_tutorial
+
+def write_log(log_folder, name, backend):
+    # a log file with an AddField of 2 seconds and its events
+    (log_folder / f'{name}.log').write_text('2026-01-01 10:00:00,000 INFO Adding the field "A"\n'
+                                            '2026-01-01 10:00:02,000 INFO Adding the field "B"\n'
+                                            '2026-01-01 10:00:02,500 INFO End\n')
+    (log_folder / f'{name}_events.jsonl').write_text(json.dumps({'op': 'add_field', 'backend': backend}) + '\n')
+
+def test_durations_of_arcpy_runs(tmp_path):
+    write_log(tmp_path, 'model_v01', 'arcpy')
+    write_log(tmp_path, 'model_v02', 'fake')
+    (tmp_path / 'model_v03.log').write_text('2026-01-01 10:00:00,000 INFO Adding the field "A"\n'
+                                            '2026-01-01 10:00:09,000 INFO End\n')
+    # the runs with the backend "fake" and the runs without events are ignored
+    assert create_db_model.load_durations(str(tmp_path)) == {'AddField': 1.25}
+
+def test_fake_run_is_not_learned(fake, tmp_path):
+    main_args = read_tutorial(1, 'create', tmp_path)
+    create_db_model.run_model(main_args, str(tmp_path / 'Logs'), 'model_v01', console = False)
+    assert (tmp_path / 'Logs' / 'model_v01_events.jsonl').read_text()
+    assert create_db_model.load_durations(str(tmp_path / 'Logs')) == {}
+
+def test_plan_of_update_file(fake, tmp_path, caplog):
+    operations = create_db_model.plan_model(read_tutorial(3, 'update', tmp_path))
+    assert [(operation['tool'], operation.get('error')) for operation in operations] == [('AddField', True)]
+    # the missing table of the update is logged as warning
+    assert 'The table "EVENT" to be updated does not exist' in caplog.text
+    assert not [record for record in caplog.records if record.levelname == 'ERROR']
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR
+                and 'does not exist' not in record.getMessage()]
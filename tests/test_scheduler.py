@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Tests of the order in which the nodes of a data model are processed (see function run_nodes()).
+import create_db_model
+from conftest import read_tutorial
+
+def record(log, node_id):
+    # a node function that appends its ID to a file (also called in worker processes)
+    with open(log, 'a') as f:
+        f.write(node_id + '\n')
+
+def assert_dependency_order(nodes, order):
+    position = {node_id: index for index, node_id in enumerate(order)}
+    assert sorted(order) == sorted(node.node_id for node in nodes)
+    for node in nodes:
+        for dependency in node.dependencies:
+            assert position[dependency] < position[node.node_id], f'{dependency} after {node.node_id}'
+
+def test_nodes_in_dependency_order(fake, tmp_path):
+    log = tmp_path / 'order.txt'
+    nodes = [create_db_model.ModelNode(node_id, record, {'log': log, 'node_id': node_id}, dependencies)
+             for node_id, dependencies in [('Relations[0]', ['Features[1]', 'Tables[0]']),
+                                           ('Features[1]', ['Domains[0]']), ('Tables[0]', []),
+                                           ('Domains[0]', []), ('Features[0]', ['Domains[0]'])]]
+    assert create_db_model.run_nodes(nodes)
+    order = log.read_text().split()
+    assert_dependency_order(nodes, order)
+    # without dependencies, the order of the list is kept
+    assert order == ['Tables[0]', 'Domains[0]', 'Features[1]', 'Relations[0]', 'Features[0]']
+
+def test_model_nodes_in_dependency_order(fake, tmp_path):
+    main_args = read_tutorial(2, 'create', tmp_path)
+    sections = {key: main_args[key] for key in ('domains', 'datasets', 'features', 'tables', 'relations')}
+    nodes = create_db_model.build_nodes(str(tmp_path / 'model.gdb'), None, True, **sections,
+                                        delete_domains = ['OLD'])
+    log = tmp_path / 'order.txt'
+    for node in nodes:
+        node.function, node.kwargs = record, {'log': log, 'node_id': node.node_id}
+    assert create_db_model.run_nodes(nodes)
+    assert_dependency_order(nodes, log.read_text().split())
+
+def test_worker_processes_in_dependency_order(fake, tmp_path):
+    log = tmp_path / 'order.txt'
+    nodes = [create_db_model.ModelNode(f'Domains[{i}]', record, {'log': str(log), 'node_id': f'Domains[{i}]'})
+             for i in range(4)]
+    nodes += [create_db_model.ModelNode(f'Features[{i}]', record, {'log': str(log), 'node_id': f'Features[{i}]'},
+                                        [f'Domains[{i}]', f'Domains[{(i + 1) % 4}]']) for i in range(4)]
+    nodes.append(create_db_model.ModelNode('Relations[0]', record, {'log': str(log), 'node_id': 'Relations[0]'},
+                                           [f'Features[{i}]' for i in range(4)]))
+    assert create_db_model.run_nodes(nodes, 2, (str(tmp_path / 'model.gdb'), True, None, None))
+    assert_dependency_order(nodes, log.read_text().split())
+
+def test_cycle_is_processed_with_warning(fake, tmp_path, caplog):
+    log = tmp_path / 'order.txt'
+    nodes = [create_db_model.ModelNode('A', record, {'log': log, 'node_id': 'A'}, ['B']),
+             create_db_model.ModelNode('B', record, {'log': log, 'node_id': 'B'}, ['A'])]
+    assert create_db_model.run_nodes(nodes)
+    assert sorted(log.read_text().split()) == ['A', 'B']
+    assert 'cyclic dependencies' in caplog.text
+
+def test_domain_deleted_after_attributed_relationship_class(fake, tmp_path):
+    workspace = str(tmp_path / 'model.gdb')
+    fake.get_workspace(workspace)
+    fake.env.workspace = workspace
+    fake.management.CreateDomain(workspace, 'STATE', 'State', 'SHORT', 'CODED')
+    for table in ('A', 'B'):
+        fake.management.CreateTable(workspace, table)
+        fake.management.AddGlobalIDs(table)
+    fake.management.CreateRelationshipClass('A', 'B', 'A_B', 'SIMPLE', 'has', 'belongs to', 'NONE', 'MANY_TO_MANY',
+                                            'ATTRIBUTED', 'GlobalID', 'A_REF', 'GlobalID', 'B_REF')
+    fake.management.AddField('A_B', 'STATE', 'SHORT', field_domain = 'STATE')
+    nodes = {node.node_id: node for node in create_db_model.build_delete_nodes(workspace)}
+    assert nodes['DeleteDomain/STATE'].dependencies == ['Delete/A_B']
+    assert create_db_model.run_nodes(list(nodes.values()))
+    assert not create_db_model.arcpy.da.ListDomains(workspace)
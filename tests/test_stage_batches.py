@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Tests of the stages of a deployment that are applied as one unit and rolled back on errors
+# (see class StageBatch and function run_batches()).
+import create_db_model
+from conftest import read_tutorial
+
+def change_schema(workspace):
+    # a node function that changes the table "A", creates the table "B" and fails at the end
+    create_db_model.add_field(f'{workspace}/A', 'X', 'TEXT', field_length = 10)
+    create_db_model.enable_editor_tracking(f'{workspace}/A', add_fields = 'ADD_FIELDS')
+    create_db_model.create_table(workspace, 'B')
+    create_db_model.add_field(f'{workspace}/MISSING', 'Y', 'TEXT')
+
+def test_stage_rollback_restores_schema(fake, tmp_path, caplog):
+    workspace = str(tmp_path / 'model.gdb')
+    fake.get_workspace(workspace)
+    fake.env.workspace = workspace
+    fake.management.CreateTable(workspace, 'A')
+    fake.management.AddField(f'{workspace}/A', 'NAME', 'TEXT', field_length = 50)
+    fields = [field.name for field in fake.ListFields(f'{workspace}/A')]
+    node = create_db_model.ModelNode('Tables[0]', change_schema, {'workspace': workspace})
+    assert not create_db_model.StageBatch('Feature classes and tables', workspace, [node]).run()
+    assert 'is rolled back' in caplog.text
+    # the added fields (also the fields of the editor tracking) and the created table are removed
+    assert [field.name for field in fake.ListFields(f'{workspace}/A')] == fields
+    assert not fake.Exists(f'{workspace}/B')
+    assert not fake.get_table(f'{workspace}/A')['editorTrackingEnabled']
+
+def test_overwrite_is_refused_before_stages(fake, tmp_path, caplog):
+    main_args = read_tutorial(1, 'create', tmp_path)
+    main_args.update({'stage_batches': 'True', 'delete_existing': 'False', 'overwrite': 'True'})
+    create_db_model.main(**main_args)
+    assert 'is committed' in caplog.text
+    operations = len(fake.operations)
+    caplog.clear()
+    create_db_model.main(**main_args)
+    # no geoprocessing tool changes the workspace
+    assert 'The stages are not processed' in caplog.text
+    assert 'Stage "' not in caplog.text
+    assert not [operation for operation in fake.operations[operations:] if not operation['tool'].startswith('List')]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Tests of the validation of a data model before the workspace is changed (see function validate_model()).
+import pytest
+
+import create_db_model
+from conftest import read_tutorial
+
+def test_strict_validation_refuses_model(fake, tmp_path, caplog):
+    main_args = read_tutorial(1, 'create', tmp_path)
+    asset = create_db_model.load_item(main_args['features'][1])
+    asset['Fields'][1]['field_domain'] = 'UNKNOWN'
+    main_args['features'] = [main_args['features'][0], asset] + list(main_args['features'][2:])
+    main_args['strict_validation'] = 'True'
+    with pytest.raises(ValueError, match = 'the workspace has not been changed'):
+        create_db_model.main(**main_args)
+    assert 'The domain "UNKNOWN" of the field' in caplog.text
+    # no geoprocessing tool has been called (also not "DeleteAllExisting")
+    assert fake.operations == []
+
+def test_second_run_validates_changed_workspace(fake, tmp_path, caplog):
+    workspace = str(tmp_path / 'model.gdb')
+    fake.get_workspace(workspace)
+    fake.management.CreateTable(workspace, 'EVENT')
+    main_args = read_tutorial(3, 'update', tmp_path)
+    main_args.update({'db_name': 'model.gdb', 'strict_validation': 'True'})
+    create_db_model.main(**main_args)
+    # the field added by the first run in the same process is known to the validation of the second run
+    main_args['update_tables'] = [{'in_table': 'EVENT', 'AlterFields': [{'field': 'Contact',
+                                                                         'new_field_alias': 'Kontakt'}]}]
+    create_db_model.main(**main_args)
+    assert 'The validation of the data model has found' not in caplog.text
+    assert fake.operations[-1]['tool'] == 'AlterField'